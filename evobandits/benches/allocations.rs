@@ -0,0 +1,139 @@
+//! Counts the heap allocations of the genetic operators and of whole optimizations.
+//!
+//! Run with `cargo bench --features bench --bench allocations`. A counting global allocator
+//! records the number of allocations and the allocated bytes. One generation allocates for the
+//! crossover and mutation of the population and for the lookup of the offspring; the
+//! optimizations are reported per simulation, which includes the growth of the arm memory.
+
+use std::alloc::{GlobalAlloc, Layout, System};
+use std::sync::atomic::{AtomicUsize, Ordering};
+
+use evobandits::arm::Seeded;
+use evobandits::bench::{crossover, get_arm_indexes, mutate, Population};
+use evobandits::evobandits::EvoBandits;
+use evobandits::genetic::GeneticAlgorithm;
+use evobandits::options::{Options, PullSeeding};
+use rand::rngs::StdRng;
+use rand::SeedableRng;
+use rand_distr::{Distribution, Normal};
+
+const SEED: u64 = 42;
+const DIMENSIONS: [usize; 4] = [2, 10, 100, 1_000];
+const POPULATION_SIZES: [usize; 3] = [20, 100, 500];
+const SIMULATION_BUDGETS: [usize; 3] = [1_000, 10_000, 100_000];
+
+struct CountingAllocator;
+
+static ALLOCATIONS: AtomicUsize = AtomicUsize::new(0);
+static ALLOCATED_BYTES: AtomicUsize = AtomicUsize::new(0);
+
+unsafe impl GlobalAlloc for CountingAllocator {
+    unsafe fn alloc(&self, layout: Layout) -> *mut u8 {
+        ALLOCATIONS.fetch_add(1, Ordering::Relaxed);
+        ALLOCATED_BYTES.fetch_add(layout.size(), Ordering::Relaxed);
+        System.alloc(layout)
+    }
+
+    unsafe fn dealloc(&self, ptr: *mut u8, layout: Layout) {
+        System.dealloc(ptr, layout)
+    }
+
+    unsafe fn realloc(&self, ptr: *mut u8, layout: Layout, new_size: usize) -> *mut u8 {
+        ALLOCATIONS.fetch_add(1, Ordering::Relaxed);
+        ALLOCATED_BYTES.fetch_add(new_size, Ordering::Relaxed);
+        System.realloc(ptr, layout, new_size)
+    }
+}
+
+#[global_allocator]
+static GLOBAL: CountingAllocator = CountingAllocator;
+
+/// Number of allocations and allocated bytes while running `f`.
+fn count_allocations<T>(f: impl FnOnce() -> T) -> (usize, usize) {
+    let allocations = ALLOCATIONS.load(Ordering::Relaxed);
+    let allocated_bytes = ALLOCATED_BYTES.load(Ordering::Relaxed);
+    std::hint::black_box(f());
+    (
+        ALLOCATIONS.load(Ordering::Relaxed) - allocations,
+        ALLOCATED_BYTES.load(Ordering::Relaxed) - allocated_bytes,
+    )
+}
+
+fn noisy_sphere(x: &[i32], seed: u64) -> f64 {
+    let noise = Normal::new(0.0, 1_000.0)
+        .unwrap()
+        .sample(&mut StdRng::seed_from_u64(seed));
+    x.iter()
+        .map(|&x_i| (x_i as f64 - 500.0).powi(2))
+        .sum::<f64>()
+        + noise
+}
+
+fn main() {
+    let options = Options {
+        pull_seeding: PullSeeding::Independent,
+        ..Default::default()
+    };
+
+    println!("Allocations per generation (crossover, mutate and lookup of the offspring)");
+    println!(
+        "{:>10} {:>10} {:>14} {:>14}",
+        "population", "dimension", "allocations", "bytes"
+    );
+    for population_size in POPULATION_SIZES {
+        for dimension in DIMENSIONS {
+            let mut genetic_algorithm = GeneticAlgorithm {
+                population_size,
+                ..Default::default()
+            };
+            genetic_algorithm.set_bounds(vec![(0, 1_000); dimension]);
+            let population = Population::random(&genetic_algorithm, SEED);
+
+            let mut evobandits =
+                EvoBandits::with_options(genetic_algorithm.clone(), options.clone());
+            evobandits.optimize(
+                Seeded(noisy_sphere),
+                vec![(0, 1_000); dimension],
+                10 * population_size,
+                Some(SEED),
+            );
+
+            let (allocations, bytes) = count_allocations(|| {
+                let offspring = crossover(&genetic_algorithm, SEED, &population);
+                let offspring = mutate(&genetic_algorithm, SEED, &offspring);
+                get_arm_indexes(&evobandits, &offspring)
+            });
+            println!(
+                "{:>10} {:>10} {:>14} {:>14}",
+                population_size, dimension, allocations, bytes
+            );
+        }
+    }
+
+    println!();
+    println!("Allocations per simulation of an optimization with the default configuration");
+    println!(
+        "{:>10} {:>10} {:>14} {:>14}",
+        "budget", "dimension", "allocations", "bytes"
+    );
+    for simulation_budget in SIMULATION_BUDGETS {
+        for dimension in DIMENSIONS {
+            let mut evobandits = EvoBandits::with_options(Default::default(), options.clone());
+            let (allocations, bytes) = count_allocations(|| {
+                evobandits.optimize(
+                    Seeded(noisy_sphere),
+                    vec![(0, 1_000); dimension],
+                    simulation_budget,
+                    Some(SEED),
+                )
+            });
+            println!(
+                "{:>10} {:>10} {:>14.1} {:>14.1}",
+                simulation_budget,
+                dimension,
+                allocations as f64 / simulation_budget as f64,
+                bytes as f64 / simulation_budget as f64
+            );
+        }
+    }
+}
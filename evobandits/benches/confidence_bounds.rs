@@ -0,0 +1,91 @@
+//! Compares the solution quality of the confidence bounds, and of a final phase for the
+//! identification of the best arm, on a heteroscedastic problem.
+//!
+//! Run with `cargo bench --bench confidence_bounds`. For each configuration and budget, a noisy
+//! Rosenbrock function is optimized with independent seeds, and the mean and median of the true
+//! (noise-free) objective value of the returned arms are reported.
+
+use evobandits::arm::Seeded;
+use evobandits::options::{ConfidenceBound, Options, PullSeeding};
+use evobandits::replication::{derive_seeds, replicate};
+use rand::rngs::StdRng;
+use rand::SeedableRng;
+use rand_distr::{Distribution, Normal};
+
+const BUDGETS: [usize; 4] = [500, 1_000, 2_000, 5_000];
+const NUM_RUNS: usize = 50;
+
+fn rosenbrock(x: &[i32]) -> f64 {
+    let x_f64 = x[0] as f64 / 10.0;
+    let y_f64 = x[1] as f64 / 10.0;
+    (1.0 - x_f64).powi(2) + 100.0 * (y_f64 - x_f64.powi(2)).powi(2)
+}
+
+// Solutions with a negative x are much noisier than the others, so arms in this region can enter
+// the non-dominated set with a lucky sample mean.
+fn heteroscedastic_rosenbrock(x: &[i32], seed: u64) -> f64 {
+    let std_dev = if x[0] < 0 { 25.0 } else { 0.5 };
+    let noise = Normal::new(0.0, std_dev)
+        .unwrap()
+        .sample(&mut StdRng::seed_from_u64(seed));
+    rosenbrock(x) + noise
+}
+
+fn median(values: &mut [f64]) -> f64 {
+    values.sort_by(|a, b| a.total_cmp(b));
+    let mid = values.len() / 2;
+    if values.len() % 2 == 0 {
+        (values[mid - 1] + values[mid]) / 2.0
+    } else {
+        values[mid]
+    }
+}
+
+fn main() {
+    let bounds = vec![(-50, 50), (-50, 50)];
+    let seeds = derive_seeds(Some(42), NUM_RUNS);
+
+    println!(
+        "{:<32} {:>8} {:>12} {:>12}",
+        "configuration", "budget", "mean f(x)", "median f(x)"
+    );
+    for (confidence_bound, final_phase_budget) in [
+        (ConfidenceBound::Ucb, 0.0),
+        (ConfidenceBound::UcbV, 0.0),
+        (ConfidenceBound::EmpiricalBernstein, 0.0),
+        (ConfidenceBound::Ucb, 0.2),
+    ] {
+        let options = Options {
+            pull_seeding: PullSeeding::Independent,
+            confidence_bound,
+            final_phase_budget,
+            ..Default::default()
+        };
+        let configuration = format!("{:?}, final_phase={}", confidence_bound, final_phase_budget);
+
+        for budget in BUDGETS {
+            let replications = replicate(
+                &Default::default(),
+                &options,
+                &Seeded(heteroscedastic_rosenbrock),
+                &bounds,
+                budget,
+                &seeds,
+                0,
+            );
+            let mut values: Vec<f64> = replications
+                .iter()
+                .map(|replication| rosenbrock(&replication.action_vector))
+                .collect();
+
+            let mean = values.iter().sum::<f64>() / values.len() as f64;
+            println!(
+                "{:<32} {:>8} {:>12.4} {:>12.4}",
+                configuration,
+                budget,
+                mean,
+                median(&mut values)
+            );
+        }
+    }
+}
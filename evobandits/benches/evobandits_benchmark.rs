@@ -1,5 +1,6 @@
 use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion};
 use evobandits::evobandits::EvoBandits;
+use evobandits::options::{OperatorSchedule, Options};
 use rand::rng;
 use rand_distr::{Distribution, Normal};
 
@@ -48,5 +49,37 @@ fn benchmark_evobandits(c: &mut Criterion) {
     group.finish();
 }
 
-criterion_group!(benches, benchmark_evobandits);
+// The overhead of the adaptive operator schedule, see benches/schedules.rs for its solution quality
+fn benchmark_operator_schedules(c: &mut Criterion) {
+    let mut group = c.benchmark_group("Operator Schedules");
+
+    for operator_schedule in [OperatorSchedule::Fixed, OperatorSchedule::SuccessRate] {
+        let options = Options {
+            operator_schedule,
+            ..Default::default()
+        };
+        group.bench_with_input(
+            BenchmarkId::new(format!("{:?}", operator_schedule), 10_000),
+            &options,
+            |b, options| {
+                b.iter(|| {
+                    let mut evobandits =
+                        EvoBandits::with_options(Default::default(), options.clone());
+                    let bounds = vec![(-50, 50), (-50, 50)];
+
+                    evobandits.optimize(
+                        black_box(noisy_rosenbrock),
+                        black_box(bounds),
+                        black_box(10_000),
+                        Default::default(),
+                    )
+                });
+            },
+        );
+    }
+
+    group.finish();
+}
+
+criterion_group!(benches, benchmark_evobandits, benchmark_operator_schedules);
 criterion_main!(benches);
@@ -0,0 +1,174 @@
+//! Benchmarks of the individual operations of EvoBandits, and how they scale with the dimension
+//! of the action vectors, the population size and the number of arms.
+//!
+//! Run with `cargo bench --features bench --bench operations`.
+
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion, Throughput};
+use evobandits::arm::Seeded;
+use evobandits::bench::{
+    crossover, find_best_ucb, get_arm_indexes, mutate, Population, SampleAverageTree,
+};
+use evobandits::evobandits::EvoBandits;
+use evobandits::genetic::GeneticAlgorithm;
+use evobandits::options::{Options, PullSeeding};
+use rand::rngs::StdRng;
+use rand::{Rng, SeedableRng};
+use rand_distr::{Distribution, Normal};
+
+const SEED: u64 = 42;
+const DIMENSIONS: [usize; 4] = [2, 10, 100, 1_000];
+const POPULATION_SIZES: [usize; 3] = [20, 100, 500];
+const NUM_ARMS: [usize; 4] = [100, 1_000, 10_000, 100_000];
+const SIMULATION_BUDGETS: [usize; 3] = [1_000, 10_000, 100_000];
+
+fn genetic_algorithm(dimension: usize, population_size: usize) -> GeneticAlgorithm {
+    let mut genetic_algorithm = GeneticAlgorithm {
+        population_size,
+        ..Default::default()
+    };
+    genetic_algorithm.set_bounds(vec![(0, 1_000); dimension]);
+    genetic_algorithm
+}
+
+fn noisy_sphere(x: &[i32], seed: u64) -> f64 {
+    let noise = Normal::new(0.0, 1_000.0)
+        .unwrap()
+        .sample(&mut StdRng::seed_from_u64(seed));
+    x.iter()
+        .map(|&x_i| (x_i as f64 - 500.0).powi(2))
+        .sum::<f64>()
+        + noise
+}
+
+// Run an optimization to accumulate arms. About half of the simulations create a new arm, the
+// others pull an arm of the population again.
+fn populated_evobandits(dimension: usize, simulation_budget: usize) -> EvoBandits {
+    let options = Options {
+        pull_seeding: PullSeeding::Independent,
+        ..Default::default()
+    };
+    let mut evobandits = EvoBandits::with_options(Default::default(), options);
+    evobandits.optimize(
+        Seeded(noisy_sphere),
+        vec![(0, 1_000); dimension],
+        simulation_budget,
+        Some(SEED),
+    );
+    evobandits
+}
+
+fn benchmark_genetic_operators(c: &mut Criterion) {
+    for population_size in POPULATION_SIZES {
+        let mut group =
+            c.benchmark_group(format!("genetic_operators/population_{}", population_size));
+        group.throughput(Throughput::Elements(population_size as u64));
+
+        for dimension in DIMENSIONS {
+            let genetic_algorithm = genetic_algorithm(dimension, population_size);
+            let population = Population::random(&genetic_algorithm, SEED);
+
+            group.bench_with_input(
+                BenchmarkId::new("crossover", dimension),
+                &population,
+                |b, population| {
+                    b.iter(|| crossover(&genetic_algorithm, black_box(SEED), population));
+                },
+            );
+            group.bench_with_input(
+                BenchmarkId::new("mutate", dimension),
+                &population,
+                |b, population| {
+                    b.iter(|| mutate(&genetic_algorithm, black_box(SEED), population));
+                },
+            );
+        }
+
+        group.finish();
+    }
+}
+
+fn benchmark_sample_average_tree(c: &mut Criterion) {
+    let mut group = c.benchmark_group("sample_average_tree");
+
+    // Distinct means are typical for noisy objectives, ties for objectives with discrete values
+    for (name, num_distinct_means) in [("update_distinct", None), ("update_ties", Some(10))] {
+        for num_arms in NUM_ARMS {
+            let mut rng = StdRng::seed_from_u64(SEED);
+            let mut draw_mean = move || match num_distinct_means {
+                Some(n) => rng.random_range(0..n) as f64,
+                None => rng.random::<f64>(),
+            };
+
+            let mut tree = SampleAverageTree::new();
+            let mut means: Vec<f64> = (0..num_arms).map(|_| draw_mean()).collect();
+            for (arm_index, &mean) in means.iter().enumerate() {
+                tree.insert(mean, arm_index as i32);
+            }
+            let new_means: Vec<f64> = (0..1_024).map(|_| draw_mean()).collect();
+
+            // An update moves an arm to the key of its new mean, like a pull does
+            group.bench_function(BenchmarkId::new(name, num_arms), |b| {
+                let mut step = 0;
+                b.iter(|| {
+                    let arm_index = step % num_arms;
+                    tree.delete(means[arm_index], arm_index as i32);
+                    means[arm_index] = new_means[step % new_means.len()];
+                    tree.insert(black_box(means[arm_index]), arm_index as i32);
+                    step += 1;
+                });
+            });
+        }
+    }
+
+    group.finish();
+}
+
+fn benchmark_get_arm_index(c: &mut Criterion) {
+    let mut group = c.benchmark_group("get_arm_index");
+    let population_size = 20;
+    group.throughput(Throughput::Elements(population_size as u64));
+
+    for simulation_budget in SIMULATION_BUDGETS {
+        for dimension in DIMENSIONS {
+            let evobandits = populated_evobandits(dimension, simulation_budget);
+            let population =
+                Population::random(&genetic_algorithm(dimension, population_size), SEED);
+
+            group.bench_with_input(
+                BenchmarkId::new(format!("simulations_{}", simulation_budget), dimension),
+                &population,
+                |b, population| {
+                    b.iter(|| get_arm_indexes(&evobandits, population));
+                },
+            );
+        }
+    }
+
+    group.finish();
+}
+
+fn benchmark_find_best_ucb(c: &mut Criterion) {
+    let mut group = c.benchmark_group("find_best_ucb");
+
+    for simulation_budget in SIMULATION_BUDGETS {
+        let evobandits = populated_evobandits(2, simulation_budget);
+        group.bench_with_input(
+            BenchmarkId::from_parameter(simulation_budget),
+            &simulation_budget,
+            |b, &simulation_budget| {
+                b.iter(|| find_best_ucb(&evobandits, black_box(simulation_budget)));
+            },
+        );
+    }
+
+    group.finish();
+}
+
+criterion_group!(
+    benches,
+    benchmark_genetic_operators,
+    benchmark_sample_average_tree,
+    benchmark_get_arm_index,
+    benchmark_find_best_ucb
+);
+criterion_main!(benches);
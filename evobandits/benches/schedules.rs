@@ -0,0 +1,120 @@
+//! Compares the number of simulations that the fixed and the adaptive operator schedule need to
+//! reach a target solution quality on a noisy Rosenbrock function.
+//!
+//! Run with `cargo bench --bench schedules`. Each run is driven by ask and tell, and after each
+//! batch the true (noise-free) objective value of the current best arm is compared to the target.
+//! Runs that do not reach the target within the budget count with the full budget, and are
+//! reported separately.
+
+use evobandits::evobandits::EvoBandits;
+use evobandits::genetic::GeneticAlgorithm;
+use evobandits::options::{OperatorSchedule, Options, PullSeeding};
+use evobandits::replication::derive_seeds;
+use rand::rngs::StdRng;
+use rand::SeedableRng;
+use rand_distr::{Distribution, Normal};
+
+const TARGETS: [f64; 3] = [10.0, 3.0, 1.0];
+const MUTATION_SPANS: [f64; 2] = [0.1, 0.5];
+const BUDGET: usize = 20_000;
+const NUM_RUNS: usize = 30;
+
+fn rosenbrock(x: &[i32]) -> f64 {
+    x.windows(2)
+        .map(|pair| {
+            let (x_i, x_next) = (pair[0] as f64 / 10.0, pair[1] as f64 / 10.0);
+            (1.0 - x_i).powi(2) + 100.0 * (x_next - x_i.powi(2)).powi(2)
+        })
+        .sum()
+}
+
+fn noisy_rosenbrock(x: &[i32], seed: u64) -> f64 {
+    let noise = Normal::new(0.0, 1.0)
+        .unwrap()
+        .sample(&mut StdRng::seed_from_u64(seed));
+    rosenbrock(x) + noise
+}
+
+fn median(values: &mut [f64]) -> f64 {
+    values.sort_by(|a, b| a.total_cmp(b));
+    let mid = values.len() / 2;
+    if values.len() % 2 == 0 {
+        (values[mid - 1] + values[mid]) / 2.0
+    } else {
+        values[mid]
+    }
+}
+
+// The simulations after which the best arm first reached each target, or the budget if it did not.
+fn simulations_to_targets(
+    evobandits: &mut EvoBandits,
+    bounds: &[(i32, i32)],
+    seed: u64,
+) -> Vec<usize> {
+    let mut simulations = vec![BUDGET; TARGETS.len()];
+    evobandits.start(bounds.to_vec(), BUDGET, Some(seed));
+    while let Some(trials) = evobandits.ask() {
+        let rewards: Vec<Option<f64>> = trials
+            .iter()
+            .map(|trial| Some(noisy_rosenbrock(&trial.action_vector, trial.seed.unwrap())))
+            .collect();
+        evobandits.tell(&rewards);
+
+        let progress = evobandits.progress().unwrap();
+        let value = rosenbrock(&progress.best_arm.action_vector);
+        for (target, simulations) in TARGETS.iter().zip(simulations.iter_mut()) {
+            if value <= *target && *simulations == BUDGET {
+                *simulations = progress.simulations_used;
+            }
+        }
+    }
+    simulations
+}
+
+fn main() {
+    let bounds = vec![(-50, 50); 3];
+    let seeds = derive_seeds(Some(42), NUM_RUNS);
+
+    println!(
+        "{:<12} {:>6} {:>8} {:>18} {:>10}",
+        "schedule", "span", "target", "median simulations", "missed"
+    );
+    for mutation_span in MUTATION_SPANS {
+        for operator_schedule in [OperatorSchedule::Fixed, OperatorSchedule::SuccessRate] {
+            let genetic_algorithm = GeneticAlgorithm {
+                mutation_span,
+                ..Default::default()
+            };
+            let options = Options {
+                pull_seeding: PullSeeding::Independent,
+                operator_schedule,
+                ..Default::default()
+            };
+
+            let mut simulations: Vec<Vec<f64>> = vec![Vec::with_capacity(NUM_RUNS); TARGETS.len()];
+            for &seed in &seeds {
+                let mut evobandits =
+                    EvoBandits::with_options(genetic_algorithm.clone(), options.clone());
+                let run = simulations_to_targets(&mut evobandits, &bounds, seed);
+                for (target_simulations, run_simulations) in simulations.iter_mut().zip(run) {
+                    target_simulations.push(run_simulations as f64);
+                }
+            }
+
+            for (target, values) in TARGETS.iter().zip(simulations.iter_mut()) {
+                let missed = values
+                    .iter()
+                    .filter(|&&value| value == BUDGET as f64)
+                    .count();
+                println!(
+                    "{:<12} {:>6} {:>8} {:>18} {:>10}",
+                    format!("{:?}", operator_schedule),
+                    mutation_span,
+                    target,
+                    median(values),
+                    missed
+                );
+            }
+        }
+    }
+}
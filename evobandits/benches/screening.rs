@@ -0,0 +1,88 @@
+//! Compares the solution quality with and without the surrogate screening of the offspring, at the
+//! same number of simulations, on a noisy Rosenbrock function.
+//!
+//! Run with `cargo bench --bench screening`. The screening only pays off if a simulation costs
+//! much more than the surrogate, so the time of the surrogate is reported separately.
+
+use evobandits::arm::Seeded;
+use evobandits::evobandits::EvoBandits;
+use evobandits::options::{Options, PullSeeding};
+use evobandits::replication::derive_seeds;
+use rand::rngs::StdRng;
+use rand::SeedableRng;
+use rand_distr::{Distribution, Normal};
+use std::time::Duration;
+
+const BUDGETS: [usize; 4] = [500, 1_000, 2_000, 5_000];
+const SCREENING_FRACTIONS: [f64; 3] = [1.0, 0.5, 0.25];
+const NUM_RUNS: usize = 30;
+
+fn rosenbrock(x: &[i32]) -> f64 {
+    x.windows(2)
+        .map(|pair| {
+            let (x_i, x_next) = (pair[0] as f64 / 10.0, pair[1] as f64 / 10.0);
+            (1.0 - x_i).powi(2) + 100.0 * (x_next - x_i.powi(2)).powi(2)
+        })
+        .sum()
+}
+
+fn noisy_rosenbrock(x: &[i32], seed: u64) -> f64 {
+    let noise = Normal::new(0.0, 10.0)
+        .unwrap()
+        .sample(&mut StdRng::seed_from_u64(seed));
+    rosenbrock(x) + noise
+}
+
+fn median(values: &mut [f64]) -> f64 {
+    values.sort_by(|a, b| a.total_cmp(b));
+    let mid = values.len() / 2;
+    if values.len() % 2 == 0 {
+        (values[mid - 1] + values[mid]) / 2.0
+    } else {
+        values[mid]
+    }
+}
+
+fn main() {
+    let bounds = vec![(-50, 50); 4];
+    let seeds = derive_seeds(Some(42), NUM_RUNS);
+
+    println!(
+        "{:<12} {:>8} {:>12} {:>12} {:>14}",
+        "screening", "budget", "mean f(x)", "median f(x)", "surrogate ms"
+    );
+    for screening_fraction in SCREENING_FRACTIONS {
+        let options = Options {
+            pull_seeding: PullSeeding::Independent,
+            collect_stats: true,
+            screening_fraction,
+            ..Default::default()
+        };
+
+        for budget in BUDGETS {
+            let mut values = Vec::with_capacity(NUM_RUNS);
+            let mut surrogate_time = Duration::ZERO;
+            for &seed in &seeds {
+                let mut evobandits = EvoBandits::with_options(Default::default(), options.clone());
+                let action_vector = evobandits.optimize(
+                    Seeded(noisy_rosenbrock),
+                    bounds.clone(),
+                    budget,
+                    Some(seed),
+                );
+                values.push(rosenbrock(&action_vector));
+                surrogate_time += evobandits.stats().unwrap().surrogate_time;
+            }
+
+            let mean = values.iter().sum::<f64>() / values.len() as f64;
+            println!(
+                "{:<12} {:>8} {:>12.4} {:>12.4} {:>14.3}",
+                screening_fraction,
+                budget,
+                mean,
+                median(&mut values),
+                surrogate_time.as_secs_f64() * 1000.0 / NUM_RUNS as f64
+            );
+        }
+    }
+}
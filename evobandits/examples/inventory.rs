@@ -1,8 +1,6 @@
-use std::time::Instant;
-
 use rand_distr::{Distribution, Poisson};
 
-use evobandits::evobandits::EvoBandits;
+use evobandits::replication::{derive_seeds, replicate};
 
 fn random_poisson(lambda: f64) -> i32 {
     let poi = Poisson::new(lambda).unwrap();
@@ -1054,20 +1052,37 @@ fn inventory(action_vector: &[i32]) -> f64 {
 }
 
 fn main() {
-    let num_runs = 1;
+    // The number of runs is the optional first argument, e.g. `cargo run --example inventory 100`
+    let num_runs: usize = std::env::args()
+        .nth(1)
+        .map(|arg| {
+            arg.parse()
+                .expect("the number of runs must be a positive integer")
+        })
+        .unwrap_or(1);
+    let bounds = vec![(1, 100), (1, 100)]; // Set the bounds for the problem
+
+    // Optimize inventory in independent runs, seeded from 42, using all available threads. The
+    // seeds only fix the genetic operators: inventory draws its demand from rand::rng(), so the
+    // runs are not reproducible.
+    let replications = replicate(
+        &Default::default(),
+        &Default::default(),
+        &inventory,
+        &bounds,
+        10000,
+        &derive_seeds(Some(42), num_runs),
+        0,
+    );
+
     let mut total_value = 0.0;
     let mut total_time = 0.0; // To keep track of the total time
 
-    for i in 0..num_runs {
-        let start_time = Instant::now(); // Record the start time
-        let bounds = vec![(1, 100), (1, 100)]; // Set the bounds for the problem
-        let mut evobandits = EvoBandits::new(Default::default()); // Initialize a default EvoBandits Instance
-        let result = evobandits.optimize(inventory, bounds, 10000, None); // Optimize inventory, unseeded, with constraints (bounds, budget)
-
-        let elapsed_time = start_time.elapsed().as_secs_f64(); // Record the elapsed time
+    for (i, replication) in replications.iter().enumerate() {
+        let elapsed_time = replication.elapsed.as_secs_f64();
         total_time += elapsed_time; // Add the elapsed time to the total
 
-        let true_objective_value = get_true_objective_value(&result);
+        let true_objective_value = get_true_objective_value(&replication.action_vector);
         total_value += true_objective_value;
 
         // Print the counter, the true objective value, and the time for every 10 runs
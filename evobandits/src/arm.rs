@@ -1,7 +1,14 @@
+use rand::RngCore;
 use std::hash::{Hash, Hasher};
 
 pub trait OptimizationFn {
     fn evaluate(&self, action_vector: &[i32]) -> f64;
+
+    /// Evaluate the action vector with a seed that EvoBandits derived for this pull. Objectives
+    /// that draw their own entropy ignore the seed.
+    fn evaluate_seeded(&self, action_vector: &[i32], _seed: u64) -> f64 {
+        self.evaluate(action_vector)
+    }
 }
 
 impl<F: Fn(&[i32]) -> f64> OptimizationFn for F {
@@ -10,11 +17,76 @@ impl<F: Fn(&[i32]) -> f64> OptimizationFn for F {
     }
 }
 
+/// Wraps a stochastic objective that takes the seed for its random numbers as second argument.
+///
+/// Together with `PullSeeding::Independent` or `PullSeeding::Common`, this makes the simulations,
+/// and with that the whole optimization, reproducible.
+pub struct Seeded<F>(pub F);
+
+impl<F: Fn(&[i32], u64) -> f64> OptimizationFn for Seeded<F> {
+    fn evaluate(&self, action_vector: &[i32]) -> f64 {
+        (self.0)(action_vector, rand::rng().next_u64())
+    }
+
+    fn evaluate_seeded(&self, action_vector: &[i32], seed: u64) -> f64 {
+        (self.0)(action_vector, seed)
+    }
+}
+
+/// A cheap check whether an action vector satisfies the constraints of the problem. Infeasible
+/// candidates are repaired or resampled by `EvoBandits` before they are simulated.
+pub trait FeasibilityFn {
+    fn is_feasible(&self, action_vector: &[i32]) -> bool;
+
+    /// Check a batch of candidates at once, e.g. with a vectorized implementation.
+    fn are_feasible(&self, action_vectors: &[&[i32]]) -> Vec<bool> {
+        action_vectors
+            .iter()
+            .map(|action_vector| self.is_feasible(action_vector))
+            .collect()
+    }
+}
+
+impl<F: Fn(&[i32]) -> bool> FeasibilityFn for F {
+    fn is_feasible(&self, action_vector: &[i32]) -> bool {
+        self(action_vector)
+    }
+}
+
+/// Summary statistics of the rewards of an arm.
+#[derive(Debug, Clone, PartialEq)]
+pub struct ArmStatistics {
+    pub action_vector: Vec<i32>,
+    pub mean_reward: f64,
+    pub num_pulls: i32,
+    pub std_dev: f64,
+}
+
+impl ArmStatistics {
+    /// The standard error of the mean reward. It is infinite for an arm with fewer than two
+    /// pulls, whose standard deviation of zero does not measure the noise of its rewards.
+    pub fn std_error(&self) -> f64 {
+        if self.num_pulls < 2 {
+            return f64::INFINITY;
+        }
+        self.std_dev / (self.num_pulls as f64).sqrt()
+    }
+
+    /// The normal approximation of the confidence interval for the mean reward, with the given
+    /// z-score, e.g. 1.96 for a 95% confidence interval.
+    pub fn confidence_interval(&self, z: f64) -> (f64, f64) {
+        let half_width = z * self.std_error();
+        (self.mean_reward - half_width, self.mean_reward + half_width)
+    }
+}
+
 #[derive(Debug)]
 pub(crate) struct Arm {
     action_vector: Vec<i32>,
     reward: f64,
     num_pulls: i32,
+    // Sum of squared deviations from the mean reward, updated with Welford's algorithm
+    squared_deviations: f64,
 }
 
 impl Arm {
@@ -22,23 +94,40 @@ impl Arm {
         Self {
             reward: 0.0,
             num_pulls: 0,
+            squared_deviations: 0.0,
             action_vector: action_vector.to_vec(),
         }
     }
 
-    pub(crate) fn pull<F: OptimizationFn>(&mut self, opt_fn: &F) -> f64 {
-        let g = opt_fn.evaluate(&self.action_vector);
+    /// Simulate the arm once, without updating its statistics.
+    pub(crate) fn evaluate<F: OptimizationFn>(&self, opt_fn: &F, seed: Option<u64>) -> f64 {
+        match seed {
+            Some(seed) => opt_fn.evaluate_seeded(&self.action_vector, seed),
+            None => opt_fn.evaluate(&self.action_vector),
+        }
+    }
+
+    #[cfg(test)]
+    pub(crate) fn pull<F: OptimizationFn>(&mut self, opt_fn: &F, seed: Option<u64>) -> f64 {
+        let g = self.evaluate(opt_fn, seed);
 
-        self.reward += g;
-        self.num_pulls += 1;
+        self.update(g);
 
         g
     }
 
+    pub(crate) fn update(&mut self, g: f64) {
+        let delta = g - self.get_mean_reward();
+        self.reward += g;
+        self.num_pulls += 1;
+        self.squared_deviations += delta * (g - self.get_mean_reward());
+    }
+
     pub(crate) fn get_num_pulls(&self) -> i32 {
         self.num_pulls
     }
 
+    #[cfg(test)]
     pub(crate) fn get_function_value<F: OptimizationFn>(&self, opt_fn: &F) -> f64 {
         opt_fn.evaluate(&self.action_vector)
     }
@@ -47,12 +136,36 @@ impl Arm {
         &self.action_vector
     }
 
+    /// Map the action vector onto a grid that is finer by factor in the given dimensions.
+    pub(crate) fn refine(&mut self, dimensions: &[usize], factor: i32) {
+        for &i in dimensions {
+            self.action_vector[i] *= factor;
+        }
+    }
+
     pub(crate) fn get_mean_reward(&self) -> f64 {
         if self.num_pulls == 0 {
             return 0.0;
         }
         self.reward / self.num_pulls as f64
     }
+
+    pub(crate) fn get_statistics(&self) -> ArmStatistics {
+        ArmStatistics {
+            action_vector: self.action_vector.clone(),
+            mean_reward: self.get_mean_reward(),
+            num_pulls: self.num_pulls,
+            std_dev: self.get_variance().sqrt(),
+        }
+    }
+
+    /// The sample variance of the rewards, or 0.0 if the arm was pulled less than twice.
+    pub(crate) fn get_variance(&self) -> f64 {
+        if self.num_pulls < 2 {
+            return 0.0;
+        }
+        self.squared_deviations / (self.num_pulls - 1) as f64
+    }
 }
 
 impl Clone for Arm {
@@ -61,6 +174,7 @@ impl Clone for Arm {
             action_vector: self.action_vector.clone(),
             reward: self.reward,
             num_pulls: self.num_pulls,
+            squared_deviations: self.squared_deviations,
         }
     }
 }
@@ -98,23 +212,86 @@ mod tests {
     #[test]
     fn test_arm_pull() {
         let mut arm = Arm::new(&vec![1, 2]);
-        let reward = arm.pull(&mock_opti_function);
+        let reward = arm.pull(&mock_opti_function, None);
 
         assert_eq!(reward, 5.0);
         assert_eq!(arm.get_num_pulls(), 1);
         assert_eq!(arm.get_mean_reward(), 5.0);
     }
 
+    #[test]
+    fn test_arm_pull_seeded() {
+        let opt_fn = Seeded(|_: &[i32], seed: u64| seed as f64);
+        let mut arm = Arm::new(&vec![1, 2]);
+        arm.pull(&opt_fn, Some(3));
+        arm.pull(&opt_fn, Some(5));
+
+        assert_eq!(arm.get_num_pulls(), 2);
+        assert_eq!(arm.get_mean_reward(), 4.0);
+
+        // Plain objectives ignore the seed
+        assert_eq!(arm.pull(&mock_opti_function, Some(3)), 5.0);
+    }
+
     #[test]
     fn test_arm_pull_multiple() {
         let mut arm = Arm::new(&vec![1, 2]);
-        arm.pull(&mock_opti_function);
-        arm.pull(&mock_opti_function);
+        arm.pull(&mock_opti_function, None);
+        arm.pull(&mock_opti_function, None);
 
         assert_eq!(arm.get_num_pulls(), 2);
         assert_eq!(arm.get_mean_reward(), 5.0); // Since reward is always 5.0
     }
 
+    #[test]
+    fn test_arm_variance() {
+        let opt_fn = Seeded(|_: &[i32], seed: u64| seed as f64);
+        let mut arm = Arm::new(&vec![1, 2]);
+        assert_eq!(arm.get_variance(), 0.0);
+
+        arm.pull(&opt_fn, Some(2));
+        assert_eq!(arm.get_variance(), 0.0); // Not defined for a single pull
+
+        for seed in [4, 4, 4, 5, 5, 7, 9] {
+            arm.pull(&opt_fn, Some(seed));
+        }
+        assert_eq!(arm.get_mean_reward(), 5.0);
+        assert!((arm.get_variance() - 32.0 / 7.0).abs() < 1e-12);
+
+        // The variance is preserved by clones
+        assert_eq!(arm.clone().get_variance(), arm.get_variance());
+    }
+
+    #[test]
+    fn test_arm_statistics() {
+        let opt_fn = Seeded(|_: &[i32], seed: u64| seed as f64);
+        let mut arm = Arm::new(&vec![1, 2]);
+        for seed in [2, 4, 4, 4, 5, 5, 7, 9] {
+            arm.pull(&opt_fn, Some(seed));
+        }
+
+        let statistics = arm.get_statistics();
+        assert_eq!(statistics.action_vector, vec![1, 2]);
+        assert_eq!(statistics.mean_reward, 5.0);
+        assert_eq!(statistics.num_pulls, 8);
+        assert!((statistics.std_error() - (32.0f64 / 7.0 / 8.0).sqrt()).abs() < 1e-12);
+
+        let (lower, upper) = statistics.confidence_interval(1.96);
+        assert!(lower < 5.0 && upper > 5.0);
+        assert!((upper - lower - 2.0 * 1.96 * statistics.std_error()).abs() < 1e-12);
+
+        // A single pull says nothing about the noise, so the interval is unbounded
+        let mut arm = Arm::new(&[1, 2]);
+        arm.pull(&opt_fn, Some(5));
+        let statistics = arm.get_statistics();
+        assert_eq!(statistics.std_dev, 0.0);
+        assert_eq!(statistics.std_error(), f64::INFINITY);
+        assert_eq!(
+            statistics.confidence_interval(1.96),
+            (f64::NEG_INFINITY, f64::INFINITY)
+        );
+    }
+
     #[test]
     fn test_arm_clone() {
         let arm = Arm::new(&vec![1, 2]);
@@ -143,7 +320,7 @@ mod tests {
     #[test]
     fn test_clone_after_pulls() {
         let mut arm = Arm::new(&vec![1, 2]);
-        arm.pull(&mock_opti_function);
+        arm.pull(&mock_opti_function, None);
         let cloned_arm = arm.clone();
         assert_eq!(arm.get_num_pulls(), cloned_arm.get_num_pulls());
         assert_eq!(arm.get_mean_reward(), cloned_arm.get_mean_reward());
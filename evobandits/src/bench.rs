@@ -0,0 +1,81 @@
+//! Entry points to the internal operations of EvoBandits, for the benchmarks in `benches/`.
+//!
+//! Only compiled with the `bench` feature. The wrappers call the operations exactly as the
+//! optimization does, so the benchmarks measure the same code, but they are not a stable API.
+
+use crate::arm::Arm;
+use crate::evobandits::EvoBandits;
+use crate::genetic::GeneticAlgorithm;
+use crate::sorted_multi_map::{FloatKey, SortedMultiMap};
+
+/// A population of individuals, as it is passed between the genetic operators.
+#[derive(Debug, Clone)]
+pub struct Population(Vec<Arm>);
+
+impl Population {
+    /// Generate a random population of `genetic_algorithm.population_size` distinct individuals.
+    pub fn random(genetic_algorithm: &GeneticAlgorithm, seed: u64) -> Population {
+        Population(genetic_algorithm.generate_new_population(seed))
+    }
+
+    pub fn len(&self) -> usize {
+        self.0.len()
+    }
+
+    pub fn is_empty(&self) -> bool {
+        self.0.is_empty()
+    }
+}
+
+pub fn crossover(
+    genetic_algorithm: &GeneticAlgorithm,
+    seed: u64,
+    population: &Population,
+) -> Population {
+    Population(genetic_algorithm.crossover(seed, &population.0))
+}
+
+pub fn mutate(
+    genetic_algorithm: &GeneticAlgorithm,
+    seed: u64,
+    population: &Population,
+) -> Population {
+    Population(genetic_algorithm.mutate(seed, &population.0))
+}
+
+/// Look up the index of each individual in the arm memory, and return the number of hits.
+pub fn get_arm_indexes(evobandits: &EvoBandits, population: &Population) -> usize {
+    population
+        .0
+        .iter()
+        .filter(|individual| evobandits.get_arm_index(individual) >= 0)
+        .count()
+}
+
+pub fn find_best_ucb(evobandits: &EvoBandits, simulations_used: usize) -> i32 {
+    evobandits.find_best_ucb(simulations_used)
+}
+
+/// The sample average tree, which orders the arms by their mean reward.
+#[derive(Debug)]
+pub struct SampleAverageTree(SortedMultiMap<FloatKey, i32>);
+
+impl SampleAverageTree {
+    pub fn new() -> Self {
+        SampleAverageTree(SortedMultiMap::new())
+    }
+
+    pub fn insert(&mut self, mean_reward: f64, arm_index: i32) {
+        self.0.insert(FloatKey::new(mean_reward), arm_index);
+    }
+
+    pub fn delete(&mut self, mean_reward: f64, arm_index: i32) -> bool {
+        self.0.delete(&FloatKey::new(mean_reward), &arm_index)
+    }
+}
+
+impl Default for SampleAverageTree {
+    fn default() -> Self {
+        Self::new()
+    }
+}
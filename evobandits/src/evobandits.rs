@@ -1,10 +1,96 @@
-use crate::arm::{Arm, OptimizationFn};
-use crate::genetic::GeneticAlgorithm;
+use crate::arm::{Arm, ArmStatistics, FeasibilityFn, OptimizationFn};
+use crate::genetic::{self, Condition, GeneticAlgorithm};
+use crate::options::{ConfidenceBound, OperatorSchedule, Options, PullSeeding};
+use crate::schedule::ScheduleState;
 use crate::sorted_multi_map::{FloatKey, SortedMultiMap};
+use crate::stats::{self, Stats};
+use crate::surrogate::NearestNeighbors;
 use rand::prelude::SliceRandom;
 use rand::rngs::StdRng;
+use rand::seq::IndexedRandom;
 use rand::{RngCore, SeedableRng};
-use std::collections::HashMap;
+use std::collections::{HashMap, HashSet};
+use std::fmt;
+use std::time::Instant;
+
+/// Statistics of the arms of an optimization that are needed to rank the alternatives to the best
+/// arm without simulating them again.
+#[derive(Debug, Clone, PartialEq)]
+pub struct OptimizationResult {
+    /// The arm that was returned by the optimization.
+    pub best_arm: ArmStatistics,
+    /// The arms with the lowest mean rewards, in ascending order of the mean reward.
+    pub top_arms: Vec<ArmStatistics>,
+    /// The UCB value of each of the top arms. Lower values are better.
+    pub ucb_values: Vec<f64>,
+    pub simulations_used: usize,
+}
+
+/// A simulation of an arm that is requested by `EvoBandits::ask`.
+#[derive(Debug, Clone, PartialEq)]
+pub struct Trial {
+    pub action_vector: Vec<i32>,
+    /// The seed for the simulation, if pull seeding is enabled.
+    pub seed: Option<u64>,
+}
+
+/// The state of an optimization in progress, see `EvoBandits::progress`.
+#[derive(Debug, Clone, PartialEq)]
+pub struct Progress {
+    pub generation: usize,
+    pub simulations_used: usize,
+    /// The arm that would be returned if the optimization stopped now.
+    pub best_arm: ArmStatistics,
+    /// The average of the mean rewards of the current population.
+    pub population_mean: f64,
+}
+
+// A simulation of the current batch that awaits its reward. New arms have the arm_index -1.
+#[derive(Debug, PartialEq)]
+struct Pull {
+    arm_index: i32,
+    individual: Arm,
+    seed: Option<u64>,
+}
+
+// The state of the final identification of the best arm by successive halving.
+#[derive(Debug, Clone, PartialEq)]
+struct SuccessiveHalving {
+    candidates: Vec<i32>,
+    round: usize,
+    num_rounds: usize,
+    remaining_budget: usize,
+}
+
+// The stage of the optimization in progress, which determines the next batch of simulations.
+#[derive(Debug, Clone, PartialEq)]
+enum Stage {
+    Idle,
+    // Sample the initial population, which is generated from the seed.
+    Initialization(u64),
+    Generations,
+    FinalPhase(SuccessiveHalving),
+    Finished,
+}
+
+// Rounds of sampling or repair before the search for feasible candidates is given up.
+const FEASIBILITY_ATTEMPTS: usize = 100;
+
+// The feasibility check of the optimizations, see `EvoBandits::set_feasibility`.
+struct Feasibility(Box<dyn FeasibilityFn + Send + Sync>);
+
+impl fmt::Debug for Feasibility {
+    fn fmt(&self, f: &mut fmt::Formatter<'_>) -> fmt::Result {
+        f.write_str("Feasibility")
+    }
+}
+
+// Checks cannot be compared, so any two are considered equal.
+impl PartialEq for Feasibility {
+    fn eq(&self, _other: &Self) -> bool {
+        true
+    }
+}
 
 #[derive(Debug, PartialEq)]
 pub struct EvoBandits {
@@ -12,10 +98,34 @@ pub struct EvoBandits {
     arm_memory: Vec<Arm>,
     lookup_table: HashMap<Vec<i32>, i32>,
     genetic_algorithm: GeneticAlgorithm,
+    options: Options,
+    pull_seed_rng: Option<StdRng>,
+    generation_seed: u64,
+    best_arm_index: Option<i32>,
+    simulations_used: usize,
+    stats: Option<Stats>,
+    feasibility: Option<Feasibility>,
+    conditions: Vec<Condition>,
+    schedule: Option<ScheduleState>,
+    // State of the optimization in progress
+    rng: StdRng,
+    stage: Stage,
+    pending: Vec<Pull>,
+    main_budget: usize,
+    final_phase_budget: usize,
+    generation: usize,
+    start_time: Option<Instant>,
+    ask_time: Option<Instant>,
+    // The new offspring of the pending generation, whose success updates the schedule
+    offspring: Vec<Vec<i32>>,
 }
 
 impl EvoBandits {
     pub fn new(genetic_algorithm: GeneticAlgorithm) -> EvoBandits {
+        EvoBandits::with_options(genetic_algorithm, Default::default())
+    }
+
+    pub fn with_options(genetic_algorithm: GeneticAlgorithm, options: Options) -> EvoBandits {
         let arm_memory: Vec<Arm> = Vec::new();
         let lookup_table: HashMap<Vec<i32>, i32> = HashMap::new();
         let sample_average_tree: SortedMultiMap<FloatKey, i32> = SortedMultiMap::new();
@@ -25,10 +135,225 @@ impl EvoBandits {
             arm_memory,
             lookup_table,
             genetic_algorithm,
+            options,
+            pull_seed_rng: None,
+            generation_seed: 0,
+            best_arm_index: None,
+            simulations_used: 0,
+            stats: None,
+            feasibility: None,
+            conditions: Vec::new(),
+            schedule: None,
+            rng: SeedableRng::seed_from_u64(0),
+            stage: Stage::Idle,
+            pending: Vec::new(),
+            main_budget: 0,
+            final_phase_budget: 0,
+            generation: 0,
+            start_time: None,
+            ask_time: None,
+            offspring: Vec::new(),
+        }
+    }
+
+    pub fn options(&self) -> &Options {
+        &self.options
+    }
+
+    pub fn genetic_algorithm(&self) -> &GeneticAlgorithm {
+        &self.genetic_algorithm
+    }
+
+    /// Restrict the following optimizations to the action vectors that pass the check, or remove
+    /// the restriction with None. Infeasible random samples are drawn again, and infeasible
+    /// offspring are replaced by mutations of the current population, so that no simulation is
+    /// spent on them. Each batch of candidates is checked with one call of `are_feasible`.
+    pub fn set_feasibility(&mut self, feasibility: Option<Box<dyn FeasibilityFn + Send + Sync>>) {
+        self.feasibility = feasibility.map(Feasibility);
+    }
+
+    /// Make the following optimizations treat the dimensions of a condition as inactive unless
+    /// its parent dimension takes one of its values, see `Condition`. Arms are canonicalized
+    /// before they are looked up, so that equivalent action vectors share one arm and its
+    /// statistics. An empty list removes the conditions.
+    pub fn set_conditions(&mut self, conditions: Vec<Condition>) {
+        self.conditions = conditions;
+    }
+
+    // Canonicalize the candidates, and keep the first of the candidates that became equal.
+    fn canonicalize(&self, candidates: Vec<Arm>) -> Vec<Arm> {
+        if self.conditions.is_empty() {
+            return candidates;
+        }
+        let mut seen = HashSet::new();
+        candidates
+            .into_iter()
+            .map(|candidate| {
+                let mut action_vector = candidate.get_action_vector().to_vec();
+                let lower_bound = &self.genetic_algorithm.lower_bound;
+                genetic::canonicalize(&self.conditions, lower_bound, &mut action_vector);
+                Arm::new(&action_vector)
+            })
+            .filter(|candidate| seen.insert(candidate.get_action_vector().to_vec()))
+            .collect()
+    }
+
+    // A random population and the mutations of the parents, in canonical form.
+    fn generate_population(&self, seed: u64) -> Vec<Arm> {
+        self.canonicalize(self.genetic_algorithm.generate_new_population(seed))
+    }
+
+    fn mutate(&self, seed: u64, parents: &[Arm]) -> Vec<Arm> {
+        let mutation_span = match &self.schedule {
+            Some(schedule) => schedule.mutation_span,
+            None => self.genetic_algorithm.mutation_span,
+        };
+        let offspring = self
+            .genetic_algorithm
+            .mutate_with_span(seed, parents, mutation_span);
+        self.canonicalize(offspring)
+    }
+
+    // Keep the feasible candidates, and return the number of infeasible ones.
+    fn filter_feasible(&mut self, candidates: Vec<Arm>) -> (Vec<Arm>, usize) {
+        let Some(feasibility) = &self.feasibility else {
+            return (candidates, 0);
+        };
+        let action_vectors: Vec<&[i32]> = candidates
+            .iter()
+            .map(|candidate| candidate.get_action_vector())
+            .collect();
+        let feasible = feasibility.0.are_feasible(&action_vectors);
+        assert_eq!(
+            feasible.len(),
+            candidates.len(),
+            "the feasibility check must return one result per candidate"
+        );
+
+        let num_infeasible = feasible.iter().filter(|&&feasible| !feasible).count();
+        stats::count(
+            &mut self.stats,
+            |stats| &mut stats.infeasible_candidates,
+            num_infeasible,
+        );
+        let candidates = candidates
+            .into_iter()
+            .zip(feasible)
+            .filter_map(|(candidate, feasible)| feasible.then_some(candidate))
+            .collect();
+        (candidates, num_infeasible)
+    }
+
+    // Sample up to `size` distinct random arms that are feasible, and optionally not simulated
+    // before. Without a feasibility check or conditions, this is a single random population.
+    fn sample_population(&mut self, seed: u64, size: usize, unseen_only: bool) -> Vec<Arm> {
+        let mut population: Vec<Arm> = Vec::new();
+        let mut seed = seed;
+        for _ in 0..FEASIBILITY_ATTEMPTS {
+            let candidates: Vec<Arm> = self
+                .generate_population(seed)
+                .into_iter()
+                .filter(|candidate| !(unseen_only && self.get_arm_index(candidate) >= 0))
+                .filter(|candidate| !population.contains(candidate))
+                .collect();
+            let (feasible, _) = self.filter_feasible(candidates);
+            population.extend(feasible.into_iter().take(size - population.len()));
+
+            let restricted = self.feasibility.is_some() || !self.conditions.is_empty();
+            if population.len() == size || !restricted {
+                break;
+            }
+            seed = self.rng.next_u64();
+        }
+        population
+    }
+
+    // Screen the new offspring with the surrogate: they are topped up with further mutations of
+    // the population to a pool of n / screening_fraction candidates, and the n candidates with the
+    // lowest predicted mean reward are kept. Offspring that were simulated before are kept as is.
+    fn screen_offspring(&mut self, offspring: Vec<Arm>, population: &[Arm]) -> Vec<Arm> {
+        if self.options.screening_fraction >= 1.0 {
+            return offspring;
+        }
+        let timer = stats::start_timer(&self.stats);
+
+        let (mut pool, mut screened): (Vec<Arm>, Vec<Arm>) = offspring
+            .into_iter()
+            .partition(|candidate| self.get_arm_index(candidate) < 0);
+        let num_new = pool.len();
+        let pool_size = (num_new as f64 / self.options.screening_fraction).ceil() as usize;
+        for _ in 0..FEASIBILITY_ATTEMPTS {
+            if pool.len() >= pool_size {
+                break;
+            }
+            let parents: Vec<Arm> = (0..pool_size - pool.len())
+                .map(|_| population.choose(&mut self.rng).unwrap().clone())
+                .collect();
+            let seed = self.rng.next_u64();
+            let candidates: Vec<Arm> = self
+                .mutate(seed, &parents)
+                .into_iter()
+                .filter(|candidate| self.get_arm_index(candidate) < 0 && !pool.contains(candidate))
+                .collect();
+            let (feasible, _) = self.filter_feasible(candidates);
+            pool.extend(feasible);
+        }
+
+        let surrogate = NearestNeighbors::new(
+            &self.arm_memory,
+            &self.genetic_algorithm.lower_bound,
+            &self.genetic_algorithm.upper_bound,
+            self.options.screening_neighbors,
+        );
+        let mut predictions: Vec<(f64, Arm)> = pool
+            .into_iter()
+            .map(|candidate| (surrogate.predict(candidate.get_action_vector()), candidate))
+            .collect();
+        predictions.sort_by(|a, b| a.0.total_cmp(&b.0));
+
+        stats::count(
+            &mut self.stats,
+            |stats| &mut stats.screened_offspring,
+            predictions.len() - num_new,
+        );
+        screened.extend(
+            predictions
+                .into_iter()
+                .take(num_new)
+                .map(|(_, candidate)| candidate),
+        );
+        stats::record_time(&mut self.stats, timer, |stats| &mut stats.surrogate_time);
+        screened
+    }
+
+    // Replace the infeasible offspring by mutations of random members of the population, which are
+    // feasible, so that the generation does not shrink. Offspring that cannot be repaired within
+    // FEASIBILITY_ATTEMPTS rounds are dropped.
+    fn repair_offspring(&mut self, offspring: Vec<Arm>, population: &[Arm]) -> Vec<Arm> {
+        let (mut repaired, mut missing) = self.filter_feasible(offspring);
+        for _ in 0..FEASIBILITY_ATTEMPTS {
+            if missing == 0 {
+                break;
+            }
+            let parents: Vec<Arm> = (0..missing)
+                .map(|_| population.choose(&mut self.rng).unwrap().clone())
+                .collect();
+            let seed = self.rng.next_u64();
+            let candidates: Vec<Arm> = self
+                .mutate(seed, &parents)
+                .into_iter()
+                .filter(|candidate| {
+                    !population.contains(candidate) && !repaired.contains(candidate)
+                })
+                .collect();
+            let (feasible, _) = self.filter_feasible(candidates);
+            missing -= feasible.len();
+            repaired.extend(feasible);
         }
+        repaired
     }
 
-    fn get_arm_index(&self, individual: &Arm) -> i32 {
+    pub(crate) fn get_arm_index(&self, individual: &Arm) -> i32 {
         match self
             .lookup_table
             .get(&individual.get_action_vector().to_vec())
@@ -48,77 +373,431 @@ impl EvoBandits {
         max_number_pulls
     }
 
-    fn find_best_ucb(&self, simulations_used: usize) -> i32 {
-        let arm_index_ucb_norm_min: i32 = *self.sample_average_tree.iter().next().unwrap().1;
-        let ucb_norm_min: f64 = self.arm_memory[arm_index_ucb_norm_min as usize].get_mean_reward();
+    // Width of the confidence bound on the mean reward of the arm, on the scale of the means that
+    // are normalized with the given range.
+    fn penalty_term(&self, arm: &Arm, range: f64, simulations_used: usize) -> f64 {
+        let num_pulls = arm.get_num_pulls() as f64;
+        let log_term = (simulations_used as f64).ln();
+        let range = if range > 0.0 { range } else { 1.0 };
+        let variance = arm.get_variance() / (range * range);
+
+        match self.options.confidence_bound {
+            ConfidenceBound::Ucb => (2.0 * log_term / num_pulls).sqrt(),
+            ConfidenceBound::UcbV => {
+                (2.0 * variance * log_term / num_pulls).sqrt() + 3.0 * log_term / num_pulls
+            }
+            ConfidenceBound::EmpiricalBernstein => {
+                let log_term = (2.0 * simulations_used as f64).ln();
+                (2.0 * variance * log_term / num_pulls).sqrt()
+                    + 7.0 * log_term / (3.0 * (num_pulls - 1.0).max(1.0))
+            }
+        }
+    }
 
-        let max_number_pulls = self.max_number_pulls();
+    // Minimum and maximum mean reward of the non-dominated set, which normalize the means for the
+    // computation of the UCB values.
+    fn ucb_normalization(&self) -> (f64, f64) {
+        let mut ucb_norm_min = f64::MAX;
+        let mut ucb_norm_max = f64::MIN;
+        for arm_index in self.non_dominated_set() {
+            let mean_reward = self.arm_memory[arm_index as usize].get_mean_reward();
+            ucb_norm_min = f64::min(ucb_norm_min, mean_reward);
+            ucb_norm_max = f64::max(ucb_norm_max, mean_reward);
+        }
+        (ucb_norm_min, ucb_norm_max)
+    }
 
-        let mut ucb_norm_max: f64 = ucb_norm_min;
+    fn ucb_value(
+        &self,
+        arm_index: i32,
+        ucb_norm_min: f64,
+        ucb_norm_max: f64,
+        simulations_used: usize,
+    ) -> f64 {
+        let arm = &self.arm_memory[arm_index as usize];
+
+        // transform sample mean to interval [0,1], like the penalty term
+        let range = ucb_norm_max - ucb_norm_min;
+        let transformed_sample_mean: f64 =
+            (arm.get_mean_reward() - ucb_norm_min) / if range > 0.0 { range } else { 1.0 };
+        let penalty_term: f64 = self.penalty_term(arm, range, simulations_used);
+        transformed_sample_mean + penalty_term
+    }
 
-        for (_ucb_norm, arm_index) in self.sample_average_tree.iter() {
-            ucb_norm_max = f64::max(
-                ucb_norm_max,
-                self.arm_memory[*arm_index as usize].get_mean_reward(),
-            );
+    pub(crate) fn find_best_ucb(&self, simulations_used: usize) -> i32 {
+        let non_dominated_set = self.non_dominated_set();
+        let (ucb_norm_min, ucb_norm_max) = self.ucb_normalization();
 
-            // checks if we are still in the non dominated-set (current mean <= mean_max_pulls)
-            if self.arm_memory[*arm_index as usize].get_num_pulls() == max_number_pulls {
-                break;
-            }
+        // all arms of the non-dominated set are equally good, use the one with the most pulls
+        if ucb_norm_max == ucb_norm_min {
+            return *non_dominated_set.last().unwrap();
         }
 
         // find the solution of non-dominated set with the lowest associated UCB value
         let mut best_arm_index: i32 = 0;
         let mut best_ucb_value: f64 = f64::MAX;
 
-        for (_ucb_norm, arm_index) in self.sample_average_tree.iter() {
-            if ucb_norm_max == ucb_norm_min {
-                best_arm_index = *arm_index;
-            }
-
-            // transform sample mean to interval [0,1]
-            let transformed_sample_mean: f64 =
-                (self.arm_memory[*arm_index as usize].get_mean_reward() - ucb_norm_min)
-                    / (ucb_norm_max - ucb_norm_min);
-            let penalty_term: f64 = (2.0 * (simulations_used as f64).ln()
-                / self.arm_memory[*arm_index as usize].get_num_pulls() as f64)
-                .sqrt();
-            let ucb_value: f64 = transformed_sample_mean + penalty_term;
+        for arm_index in non_dominated_set {
+            let ucb_value = self.ucb_value(arm_index, ucb_norm_min, ucb_norm_max, simulations_used);
 
             // new best solution found
             if ucb_value < best_ucb_value {
-                best_arm_index = *arm_index;
+                best_arm_index = arm_index;
                 best_ucb_value = ucb_value;
             }
+        }
 
-            // checks if we are still in the non dominated-set (current mean <= mean_max_pulls)
+        best_arm_index
+    }
+
+    // Draws the seed that is shared by all pulls of the next generation, if common random numbers
+    // are used.
+    fn start_generation(&mut self) {
+        if self.options.pull_seeding == PullSeeding::Common {
+            if let Some(rng) = self.pull_seed_rng.as_mut() {
+                self.generation_seed = rng.next_u64();
+            }
+        }
+    }
+
+    fn next_pull_seed(&mut self) -> Option<u64> {
+        let rng = self.pull_seed_rng.as_mut()?;
+        match self.options.pull_seeding {
+            PullSeeding::Disabled => None,
+            PullSeeding::Independent => Some(rng.next_u64()),
+            PullSeeding::Common => Some(self.generation_seed),
+        }
+    }
+
+    // The arms of the non-dominated set, i.e. all arms with a mean reward that is not greater than
+    // the mean reward of the arm with the most pulls, ordered by mean reward.
+    fn non_dominated_set(&self) -> Vec<i32> {
+        let max_number_pulls = self.max_number_pulls();
+        let mut arm_indexes: Vec<i32> = Vec::new();
+        for (_key, arm_index) in self.sample_average_tree.iter() {
+            arm_indexes.push(*arm_index);
             if self.arm_memory[*arm_index as usize].get_num_pulls() == max_number_pulls {
                 break;
             }
         }
+        arm_indexes
+    }
 
-        best_arm_index
+    // The candidates of the final identification of the best arm: the non-dominated set, or the
+    // arms of the current population if the non-dominated set is a single arm.
+    fn final_phase_candidates(&self) -> Vec<i32> {
+        let candidates = self.non_dominated_set();
+        if candidates.len() >= 2 {
+            return candidates;
+        }
+        self.sample_average_tree
+            .iter()
+            .take(self.genetic_algorithm.population_size)
+            .map(|(_key, arm_index)| *arm_index)
+            .collect()
     }
 
-    fn sample_and_update<F: OptimizationFn>(
-        &mut self,
-        arm_index: i32,
-        mut individual: Arm,
-        opti_function: &F,
-    ) {
+    // Queue a simulation of the arm for the current batch.
+    fn push_pull(&mut self, arm_index: i32, individual: Arm) {
+        let seed = self.next_pull_seed();
+        self.pending.push(Pull {
+            arm_index,
+            individual,
+            seed,
+        });
+    }
+
+    // Queue the simulations of the next generation: the offspring of the current population, then
+    // the population itself, as long as the main budget lasts.
+    fn queue_generation(&mut self) {
+        self.generation += 1;
+        stats::count(&mut self.stats, |stats| &mut stats.generations, 1);
+        let timer = stats::start_timer(&self.stats);
+
+        let mut current_indexes: Vec<i32> = Vec::new();
+        let mut population: Vec<Arm> = Vec::new();
+
+        // get first self.population_size elements from sorted tree and use value to get arm
+        self.sample_average_tree
+            .iter()
+            .take(self.genetic_algorithm.population_size)
+            .for_each(|(_key, arm_index)| {
+                population.push(self.arm_memory[*arm_index as usize].clone());
+                current_indexes.push(*arm_index);
+            });
+
+        // shuffle population
+        population.shuffle(&mut self.rng);
+        self.start_generation();
+
+        let next_seed = self.rng.next_u64();
+        let crossover_pop = self.genetic_algorithm.crossover(next_seed, &population);
+
+        // mutate automatically removes duplicates
+        let next_seed = self.rng.next_u64();
+        let mutated_pop = self.mutate(next_seed, &crossover_pop);
+        stats::count(
+            &mut self.stats,
+            |stats| &mut stats.duplicate_children,
+            crossover_pop.len() - mutated_pop.len(),
+        );
+        let mutated_pop = self.repair_offspring(mutated_pop, &population);
+
+        stats::record_time(&mut self.stats, timer, |stats| {
+            &mut stats.genetic_operators_time
+        });
+        let mutated_pop = self.screen_offspring(mutated_pop, &population);
+
+        for individual in mutated_pop {
+            if self.simulations_used + self.pending.len() >= self.main_budget {
+                return;
+            }
+
+            let arm_index = self.get_arm_index(&individual);
+
+            // check if arm is in current population
+            if current_indexes.contains(&arm_index) {
+                stats::count(&mut self.stats, |stats| &mut stats.skipped_offspring, 1);
+                continue;
+            }
+            if arm_index >= 0 {
+                stats::count(&mut self.stats, |stats| &mut stats.lookup_hits, 1);
+            } else if self.schedule.is_some() {
+                self.offspring.push(individual.get_action_vector().to_vec());
+            }
+
+            self.push_pull(arm_index, individual);
+        }
+
+        for individual in population {
+            if self.simulations_used + self.pending.len() >= self.main_budget {
+                return;
+            }
+
+            let arm_index = self.get_arm_index(&individual);
+            self.push_pull(arm_index, individual);
+        }
+    }
+
+    // Queue new individuals in place of the trials of the initial population that were skipped, so
+    // that the genetic operators get a full population.
+    fn queue_replacements(&mut self) {
+        let missing = self.genetic_algorithm.population_size - self.arm_memory.len();
+        let seed = self.rng.next_u64();
+        let replacements = self.sample_population(seed, missing, true);
+
+        self.start_generation();
+        for individual in replacements {
+            self.push_pull(-1, individual);
+        }
+    }
+
+    // Queue the simulations of the next round of the final identification of the best arm, with
+    // successive halving: In each round, the remaining candidates are pulled equally often, then
+    // the worse half is discarded. Budget that is left after the last round is spent on the winner
+    // to sharpen its estimate. Returns false if the final phase is complete.
+    fn queue_final_phase_round(&mut self, halving: &mut SuccessiveHalving) -> bool {
+        if halving.round < halving.num_rounds {
+            let round_budget = halving.remaining_budget / (halving.num_rounds - halving.round);
+            let pulls_per_arm = (round_budget / halving.candidates.len()).max(1);
+
+            for _ in 0..pulls_per_arm {
+                // candidates are compared on the same seed if common random numbers are used
+                self.start_generation();
+                for &arm_index in &halving.candidates {
+                    if halving.remaining_budget == 0 {
+                        break;
+                    }
+                    let arm = self.arm_memory[arm_index as usize].clone();
+                    self.push_pull(arm_index, arm);
+                    halving.remaining_budget -= 1;
+                }
+            }
+            return true;
+        }
+
+        let best_arm_index = halving.candidates[0];
+        while halving.remaining_budget > 0 {
+            self.start_generation();
+            let arm = self.arm_memory[best_arm_index as usize].clone();
+            self.push_pull(best_arm_index, arm);
+            halving.remaining_budget -= 1;
+        }
+        !self.pending.is_empty()
+    }
+
+    // Discard the worse half of the candidates after a round of the final phase.
+    fn end_final_phase_round(&self, halving: &mut SuccessiveHalving) {
+        if halving.round >= halving.num_rounds {
+            return;
+        }
+        halving.candidates.sort_by(|a, b| {
+            let mean_a = self.arm_memory[*a as usize].get_mean_reward();
+            let mean_b = self.arm_memory[*b as usize].get_mean_reward();
+            mean_a.total_cmp(&mean_b)
+        });
+        halving
+            .candidates
+            .truncate(halving.candidates.len().div_ceil(2));
+        halving.round += 1;
+    }
+
+    // Select the arm that is returned once the main budget is used up, either directly by its UCB
+    // value, or by starting the final phase.
+    fn end_main_phase(&mut self) {
+        if self.final_phase_budget == 0 {
+            let timer = stats::start_timer(&self.stats);
+            let best_arm_index = self.find_best_ucb(self.simulations_used);
+            stats::record_time(&mut self.stats, timer, |stats| {
+                &mut stats.ucb_selection_time
+            });
+            self.end_optimization(Some(best_arm_index));
+            return;
+        }
+
+        let candidates = self.final_phase_candidates();
+        let num_rounds = (candidates.len() as f64).log2().ceil().max(1.0) as usize;
+        self.stage = Stage::FinalPhase(SuccessiveHalving {
+            candidates,
+            round: 0,
+            num_rounds,
+            remaining_budget: self.final_phase_budget,
+        });
+    }
+
+    fn end_optimization(&mut self, best_arm_index: Option<i32>) {
+        self.best_arm_index = best_arm_index;
+        self.stage = Stage::Finished;
+        stats::record_time(&mut self.stats, self.start_time.take(), |stats| {
+            &mut stats.total_time
+        });
+    }
+
+    // Queue the next batch of simulations. Returns false if the optimization is complete.
+    fn queue_pulls(&mut self) -> bool {
+        assert!(
+            self.pending.is_empty(),
+            "the rewards of the pending trials must be told before the next ask"
+        );
+        loop {
+            match std::mem::replace(&mut self.stage, Stage::Finished) {
+                Stage::Idle => {
+                    self.stage = Stage::Idle;
+                    return false;
+                }
+                Stage::Initialization(seed) => {
+                    self.stage = Stage::Generations;
+                    let population_size = self.genetic_algorithm.population_size;
+                    let initial_population = self.sample_population(seed, population_size, false);
+                    assert!(
+                        !initial_population.is_empty(),
+                        "no feasible action vector was found in {} random samples",
+                        FEASIBILITY_ATTEMPTS * population_size
+                    );
+                    self.start_generation();
+                    for individual in initial_population {
+                        self.push_pull(-1, individual);
+                    }
+                    return true;
+                }
+                Stage::Generations => {
+                    self.stage = Stage::Generations;
+                    if self.simulations_used >= self.main_budget {
+                        self.end_main_phase();
+                        continue;
+                    }
+                    // Replace the skipped trials of the initial population, unless there are no
+                    // unseen arms left to sample
+                    if self.arm_memory.len() < self.genetic_algorithm.population_size {
+                        self.queue_replacements();
+                    }
+                    if self.pending.is_empty() {
+                        self.queue_generation();
+                    }
+                    if !self.pending.is_empty() {
+                        return true;
+                    }
+                }
+                Stage::FinalPhase(mut halving) => {
+                    if !self.queue_final_phase_round(&mut halving) {
+                        self.end_optimization(Some(halving.candidates[0]));
+                        return false;
+                    }
+                    if self.pending.is_empty() {
+                        self.end_final_phase_round(&mut halving);
+                    }
+                    self.stage = Stage::FinalPhase(halving);
+                    if !self.pending.is_empty() {
+                        return true;
+                    }
+                }
+                Stage::Finished => return false,
+            }
+        }
+    }
+
+    // Update the schedule with the share of the new offspring of the last generation that entered
+    // the population. Skipped offspring count as failures.
+    fn update_schedule(&mut self) {
+        let offspring = std::mem::take(&mut self.offspring);
+        let Some(schedule) = self.schedule.as_mut() else {
+            return;
+        };
+        let population: HashSet<i32> = self
+            .sample_average_tree
+            .iter()
+            .take(self.genetic_algorithm.population_size)
+            .map(|(_key, arm_index)| *arm_index)
+            .collect();
+        let num_successes = offspring
+            .iter()
+            .filter(|action_vector| {
+                self.lookup_table
+                    .get(*action_vector)
+                    .is_some_and(|arm_index| population.contains(arm_index))
+            })
+            .count();
+        schedule.update(
+            offspring.len(),
+            num_successes,
+            self.genetic_algorithm.mutation_span,
+        );
+    }
+
+    // Complete the current batch, after the rewards of all its simulations were recorded.
+    fn end_batch(&mut self) {
+        self.update_schedule();
+        self.stage = match std::mem::replace(&mut self.stage, Stage::Idle) {
+            Stage::FinalPhase(mut halving) => {
+                self.end_final_phase_round(&mut halving);
+                Stage::FinalPhase(halving)
+            }
+            stage => stage,
+        };
+    }
+
+    // Record the reward of a simulation of the arm, which is a new arm if arm_index is -1.
+    fn update_arm(&mut self, arm_index: i32, mut individual: Arm, reward: f64) {
+        assert!(
+            !reward.is_nan(),
+            "the reward of {:?} is NaN, skip the trial instead",
+            individual.get_action_vector()
+        );
+        let timer = stats::start_timer(&self.stats);
         if arm_index >= 0 {
+            stats::count(&mut self.stats, |stats| &mut stats.repulls, 1);
             self.sample_average_tree.delete(
                 &FloatKey::new(self.arm_memory[arm_index as usize].get_mean_reward()),
                 &arm_index,
             );
-            self.arm_memory[arm_index as usize].pull(opti_function);
+            self.arm_memory[arm_index as usize].update(reward);
             self.sample_average_tree.insert(
                 FloatKey::new(self.arm_memory[arm_index as usize].get_mean_reward()),
                 arm_index,
             );
         } else {
-            individual.pull(opti_function);
+            stats::count(&mut self.stats, |stats| &mut stats.new_arms, 1);
+            individual.update(reward);
             self.arm_memory.push(individual.clone());
             self.lookup_table.insert(
                 individual.get_action_vector().to_vec(),
@@ -129,35 +808,55 @@ impl EvoBandits {
                 self.arm_memory.len() as i32 - 1,
             );
         }
+        self.simulations_used += 1;
+        stats::record_time(&mut self.stats, timer, |stats| {
+            &mut stats.tree_maintenance_time
+        });
+    }
+
+    fn sample_and_update<F: OptimizationFn>(
+        &mut self,
+        arm_index: i32,
+        individual: Arm,
+        seed: Option<u64>,
+        opti_function: &F,
+    ) {
+        let timer = stats::start_timer(&self.stats);
+        let reward = if arm_index >= 0 {
+            self.arm_memory[arm_index as usize].evaluate(opti_function, seed)
+        } else {
+            individual.evaluate(opti_function, seed)
+        };
+        stats::record_time(&mut self.stats, timer, |stats| &mut stats.objective_time);
+        self.update_arm(arm_index, individual, reward);
     }
 
+    #[cfg(test)]
     fn initialize_population<F: OptimizationFn>(&mut self, seed: u64, opti_function: &F) {
-        let mut initial_population = self.genetic_algorithm.generate_new_population(seed);
+        let initial_population = self.genetic_algorithm.generate_new_population(seed);
 
-        for (index, individual) in initial_population.iter_mut().enumerate() {
-            individual.pull(opti_function);
-            self.arm_memory.push(individual.clone());
-            self.lookup_table
-                .insert(individual.get_action_vector().to_vec(), index as i32);
-            self.sample_average_tree
-                .insert(FloatKey::new(individual.get_mean_reward()), index as i32);
+        self.start_generation();
+        for individual in initial_population {
+            let seed = self.next_pull_seed();
+            self.sample_and_update(-1, individual, seed, opti_function);
         }
     }
 
-    pub fn optimize<F: OptimizationFn>(
-        &mut self,
-        opti_function: F,
-        bounds: Vec<(i32, i32)>,
-        simulation_budget: usize,
-        seed: Option<u64>,
-    ) -> Vec<i32> {
+    /// Start an optimization that is driven by `ask` and `tell`, instead of `optimize`.
+    ///
+    /// This allows the caller to evaluate the trials of a generation in any way, e.g.
+    /// concurrently, to observe the progress after each batch and to stop early with `finish`.
+    /// The arms of previous optimizations are discarded, continue one with `resume` instead.
+    pub fn start(&mut self, bounds: Vec<(i32, i32)>, simulation_budget: usize, seed: Option<u64>) {
         // Unwrap seed or fall back to system entropy
         let seed = seed.unwrap_or_else(|| rand::rng().next_u64());
-        let mut rng: StdRng = SeedableRng::seed_from_u64(seed);
+        self.rng = SeedableRng::seed_from_u64(seed);
 
         // Set the bounds and check the algorithm configuration
         self.genetic_algorithm.set_bounds(bounds);
         self.genetic_algorithm.validate();
+        self.genetic_algorithm.validate_conditions(&self.conditions);
+        self.options.validate();
 
         assert!(
             simulation_budget >= self.genetic_algorithm.population_size,
@@ -165,95 +864,299 @@ impl EvoBandits {
             self.genetic_algorithm.population_size
         );
 
-        // Initialize the Population for the Optimization
-        let next_seed = rng.next_u64();
-        self.initialize_population(next_seed, &opti_function);
+        // Reserve a share of the budget for the final identification of the best arm
+        self.final_phase_budget =
+            (self.options.final_phase_budget * simulation_budget as f64) as usize;
+        self.main_budget = simulation_budget - self.final_phase_budget;
+        assert!(
+            self.main_budget >= self.genetic_algorithm.population_size,
+            "simulation_budget must cover population_size ({}) and the final_phase_budget",
+            self.genetic_algorithm.population_size
+        );
 
-        // Run Optimization
-        let verbose = false;
-        let mut simulation_used: usize = self.genetic_algorithm.population_size;
-        loop {
-            let mut current_indexes: Vec<i32> = Vec::new();
-            let mut population: Vec<Arm> = Vec::new();
+        // Collect stats for this optimization only, if enabled
+        self.stats = self.options.collect_stats.then(Stats::default);
+        self.start_time = stats::start_timer(&self.stats);
 
-            // get first self.population_size elements from sorted tree and use value to get arm
-            self.sample_average_tree
-                .iter()
-                .take(self.genetic_algorithm.population_size)
-                .for_each(|(_key, arm_index)| {
-                    population.push(self.arm_memory[*arm_index as usize].clone());
-                    current_indexes.push(*arm_index);
-                });
-
-            // shuffle population
-            population.shuffle(&mut rng);
-
-            let next_seed = rng.next_u64();
-            let crossover_pop = self.genetic_algorithm.crossover(next_seed, &population);
-
-            // mutate automatically removes duplicates
-            let next_seed = rng.next_u64();
-            let mutated_pop = self.genetic_algorithm.mutate(next_seed, &crossover_pop);
-
-            for individual in mutated_pop {
-                if simulation_used >= simulation_budget {
-                    return self.arm_memory[self.find_best_ucb(simulation_used) as usize]
-                        .get_action_vector()
-                        .to_vec();
-                }
+        // Initialize the Population for the Optimization
+        let next_seed = self.rng.next_u64();
+        if self.options.pull_seeding != PullSeeding::Disabled {
+            self.pull_seed_rng = Some(SeedableRng::seed_from_u64(self.rng.next_u64()));
+        }
+        self.stage = Stage::Initialization(next_seed);
+        self.pending.clear();
+        self.offspring.clear();
+        self.schedule = (self.options.operator_schedule == OperatorSchedule::SuccessRate)
+            .then(|| ScheduleState::new(self.genetic_algorithm.mutation_span));
+        self.sample_average_tree = SortedMultiMap::new();
+        self.arm_memory.clear();
+        self.lookup_table.clear();
+        self.best_arm_index = None;
+        self.simulations_used = 0;
+        self.generation = 0;
+    }
 
-                let arm_index = self.get_arm_index(&individual);
+    /// Continue the optimization that was started with `start` with extra_budget additional
+    /// simulations, from its current population, arm statistics and random number stream.
+    ///
+    /// The extra budget is split into generations and a final phase like the budget of `start`.
+    /// A finished optimization, or one in its final phase, returns to the generations, and the
+    /// simulations of its final phase are kept in the arm statistics. The unspent budget of an
+    /// interrupted final phase is added to the next final phase.
+    pub fn resume(&mut self, extra_budget: usize) {
+        assert!(
+            self.stage != Stage::Idle,
+            "there is no optimization to resume, call start first"
+        );
+        assert!(
+            self.pending.is_empty(),
+            "the rewards of the pending trials must be told before the optimization is resumed"
+        );
 
-                // check if arm is in current population
-                if current_indexes.contains(&arm_index) {
-                    continue;
+        let extra_final_phase_budget =
+            (self.options.final_phase_budget * extra_budget as f64) as usize;
+        let extra_main_budget = extra_budget - extra_final_phase_budget;
+        match self.stage {
+            Stage::Initialization(_) | Stage::Generations => {
+                self.main_budget += extra_main_budget;
+                self.final_phase_budget += extra_final_phase_budget;
+            }
+            _ => {
+                // The total time of a finished optimization was recorded already
+                if self.stage == Stage::Finished {
+                    self.start_time = stats::start_timer(&self.stats);
                 }
-
-                self.sample_and_update(arm_index, individual.clone(), &opti_function);
-                simulation_used += 1;
+                let unspent_budget = match &self.stage {
+                    Stage::FinalPhase(halving) => halving.remaining_budget,
+                    _ => 0,
+                };
+                self.main_budget = self.simulations_used + extra_main_budget;
+                self.final_phase_budget = unspent_budget + extra_final_phase_budget;
+                self.stage = Stage::Generations;
+                self.best_arm_index = None;
             }
+        }
+    }
 
-            for individual in population {
-                if simulation_used >= simulation_budget {
-                    return self.arm_memory[self.find_best_ucb(simulation_used) as usize]
-                        .get_action_vector()
-                        .to_vec();
-                }
+    /// The next batch of trials of the optimization that was started with `start`, or None if
+    /// it is complete. The rewards of the batch must be passed to `tell` before the next `ask`.
+    pub fn ask(&mut self) -> Option<Vec<Trial>> {
+        if !self.queue_pulls() {
+            return None;
+        }
+        self.ask_time = stats::start_timer(&self.stats);
+        Some(
+            self.pending
+                .iter()
+                .map(|pull| Trial {
+                    action_vector: pull.individual.get_action_vector().to_vec(),
+                    seed: pull.seed,
+                })
+                .collect(),
+        )
+    }
 
-                let arm_index = self.get_arm_index(&individual);
-                self.sample_and_update(arm_index, individual.clone(), &opti_function);
-                simulation_used += 1;
+    /// Record the rewards of the trials of the last `ask`, in the same order. A trial without a
+    /// reward, e.g. because its simulation failed, is skipped and does not consume budget.
+    pub fn tell(&mut self, rewards: &[Option<f64>]) {
+        assert_eq!(
+            rewards.len(),
+            self.pending.len(),
+            "the number of rewards must match the number of pending trials"
+        );
+        stats::record_time(&mut self.stats, self.ask_time.take(), |stats| {
+            &mut stats.objective_time
+        });
+
+        let pulls = std::mem::take(&mut self.pending);
+        let mut num_skipped = 0;
+        for (pull, reward) in pulls.into_iter().zip(rewards) {
+            match reward {
+                Some(reward) => self.update_arm(pull.arm_index, pull.individual, *reward),
+                None => num_skipped += 1,
             }
+        }
+        // The main phase ends by the simulations used, the final phase by its remaining budget
+        if let Stage::FinalPhase(halving) = &mut self.stage {
+            halving.remaining_budget += num_skipped;
+        }
+        self.end_batch();
+    }
 
-            if verbose {
-                let best_arm_index = self.find_best_ucb(simulation_used);
-                print!(
-                    "x: {:?}",
-                    self.arm_memory[best_arm_index as usize].get_action_vector()
-                );
-                // get averaged function value over 50 simulations
-                let mut sum = 0.0;
-                for _ in 0..50 {
-                    sum +=
-                        self.arm_memory[best_arm_index as usize].get_function_value(&opti_function);
-                }
-                print!(" f(x): {:.3}", sum / 50.0);
-
-                print!(" n: {}", simulation_used);
-                // print number of pulls of best arm
-                println!(
-                    " n(x): {}",
-                    self.arm_memory[best_arm_index as usize].get_num_pulls()
-                );
+    /// Stop the optimization early. The pending trials are discarded, and the best arm is selected
+    /// by its UCB value among the arms that were simulated so far.
+    pub fn finish(&mut self) {
+        if matches!(self.stage, Stage::Idle | Stage::Finished) {
+            return;
+        }
+        self.pending.clear();
+        self.offspring.clear();
+        let best_arm_index =
+            (!self.arm_memory.is_empty()).then(|| self.find_best_ucb(self.simulations_used));
+        self.end_optimization(best_arm_index);
+    }
+
+    /// Refine the grid of the given dimensions by factor between two batches of an optimization
+    /// that was started with `start`. An action `a` on the coarse grid becomes `a * factor` on the
+    /// fine grid, so the bounds are multiplied by factor, and the statistics of the simulated
+    /// arms are kept at the same points of the search space. The following generations explore
+    /// the new grid points around the current population.
+    pub fn refine(&mut self, dimensions: &[usize], factor: i32) {
+        assert!(factor >= 1, "factor must be at least 1");
+        assert!(
+            self.pending.is_empty(),
+            "the rewards of the pending trials must be told before the grid is refined"
+        );
+        let num_dimensions = self.genetic_algorithm.lower_bound.len();
+        for &i in dimensions {
+            assert!(
+                i < num_dimensions,
+                "dimension {i} is out of range for {num_dimensions} dimensions"
+            );
+            let (low, high) = (
+                self.genetic_algorithm.lower_bound[i],
+                self.genetic_algorithm.upper_bound[i],
+            );
+            assert!(
+                low.checked_mul(factor).is_some() && high.checked_mul(factor).is_some(),
+                "the refined bounds of dimension {i} overflow"
+            );
+            self.genetic_algorithm.lower_bound[i] = low * factor;
+            self.genetic_algorithm.upper_bound[i] = high * factor;
+        }
+
+        self.lookup_table.clear();
+        for (arm_index, arm) in self.arm_memory.iter_mut().enumerate() {
+            arm.refine(dimensions, factor);
+            self.lookup_table
+                .insert(arm.get_action_vector().to_vec(), arm_index as i32);
+        }
+    }
+
+    /// The state of the optimization after the last batch, if there are simulated arms. Computed
+    /// from the arm statistics, without additional simulations.
+    pub fn progress(&self) -> Option<Progress> {
+        let best_arm_index = self.current_best_arm_index()?;
+
+        let population_size = self.genetic_algorithm.population_size;
+        let population_rewards: Vec<f64> = self
+            .sample_average_tree
+            .iter()
+            .take(population_size)
+            .map(|(_key, arm_index)| self.arm_memory[*arm_index as usize].get_mean_reward())
+            .collect();
+
+        Some(Progress {
+            generation: self.generation,
+            simulations_used: self.simulations_used,
+            best_arm: self.arm_memory[best_arm_index as usize].get_statistics(),
+            population_mean: population_rewards.iter().sum::<f64>()
+                / population_rewards.len() as f64,
+        })
+    }
+
+    pub fn optimize<F: OptimizationFn>(
+        &mut self,
+        opti_function: F,
+        bounds: Vec<(i32, i32)>,
+        simulation_budget: usize,
+        seed: Option<u64>,
+    ) -> Vec<i32> {
+        self.start(bounds, simulation_budget, seed);
+        while self.queue_pulls() {
+            for pull in std::mem::take(&mut self.pending) {
+                self.sample_and_update(pull.arm_index, pull.individual, pull.seed, &opti_function);
             }
+            self.end_batch();
+        }
+
+        let best_arm_index = self.best_arm_index.unwrap();
+        self.arm_memory[best_arm_index as usize]
+            .get_action_vector()
+            .to_vec()
+    }
+
+    // The best arm of the last optimization, or of the arms simulated so far if the optimization
+    // is still in progress, e.g. after an interruption.
+    fn current_best_arm_index(&self) -> Option<i32> {
+        match self.best_arm_index {
+            Some(best_arm_index) => Some(best_arm_index),
+            None if self.arm_memory.is_empty() => None,
+            None => Some(self.find_best_ucb(self.simulations_used)),
+        }
+    }
+
+    /// Summary statistics of the best arm of the last optimization, if there was one. While an
+    /// optimization is in progress, this is the best arm by its UCB value so far.
+    pub fn best_arm(&self) -> Option<ArmStatistics> {
+        self.current_best_arm_index()
+            .map(|arm_index| self.arm_memory[arm_index as usize].get_statistics())
+    }
+
+    /// The state of the adaptive operator schedule of the last optimization, if
+    /// `Options::operator_schedule` adapts the operators.
+    pub fn schedule_state(&self) -> Option<&ScheduleState> {
+        self.schedule.as_ref()
+    }
+
+    /// Restore the state of the adaptive operator schedule between two batches, e.g. from a
+    /// checkpoint of an optimization with the same seed that was continued with `resume`.
+    pub fn set_schedule_state(&mut self, state: ScheduleState) {
+        assert!(
+            self.schedule.is_some(),
+            "there is no adaptive operator schedule, set operator_schedule and call start first"
+        );
+        assert!(
+            self.pending.is_empty(),
+            "the rewards of the pending trials must be told before the schedule state is set"
+        );
+        assert!(
+            state.mutation_span > 0.0 && state.mutation_span <= self.genetic_algorithm.mutation_span,
+            "the mutation_span of the schedule state must be greater than 0.0 and at most mutation_span"
+        );
+        self.schedule = Some(state);
+    }
+
+    /// Timings and counters of the last optimization, if `Options::collect_stats` is set.
+    pub fn stats(&self) -> Option<&Stats> {
+        self.stats.as_ref()
+    }
+
+    /// The best arm and the `top_k` arms with the lowest mean rewards of the last optimization,
+    /// if there was one.
+    pub fn result(&self, top_k: usize) -> Option<OptimizationResult> {
+        let best_arm = self.best_arm()?;
+        let (ucb_norm_min, ucb_norm_max) = self.ucb_normalization();
+
+        let mut top_arms = Vec::with_capacity(top_k.min(self.arm_memory.len()));
+        let mut ucb_values = Vec::with_capacity(top_arms.capacity());
+        for (_key, arm_index) in self.sample_average_tree.iter().take(top_k) {
+            top_arms.push(self.arm_memory[*arm_index as usize].get_statistics());
+            ucb_values.push(self.ucb_value(
+                *arm_index,
+                ucb_norm_min,
+                ucb_norm_max,
+                self.simulations_used,
+            ));
         }
+
+        Some(OptimizationResult {
+            best_arm,
+            top_arms,
+            ucb_values,
+            simulations_used: self.simulations_used,
+        })
     }
 }
 
 #[cfg(test)]
 mod tests {
     use super::*;
+    use crate::arm::Seeded;
     use std::cell::RefCell;
+    use std::collections::HashSet;
+    use std::sync::atomic::{AtomicUsize, Ordering};
+    use std::sync::Arc;
 
     #[test]
     fn test_sorted_multi_map_insert() {
@@ -394,8 +1297,8 @@ mod tests {
             .lookup_table
             .insert(arm2.get_action_vector().to_vec(), 1);
 
-        evobandits.sample_and_update(0, arm.clone(), &mock_opti_function);
-        evobandits.sample_and_update(1, arm2.clone(), &mock_opti_function);
+        evobandits.sample_and_update(0, arm.clone(), None, &mock_opti_function);
+        evobandits.sample_and_update(1, arm2.clone(), None, &mock_opti_function);
 
         assert_eq!(evobandits.find_best_ucb(100), 0);
     }
@@ -420,7 +1323,7 @@ mod tests {
             .lookup_table
             .insert(arm.get_action_vector().to_vec(), 0);
 
-        evobandits.sample_and_update(0, arm.clone(), &mock_opti_function);
+        evobandits.sample_and_update(0, arm.clone(), None, &mock_opti_function);
 
         assert_eq!(evobandits.arm_memory[0].get_num_pulls(), 2);
         assert_eq!(evobandits.arm_memory[0].get_mean_reward(), 0.0);
@@ -438,7 +1341,7 @@ mod tests {
         fn mock_opti_function(vec: &[i32]) -> f64 {
             vec.iter().map(|&x| x as f64).sum()
         }
-        
+
         // Helper function that generates a evobandits result based on a specific seed.
         fn generate_result(seed: Option<u64>) -> Vec<i32> {
             let bounds = vec![(1, 100), (1, 100)];
@@ -454,6 +1357,748 @@ mod tests {
         assert_ne!(generate_result(Some(seed)), generate_result(Some(seed + 1)));
     }
 
+    #[test]
+    fn test_reproduction_with_pull_seeding() {
+        // Mock a noisy optimization function that only draws entropy from the seed
+        fn noisy_opti_function(vec: &[i32], seed: u64) -> f64 {
+            let noise = StdRng::seed_from_u64(seed).next_u64() % 100;
+            vec.iter().map(|&x| x as f64).sum::<f64>() + noise as f64
+        }
+
+        // Helper function that generates a evobandits result with a specific pull seeding.
+        fn generate_result(pull_seeding: PullSeeding, seed: u64) -> Vec<i32> {
+            let bounds = vec![(1, 100), (1, 100)];
+            let options = Options {
+                pull_seeding,
+                ..Default::default()
+            };
+            let mut evobandits = EvoBandits::with_options(Default::default(), options);
+            evobandits.optimize(Seeded(noisy_opti_function), bounds, 1000, Some(seed))
+        }
+
+        // The whole optimization is reproducible, even though the objective is stochastic
+        for pull_seeding in [PullSeeding::Independent, PullSeeding::Common] {
+            assert_eq!(
+                generate_result(pull_seeding, 42),
+                generate_result(pull_seeding, 42)
+            );
+        }
+    }
+
+    #[test]
+    fn test_pull_seeds() {
+        // Helper function that collects the seeds that are passed to the objective
+        fn collect_seeds(pull_seeding: PullSeeding) -> Vec<u64> {
+            let seeds = RefCell::new(Vec::new());
+            let opti_function = Seeded(|_: &[i32], seed: u64| {
+                seeds.borrow_mut().push(seed);
+                0.0
+            });
+
+            let bounds = vec![(1, 100), (1, 100)];
+            let options = Options {
+                pull_seeding,
+                ..Default::default()
+            };
+            let mut evobandits = EvoBandits::with_options(Default::default(), options);
+            evobandits.optimize(opti_function, bounds, 100, Some(42));
+            seeds.into_inner()
+        }
+
+        // Each pull gets a different seed
+        let seeds = collect_seeds(PullSeeding::Independent);
+        assert_eq!(seeds.len(), 100);
+        assert_eq!(seeds.iter().collect::<HashSet<_>>().len(), 100);
+
+        // Pulls of the same generation share a seed, e.g. the initial population
+        let seeds = collect_seeds(PullSeeding::Common);
+        let population_size = GeneticAlgorithm::default().population_size;
+        assert_eq!(seeds.len(), 100);
+        assert!(seeds[..population_size].iter().all(|&s| s == seeds[0]));
+        assert_ne!(seeds[0], seeds[99]);
+    }
+
+    #[test]
+    fn test_penalty_term_variance_aware() {
+        // Two arms with the same number of pulls, but different variance
+        let constant = Seeded(|_: &[i32], _: u64| 1.0);
+        let noisy = Seeded(|_: &[i32], seed: u64| seed as f64);
+        let mut arm_constant = Arm::new(&[1, 1]);
+        let mut arm_noisy = Arm::new(&[2, 2]);
+        for seed in 0..10 {
+            arm_constant.pull(&constant, Some(seed));
+            arm_noisy.pull(&noisy, Some(seed));
+        }
+
+        // UCB ignores the variance, the variance-aware bounds penalize the noisy arm
+        for (confidence_bound, expected_eq) in [
+            (ConfidenceBound::Ucb, true),
+            (ConfidenceBound::UcbV, false),
+            (ConfidenceBound::EmpiricalBernstein, false),
+        ] {
+            let options = Options {
+                confidence_bound,
+                ..Default::default()
+            };
+            let evobandits = EvoBandits::with_options(Default::default(), options);
+            let penalty_constant = evobandits.penalty_term(&arm_constant, 1.0, 100);
+            let penalty_noisy = evobandits.penalty_term(&arm_noisy, 1.0, 100);
+            assert_eq!(penalty_constant == penalty_noisy, expected_eq);
+            assert!(penalty_constant <= penalty_noisy);
+        }
+    }
+
+    #[test]
+    fn test_optimize_with_confidence_bounds() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            vec.iter().map(|&x| x as f64).sum()
+        }
+
+        for confidence_bound in [ConfidenceBound::UcbV, ConfidenceBound::EmpiricalBernstein] {
+            // Helper function that generates a result with the given confidence bound.
+            let generate_result = |seed: u64| {
+                let options = Options {
+                    confidence_bound,
+                    ..Default::default()
+                };
+                let mut evobandits = EvoBandits::with_options(Default::default(), options);
+                evobandits.optimize(
+                    mock_opti_function,
+                    vec![(1, 100), (1, 100)],
+                    1000,
+                    Some(seed),
+                )
+            };
+
+            let result = generate_result(42);
+            assert_eq!(result, generate_result(42));
+            assert!(result.iter().all(|&x| (1..=100).contains(&x)));
+        }
+    }
+
+    #[test]
+    fn test_final_phase() {
+        // Mock opti_function that keeps track of used simulations
+        let simulation_used = RefCell::new(0);
+        let mock_opti_function = |vec: &[i32]| {
+            *simulation_used.borrow_mut() += 1;
+            vec.iter().map(|&x| x as f64).sum()
+        };
+
+        let options = Options {
+            final_phase_budget: 0.2,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        assert_eq!(evobandits.best_arm(), None);
+
+        let simulation_budget = 1000;
+        let bounds = vec![(1, 100), (1, 100)];
+        let result = evobandits.optimize(mock_opti_function, bounds, simulation_budget, Some(42));
+
+        // The final phase adheres to the budget, and its best arm is returned with statistics
+        assert_eq!(simulation_budget, *simulation_used.borrow());
+        let best_arm = evobandits.best_arm().unwrap();
+        assert_eq!(best_arm.action_vector, result);
+        assert_eq!(best_arm.mean_reward, result.iter().sum::<i32>() as f64);
+        assert!(best_arm.num_pulls > 1);
+    }
+
+    #[test]
+    fn test_result() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            vec.iter().map(|&x| x as f64).sum()
+        }
+
+        let mut evobandits = EvoBandits::new(Default::default());
+        assert_eq!(evobandits.result(10), None);
+
+        let bounds = vec![(1, 100), (1, 100)];
+        let best_action_vector = evobandits.optimize(mock_opti_function, bounds, 1000, Some(42));
+        let result = evobandits.result(10).unwrap();
+
+        assert_eq!(result.best_arm.action_vector, best_action_vector);
+        assert_eq!(result.simulations_used, 1000);
+        assert_eq!(result.top_arms.len(), 10);
+        assert_eq!(result.ucb_values.len(), 10);
+        assert!(result
+            .ucb_values
+            .iter()
+            .all(|ucb_value| ucb_value.is_finite()));
+
+        // The top arms are ordered by their mean reward
+        for pair in result.top_arms.windows(2) {
+            assert!(pair[0].mean_reward <= pair[1].mean_reward);
+        }
+
+        // top_k is limited by the number of arms
+        let result = evobandits.result(usize::MAX).unwrap();
+        assert_eq!(result.top_arms.len(), evobandits.arm_memory.len());
+    }
+
+    #[test]
+    fn test_ask_tell() {
+        fn noisy_opti_function(vec: &[i32], seed: u64) -> f64 {
+            let noise = StdRng::seed_from_u64(seed).next_u64() % 100;
+            vec.iter().map(|&x| x as f64).sum::<f64>() + noise as f64
+        }
+        let bounds = vec![(1, 100), (1, 100)];
+        let options = Options {
+            pull_seeding: PullSeeding::Independent,
+            final_phase_budget: 0.1,
+            ..Default::default()
+        };
+
+        let mut evobandits = EvoBandits::with_options(Default::default(), options.clone());
+        let best_action_vector =
+            evobandits.optimize(Seeded(noisy_opti_function), bounds.clone(), 1000, Some(42));
+
+        // Driving the optimization with ask and tell leads to the same result
+        let mut other = EvoBandits::with_options(Default::default(), options);
+        assert_eq!(other.progress(), None);
+        other.start(bounds, 1000, Some(42));
+        let mut generation = 0;
+        while let Some(trials) = other.ask() {
+            let rewards: Vec<Option<f64>> = trials
+                .iter()
+                .map(|trial| {
+                    Some(noisy_opti_function(
+                        &trial.action_vector,
+                        trial.seed.unwrap(),
+                    ))
+                })
+                .collect();
+            other.tell(&rewards);
+
+            let progress = other.progress().unwrap();
+            assert!(progress.generation >= generation);
+            assert!(progress.simulations_used <= 1000);
+            generation = progress.generation;
+        }
+        assert_eq!(other.best_arm().unwrap().action_vector, best_action_vector);
+        assert_eq!(other.result(10), evobandits.result(10));
+        assert_eq!(other.progress().unwrap().simulations_used, 1000);
+    }
+
+    #[test]
+    fn test_tell_skipped_trials() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            vec.iter().map(|&x| x as f64).sum()
+        }
+        let options = Options {
+            final_phase_budget: 0.2,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        evobandits.start(vec![(1, 100), (1, 100)], 1000, Some(42));
+
+        // Skip every third trial, e.g. because its simulation failed
+        let mut num_trials = 0;
+        while let Some(trials) = evobandits.ask() {
+            let rewards: Vec<Option<f64>> = trials
+                .iter()
+                .map(|trial| {
+                    num_trials += 1;
+                    (num_trials % 3 != 0).then(|| mock_opti_function(&trial.action_vector))
+                })
+                .collect();
+            evobandits.tell(&rewards);
+        }
+
+        // Skipped trials do not consume budget
+        assert!(num_trials > 1000);
+        assert_eq!(evobandits.result(10).unwrap().simulations_used, 1000);
+        assert_eq!(evobandits.stats(), None);
+    }
+
+    #[test]
+    fn test_best_arm_in_progress() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.start(vec![(1, 100), (1, 100)], 1000, Some(42));
+        let trials = evobandits.ask().unwrap();
+        assert_eq!(evobandits.best_arm(), None);
+
+        // An interrupted optimization reports the best arm so far, and can be continued
+        let rewards: Vec<Option<f64>> = trials.iter().map(|_| Some(1.0)).collect();
+        evobandits.tell(&rewards);
+        assert!(evobandits.best_arm().is_some());
+        assert_eq!(
+            evobandits.result(10).unwrap().simulations_used,
+            trials.len()
+        );
+        assert!(evobandits.ask().is_some());
+    }
+
+    #[test]
+    fn test_refine() {
+        // The objective of a float parameter in [0, 1], on a grid with the given number of steps
+        fn reward(trial: &Trial, nsteps: i32) -> Option<f64> {
+            let x = trial.action_vector[0] as f64 / nsteps as f64;
+            Some((x - 0.123).powi(2) + trial.action_vector[1] as f64)
+        }
+
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.start(vec![(0, 10), (0, 5)], 1000, Some(42));
+        for _ in 0..5 {
+            let trials = evobandits.ask().unwrap();
+            let rewards: Vec<Option<f64>> = trials.iter().map(|trial| reward(trial, 10)).collect();
+            evobandits.tell(&rewards);
+        }
+        let coarse = evobandits.result(usize::MAX).unwrap();
+
+        // The arm statistics are kept at the same points of the refined grid
+        evobandits.refine(&[0], 10);
+        let refined = evobandits.result(usize::MAX).unwrap();
+        assert_eq!(refined.simulations_used, coarse.simulations_used);
+        for (coarse_arm, refined_arm) in coarse.top_arms.iter().zip(&refined.top_arms) {
+            let action_vector = &coarse_arm.action_vector;
+            assert_eq!(
+                refined_arm.action_vector,
+                vec![action_vector[0] * 10, action_vector[1]]
+            );
+            assert_eq!(refined_arm.mean_reward, coarse_arm.mean_reward);
+            assert_eq!(refined_arm.num_pulls, coarse_arm.num_pulls);
+        }
+        assert_eq!(evobandits.genetic_algorithm().upper_bound, vec![100, 5]);
+
+        // The following generations use the finer grid, within the refined bounds
+        let mut fine_grid_trials = 0;
+        while let Some(trials) = evobandits.ask() {
+            for trial in &trials {
+                assert!((0..=100).contains(&trial.action_vector[0]));
+                assert!((0..=5).contains(&trial.action_vector[1]));
+                fine_grid_trials += (trial.action_vector[0] % 10 != 0) as usize;
+            }
+            let rewards: Vec<Option<f64>> = trials.iter().map(|trial| reward(trial, 100)).collect();
+            evobandits.tell(&rewards);
+        }
+        assert!(fine_grid_trials > 0);
+        assert_eq!(evobandits.result(1).unwrap().simulations_used, 1000);
+    }
+
+    #[test]
+    #[should_panic(expected = "must be told before the grid is refined")]
+    fn test_refine_pending_trials() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.start(vec![(0, 100)], 100, Some(42));
+        evobandits.ask();
+        evobandits.refine(&[0], 2);
+    }
+
+    // Run the started optimization to completion with ask and tell.
+    fn run_to_completion(evobandits: &mut EvoBandits, opti_function: fn(&[i32]) -> f64) {
+        while let Some(trials) = evobandits.ask() {
+            let rewards: Vec<Option<f64>> = trials
+                .iter()
+                .map(|trial| Some(opti_function(&trial.action_vector)))
+                .collect();
+            evobandits.tell(&rewards);
+        }
+    }
+
+    #[test]
+    fn test_resume() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            ((vec[0] - 30).pow(2) + (vec[1] - 20).pow(2)) as f64
+        }
+
+        let options = Options {
+            final_phase_budget: 0.1,
+            collect_stats: true,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        evobandits.start(vec![(0, 100), (0, 100)], 500, Some(42));
+        run_to_completion(&mut evobandits, mock_opti_function);
+        let result = evobandits.result(usize::MAX).unwrap();
+        let num_arms = evobandits.arm_memory.len();
+        let generations = evobandits.stats().unwrap().generations;
+
+        // The optimization continues from its arms, with further generations and a final phase
+        evobandits.resume(500);
+        assert_eq!(evobandits.best_arm_index, None);
+        run_to_completion(&mut evobandits, mock_opti_function);
+        let resumed = evobandits.result(usize::MAX).unwrap();
+        assert_eq!(resumed.simulations_used, 1000);
+        assert!(evobandits.arm_memory.len() > num_arms);
+        assert!(evobandits.stats().unwrap().generations > generations);
+        assert!(resumed.best_arm.mean_reward <= result.best_arm.mean_reward);
+        for arm in &result.top_arms {
+            assert!(evobandits.lookup_table.contains_key(&arm.action_vector));
+        }
+
+        // An optimization in progress gets the extra budget on top
+        evobandits.start(vec![(0, 100), (0, 100)], 500, Some(42));
+        let trials = evobandits.ask().unwrap();
+        evobandits.tell(&vec![Some(1.0); trials.len()]);
+        evobandits.resume(500);
+        run_to_completion(&mut evobandits, mock_opti_function);
+        assert_eq!(evobandits.result(1).unwrap().simulations_used, 1000);
+
+        // An optimization in its final phase keeps the unspent budget of the final phase
+        evobandits.start(vec![(0, 100), (0, 100)], 500, Some(42));
+        while !matches!(evobandits.stage, Stage::FinalPhase(_)) {
+            let trials = evobandits.ask().unwrap();
+            let rewards: Vec<Option<f64>> = trials
+                .iter()
+                .map(|trial| Some(mock_opti_function(&trial.action_vector)))
+                .collect();
+            evobandits.tell(&rewards);
+        }
+        let trials = evobandits.ask().unwrap();
+        evobandits.tell(&vec![Some(1.0); trials.len()]);
+        assert!(
+            matches!(&evobandits.stage, Stage::FinalPhase(halving) if halving.remaining_budget > 0)
+        );
+        evobandits.resume(500);
+        run_to_completion(&mut evobandits, mock_opti_function);
+        assert_eq!(evobandits.result(1).unwrap().simulations_used, 1000);
+    }
+
+    #[test]
+    fn test_operator_schedule() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            ((vec[0] - 30).pow(2) + (vec[1] - 20).pow(2)) as f64
+        }
+        fn run(operator_schedule: OperatorSchedule) -> EvoBandits {
+            let genetic_algorithm = GeneticAlgorithm {
+                mutation_span: 0.5,
+                ..Default::default()
+            };
+            let options = Options {
+                operator_schedule,
+                ..Default::default()
+            };
+            let mut evobandits = EvoBandits::with_options(genetic_algorithm, options);
+            evobandits.optimize(mock_opti_function, vec![(0, 100), (0, 100)], 1000, Some(42));
+            evobandits
+        }
+
+        assert_eq!(run(OperatorSchedule::Fixed).schedule_state(), None);
+
+        // The offspring rarely improve on a converged population, so the span narrows
+        let evobandits = run(OperatorSchedule::SuccessRate);
+        let state = evobandits.schedule_state().unwrap().clone();
+        assert!(state.generations > 0);
+        assert!(state.mutation_span < 0.5);
+
+        // The schedule follows the seed
+        assert_eq!(
+            run(OperatorSchedule::SuccessRate).schedule_state(),
+            Some(&state)
+        );
+    }
+
+    #[test]
+    fn test_set_schedule_state() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            ((vec[0] - 30).pow(2) + (vec[1] - 20).pow(2)) as f64
+        }
+
+        let options = Options {
+            operator_schedule: OperatorSchedule::SuccessRate,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options.clone());
+        evobandits.start(vec![(0, 100), (0, 100)], 500, Some(42));
+        run_to_completion(&mut evobandits, mock_opti_function);
+        let checkpoint = evobandits.schedule_state().unwrap().clone();
+
+        // A restored schedule continues from the checkpoint instead of the configured span
+        let mut restored = EvoBandits::with_options(Default::default(), options);
+        restored.start(vec![(0, 100), (0, 100)], 500, Some(7));
+        restored.set_schedule_state(checkpoint.clone());
+        assert_eq!(restored.schedule_state(), Some(&checkpoint));
+        run_to_completion(&mut restored, mock_opti_function);
+        assert!(restored.schedule_state().unwrap().generations > checkpoint.generations);
+    }
+
+    #[test]
+    #[should_panic(expected = "there is no adaptive operator schedule")]
+    fn test_set_schedule_state_without_schedule() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.start(vec![(0, 100)], 100, Some(42));
+        evobandits.set_schedule_state(ScheduleState::new(0.1));
+    }
+
+    #[test]
+    #[should_panic(expected = "there is no optimization to resume")]
+    fn test_resume_without_start() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.resume(100);
+    }
+
+    #[test]
+    fn test_start_resets_state() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            ((vec[0] - 30).pow(2) + (vec[1] - 20).pow(2)) as f64
+        }
+
+        // A second optimization does not depend on the arms of the first one
+        let mut evobandits = EvoBandits::new(Default::default());
+        let first = evobandits.optimize(mock_opti_function, vec![(0, 100), (0, 100)], 500, Some(1));
+        let first_arms = evobandits.arm_memory.len();
+        evobandits.optimize(mock_opti_function, vec![(0, 50), (0, 50)], 500, Some(2));
+        assert!(evobandits
+            .arm_memory
+            .iter()
+            .all(|arm| arm.get_action_vector().iter().all(|&a| a <= 50)));
+
+        let again = evobandits.optimize(mock_opti_function, vec![(0, 100), (0, 100)], 500, Some(1));
+        assert_eq!(again, first);
+        assert_eq!(evobandits.arm_memory.len(), first_arms);
+    }
+
+    #[test]
+    fn test_conditions() {
+        // Dimension 0 selects one of two models, dimension 1 only applies to model 1 and
+        // dimensions 2 and 3 only to model 2
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            match vec[0] {
+                1 => (vec[1] - 30).pow(2) as f64,
+                _ => ((vec[2] - 70).pow(2) + (vec[3] - 20).pow(2)) as f64,
+            }
+        }
+
+        let conditions = vec![
+            Condition {
+                dimensions: vec![1],
+                parent: 0,
+                values: vec![1],
+            },
+            Condition {
+                dimensions: vec![2, 3],
+                parent: 0,
+                values: vec![2],
+            },
+        ];
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.set_conditions(conditions.clone());
+        let best_arm = evobandits.optimize(
+            mock_opti_function,
+            vec![(1, 2), (0, 100), (0, 100), (0, 100)],
+            2000,
+            Some(42),
+        );
+
+        // Every arm is canonical, so no two arms differ only in inactive dimensions
+        for arm in &evobandits.arm_memory {
+            let mut canonical = arm.get_action_vector().to_vec();
+            genetic::canonicalize(&conditions, &[1, 0, 0, 0], &mut canonical);
+            assert_eq!(arm.get_action_vector(), canonical);
+        }
+        assert_eq!(mock_opti_function(&best_arm), 0.0);
+    }
+
+    #[test]
+    #[should_panic(expected = "out of range")]
+    fn test_conditions_out_of_range() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.set_conditions(vec![Condition {
+            dimensions: vec![2],
+            parent: 0,
+            values: vec![1],
+        }]);
+        evobandits.start(vec![(1, 2), (0, 100)], 100, Some(42));
+    }
+
+    // Reorder point below the order-up-to level, as in the inventory example
+    struct OrderPolicyFeasibility {
+        num_calls: Arc<AtomicUsize>,
+    }
+
+    impl FeasibilityFn for OrderPolicyFeasibility {
+        fn is_feasible(&self, action_vector: &[i32]) -> bool {
+            action_vector[0] < action_vector[1]
+        }
+
+        fn are_feasible(&self, action_vectors: &[&[i32]]) -> Vec<bool> {
+            self.num_calls.fetch_add(1, Ordering::Relaxed);
+            action_vectors
+                .iter()
+                .map(|action_vector| self.is_feasible(action_vector))
+                .collect()
+        }
+    }
+
+    #[test]
+    fn test_feasibility() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            ((vec[0] - 30).pow(2) + (vec[1] - 20).pow(2)) as f64
+        }
+        let options = Options {
+            collect_stats: true,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        evobandits.set_feasibility(Some(Box::new(|vec: &[i32]| vec[0] < vec[1])));
+        evobandits.start(vec![(1, 100), (1, 100)], 1000, Some(42));
+
+        // Only feasible candidates are simulated, so the whole budget is spent on them
+        while let Some(trials) = evobandits.ask() {
+            assert!(trials
+                .iter()
+                .all(|trial| trial.action_vector[0] < trial.action_vector[1]));
+            let rewards: Vec<Option<f64>> = trials
+                .iter()
+                .map(|trial| Some(mock_opti_function(&trial.action_vector)))
+                .collect();
+            evobandits.tell(&rewards);
+        }
+        assert_eq!(evobandits.result(10).unwrap().simulations_used, 1000);
+        assert!(evobandits.stats().unwrap().infeasible_candidates > 0);
+
+        // Without a check, the optimum at (30, 20) is infeasible
+        let best_arm = evobandits.best_arm().unwrap();
+        assert!(best_arm.action_vector[0] < best_arm.action_vector[1]);
+    }
+
+    #[test]
+    fn test_feasibility_batches() {
+        let num_calls = Arc::new(AtomicUsize::new(0));
+        let feasibility = OrderPolicyFeasibility {
+            num_calls: Arc::clone(&num_calls),
+        };
+        let opti_function = |vec: &[i32]| (vec[1] - vec[0]) as f64;
+
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.set_feasibility(Some(Box::new(feasibility)));
+        evobandits.optimize(opti_function, vec![(1, 100), (1, 100)], 1000, Some(42));
+
+        // The candidates are checked in batches, not one by one
+        let batches = num_calls.load(Ordering::Relaxed);
+        assert!(batches > 0);
+        assert!(batches < 1000);
+
+        // The check applies until it is removed
+        evobandits.set_feasibility(None);
+        evobandits.optimize(opti_function, vec![(1, 100), (1, 100)], 1000, Some(42));
+        assert_eq!(num_calls.load(Ordering::Relaxed), batches);
+    }
+
+    #[test]
+    #[should_panic(expected = "no feasible action vector")]
+    fn test_feasibility_infeasible_space() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.set_feasibility(Some(Box::new(|_vec: &[i32]| false)));
+        evobandits.start(vec![(1, 100), (1, 100)], 1000, Some(42));
+        evobandits.ask();
+    }
+
+    #[test]
+    fn test_screening() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            vec.iter().map(|&x| ((x - 30) as f64).powi(2)).sum()
+        }
+        let options = Options {
+            collect_stats: true,
+            screening_fraction: 0.25,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        evobandits.optimize(mock_opti_function, vec![(1, 100); 3], 1000, Some(42));
+        assert_eq!(evobandits.result(10).unwrap().simulations_used, 1000);
+
+        // The surrogate rejected candidates for the new offspring
+        let stats = evobandits.stats().unwrap();
+        assert!(stats.screened_offspring > 0);
+        assert!(stats.surrogate_time > std::time::Duration::ZERO);
+
+        // Without screening, no candidates are rejected
+        let mut evobandits = EvoBandits::with_options(
+            Default::default(),
+            Options {
+                collect_stats: true,
+                ..Default::default()
+            },
+        );
+        evobandits.optimize(mock_opti_function, vec![(1, 100); 3], 1000, Some(42));
+        assert_eq!(evobandits.stats().unwrap().screened_offspring, 0);
+    }
+
+    #[test]
+    #[should_panic(expected = "is NaN")]
+    fn test_nan_reward() {
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.optimize(|_vec: &[i32]| f64::NAN, vec![(1, 100)], 100, Some(42));
+    }
+
+    #[test]
+    fn test_finish_early() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            vec.iter().map(|&x| x as f64).sum()
+        }
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.start(vec![(1, 100), (1, 100)], 1000, Some(42));
+        for _ in 0..3 {
+            let trials = evobandits.ask().unwrap();
+            let rewards: Vec<Option<f64>> = trials
+                .iter()
+                .map(|trial| Some(mock_opti_function(&trial.action_vector)))
+                .collect();
+            evobandits.tell(&rewards);
+        }
+
+        // Pending trials are discarded, the result covers the simulations so far
+        let pending = evobandits.ask().unwrap();
+        evobandits.finish();
+        let result = evobandits.result(10).unwrap();
+        assert!(result.simulations_used < 1000);
+        assert!(result.simulations_used + pending.len() <= 1000);
+        assert_eq!(
+            evobandits.progress().unwrap().best_arm,
+            evobandits.best_arm().unwrap()
+        );
+        assert_eq!(evobandits.ask(), None);
+    }
+
+    #[test]
+    fn test_collect_stats() {
+        fn mock_opti_function(vec: &[i32]) -> f64 {
+            vec.iter().map(|&x| x as f64).sum()
+        }
+        let bounds = vec![(1, 100), (1, 100)];
+        let simulation_budget = 1000;
+
+        // Stats are not collected by default
+        let mut evobandits = EvoBandits::new(Default::default());
+        evobandits.optimize(
+            mock_opti_function,
+            bounds.clone(),
+            simulation_budget,
+            Some(42),
+        );
+        assert_eq!(evobandits.stats(), None);
+
+        let options = Options {
+            collect_stats: true,
+            ..Default::default()
+        };
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        evobandits.optimize(mock_opti_function, bounds, simulation_budget, Some(42));
+        let stats = evobandits.stats().unwrap();
+
+        // Each simulation either pulls a new arm or an arm again
+        assert_eq!(stats.repulls + stats.new_arms, simulation_budget);
+        assert_eq!(stats.new_arms, evobandits.arm_memory.len());
+        assert!(stats.generations > 0);
+        assert!(stats.objective_time <= stats.total_time);
+        assert!(stats.genetic_operators_time <= stats.total_time);
+    }
+
+    #[test]
+    #[should_panic = "final_phase_budget"]
+    fn test_panic_on_invalid_final_phase_budget() {
+        // Reserve so much budget that the initial population can not be sampled
+        let options = Options {
+            final_phase_budget: 0.5,
+            ..Default::default()
+        };
+        let bounds = vec![(1, 100), (1, 100)];
+        let mut evobandits = EvoBandits::with_options(Default::default(), options);
+        evobandits.optimize(mock_opti_function, bounds, 30, None);
+    }
+
     #[test]
     #[should_panic = "population_size"]
     fn test_panic_on_invalid_options() {
@@ -11,7 +11,37 @@ pub const MUTATION_RATE_DEFAULT: f64 = 0.25;
 pub const CROSSOVER_RATE_DEFAULT: f64 = 1.0;
 pub const MUTATION_SPAN_DEFAULT: f64 = 0.1;
 
-#[derive(Debug, PartialEq)]
+/// The dimensions of a conditional parameter, which are only active if the parent dimension takes
+/// one of the values. Inactive dimensions are set to their lower bound, so that action vectors that
+/// differ only in inactive dimensions are the same arm.
+#[derive(Debug, PartialEq, Clone)]
+pub struct Condition {
+    pub dimensions: Vec<usize>,
+    pub parent: usize,
+    pub values: Vec<i32>,
+}
+
+/// Set the inactive dimensions of the action vector to their lower bound. A dimension is also
+/// inactive if its parent is, so the condition of a parent must come before the conditions that
+/// depend on it.
+pub(crate) fn canonicalize(
+    conditions: &[Condition],
+    lower_bound: &[i32],
+    action_vector: &mut [i32],
+) {
+    let mut inactive = vec![false; action_vector.len()];
+    for condition in conditions {
+        let parent = condition.parent;
+        if inactive[parent] || !condition.values.contains(&action_vector[parent]) {
+            for &i in &condition.dimensions {
+                action_vector[i] = lower_bound[i];
+                inactive[i] = true;
+            }
+        }
+    }
+}
+
+#[derive(Debug, PartialEq, Clone)]
 pub struct GeneticAlgorithm {
     pub mutation_rate: f64,
     pub crossover_rate: f64,
@@ -61,6 +91,27 @@ impl GeneticAlgorithm {
         }
     }
 
+    /// Check that the conditions refer to dimensions within the bounds, and that no dimension
+    /// depends on itself.
+    pub fn validate_conditions(&self, conditions: &[Condition]) {
+        for condition in conditions {
+            for &i in condition.dimensions.iter().chain([&condition.parent]) {
+                if i >= self.dimension {
+                    panic!(
+                        "dimension {} of a condition is out of range for {} dimensions",
+                        i, self.dimension
+                    );
+                }
+            }
+            if condition.dimensions.contains(&condition.parent) {
+                panic!(
+                    "dimension {} of a condition cannot depend on itself",
+                    condition.parent
+                );
+            }
+        }
+    }
+
     pub(crate) fn generate_new_population(&self, seed: u64) -> Vec<Arm> {
         let mut individuals: Vec<Arm> = Vec::new();
         let mut rng: StdRng = SeedableRng::seed_from_u64(seed);
@@ -81,7 +132,8 @@ impl GeneticAlgorithm {
 
     pub(crate) fn crossover(&self, seed: u64, population: &[Arm]) -> Vec<Arm> {
         let mut crossover_pop: Vec<Arm> = Vec::new();
-        let population_size = self.population_size;
+        // The population may be smaller than population_size if feasible arms are scarce
+        let population_size = population.len().min(self.population_size);
         let mut rng: StdRng = SeedableRng::seed_from_u64(seed);
 
         let step = 2;
@@ -123,6 +175,17 @@ impl GeneticAlgorithm {
     }
 
     pub(crate) fn mutate(&self, seed: u64, population: &[Arm]) -> Vec<Arm> {
+        self.mutate_with_span(seed, population, self.mutation_span)
+    }
+
+    /// Mutate with a mutation span other than the configured one, e.g. the span of an adaptive
+    /// schedule, see `Options::operator_schedule`.
+    pub(crate) fn mutate_with_span(
+        &self,
+        seed: u64,
+        population: &[Arm],
+        mutation_span: f64,
+    ) -> Vec<Arm> {
         let mut mutated_population = Vec::new();
         let mut seen = HashSet::new();
         let mut rng = StdRng::seed_from_u64(seed);
@@ -135,7 +198,7 @@ impl GeneticAlgorithm {
                 if rng.random::<f64>() < self.mutation_rate {
                     let adjustment = Normal::new(
                         0.0,
-                        self.mutation_span * (self.upper_bound[i] - self.lower_bound[i]) as f64,
+                        mutation_span * (self.upper_bound[i] - self.lower_bound[i]) as f64,
                     )
                     .unwrap()
                     .sample(&mut rng);
@@ -182,6 +245,46 @@ mod tests {
     const MUTATION_SPAN: f64 = 0.0;
     const SEED: u64 = 42;
 
+    #[test]
+    fn test_canonicalize() {
+        // Dimension 1 is active if dimension 0 is 1, dimension 2 if dimension 1 is active and 3
+        let conditions = vec![
+            Condition {
+                dimensions: vec![1],
+                parent: 0,
+                values: vec![1],
+            },
+            Condition {
+                dimensions: vec![2, 3],
+                parent: 1,
+                values: vec![3],
+            },
+        ];
+        let lower_bound = [0, 3, 0, 5];
+        let cases = [
+            ([1, 3, 7, 8], [1, 3, 7, 8]),
+            ([1, 4, 7, 8], [1, 4, 0, 5]),
+            // The canonical value of an inactive parent does not activate its children
+            ([0, 4, 7, 8], [0, 3, 0, 5]),
+            ([0, 3, 7, 8], [0, 3, 0, 5]),
+        ];
+        for (mut action_vector, expected) in cases {
+            canonicalize(&conditions, &lower_bound, &mut action_vector);
+            assert_eq!(action_vector, expected);
+        }
+    }
+
+    #[test]
+    #[should_panic(expected = "out of range")]
+    fn test_validate_conditions() {
+        let ga = GeneticAlgorithm::default();
+        ga.validate_conditions(&[Condition {
+            dimensions: vec![1],
+            parent: 0,
+            values: vec![1],
+        }]);
+    }
+
     #[test]
     fn test_ga_default_config() {
         let ga = GeneticAlgorithm::default();
@@ -1,4 +1,11 @@
 pub mod arm;
+#[cfg(feature = "bench")]
+pub mod bench;
 pub mod evobandits;
 pub mod genetic;
+pub mod options;
+pub mod replication;
+pub mod schedule;
 mod sorted_multi_map;
+pub mod stats;
+mod surrogate;
@@ -0,0 +1,147 @@
+pub const FINAL_PHASE_BUDGET_DEFAULT: f64 = 0.0;
+pub const SCREENING_FRACTION_DEFAULT: f64 = 1.0;
+pub const SCREENING_NEIGHBORS_DEFAULT: usize = 5;
+
+/// Determines which seed, if any, EvoBandits passes to the objective for each pull.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub enum PullSeeding {
+    /// The objective is evaluated without a seed and draws its own entropy.
+    #[default]
+    Disabled,
+    /// Each pull receives its own seed.
+    Independent,
+    /// All pulls of the same generation share one seed (common random numbers).
+    Common,
+}
+
+/// Determines the confidence bound on the mean reward of an arm, which EvoBandits uses to select
+/// the best arm from the non-dominated set.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub enum ConfidenceBound {
+    /// UCB1 with a penalty of sqrt(2 ln n / n_i), regardless of the observed variance.
+    #[default]
+    Ucb,
+    /// UCB-V (Audibert et al.), which scales the penalty with the empirical variance of the arm.
+    UcbV,
+    /// The empirical Bernstein bound (Maurer & Pontil) on the mean reward of the arm.
+    EmpiricalBernstein,
+}
+
+/// Determines whether the genetic operators adapt to the progress of an optimization.
+#[derive(Debug, Default, Clone, Copy, PartialEq, Eq)]
+pub enum OperatorSchedule {
+    /// The configured mutation span is used for the whole optimization.
+    #[default]
+    Fixed,
+    /// The mutation span follows the success rate of the offspring, i.e. the share of new
+    /// offspring that enter the population: it widens while more than a fifth succeed and
+    /// narrows otherwise, between a tenth of the configured span and the configured span. See
+    /// `EvoBandits::schedule_state`.
+    SuccessRate,
+}
+
+/// Options for the bandit part of EvoBandits, in addition to the GeneticAlgorithm configuration.
+#[derive(Debug, Clone, PartialEq)]
+pub struct Options {
+    pub pull_seeding: PullSeeding,
+    pub confidence_bound: ConfidenceBound,
+    /// Share of the simulation budget that is reserved to identify the best arm of the
+    /// non-dominated set with successive halving. 0.0 disables the final phase.
+    pub final_phase_budget: f64,
+    /// Collect timings and counters of each optimization, see `EvoBandits::stats`.
+    pub collect_stats: bool,
+    /// Share of the candidates for the new offspring of a generation that is simulated. Below
+    /// 1.0, the offspring are topped up with further mutations of the population, a surrogate
+    /// predicts their mean rewards from the nearest simulated arms, and only the most promising
+    /// ones are simulated. 1.0 disables the screening.
+    pub screening_fraction: f64,
+    /// Number of nearest simulated arms that the surrogate of the screening averages.
+    pub screening_neighbors: usize,
+    pub operator_schedule: OperatorSchedule,
+}
+
+impl Options {
+    pub fn validate(&self) {
+        if !(0.0..1.0).contains(&self.final_phase_budget) {
+            panic!("final_phase_budget must be at least 0.0 and less than 1.0");
+        }
+        if !(self.screening_fraction > 0.0 && self.screening_fraction <= 1.0) {
+            panic!("screening_fraction must be greater than 0.0 and at most 1.0");
+        }
+        if self.screening_neighbors == 0 {
+            panic!("screening_neighbors cannot be 0");
+        }
+    }
+}
+
+impl Default for Options {
+    fn default() -> Self {
+        Options {
+            pull_seeding: PullSeeding::Disabled,
+            confidence_bound: ConfidenceBound::Ucb,
+            final_phase_budget: FINAL_PHASE_BUDGET_DEFAULT,
+            collect_stats: false,
+            screening_fraction: SCREENING_FRACTION_DEFAULT,
+            screening_neighbors: SCREENING_NEIGHBORS_DEFAULT,
+            operator_schedule: OperatorSchedule::Fixed,
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_options_default() {
+        let options = Options::default();
+        assert_eq!(options.pull_seeding, PullSeeding::Disabled);
+        assert_eq!(options.confidence_bound, ConfidenceBound::Ucb);
+        assert_eq!(options.final_phase_budget, FINAL_PHASE_BUDGET_DEFAULT);
+        assert!(!options.collect_stats);
+        assert_eq!(options.screening_fraction, SCREENING_FRACTION_DEFAULT);
+        assert_eq!(options.screening_neighbors, SCREENING_NEIGHBORS_DEFAULT);
+        assert_eq!(options.operator_schedule, OperatorSchedule::Fixed);
+        options.validate();
+    }
+
+    #[test]
+    #[should_panic(expected = "final_phase_budget")]
+    fn test_invalid_large_final_phase_budget() {
+        let options = Options {
+            final_phase_budget: 1.0,
+            ..Default::default()
+        };
+        options.validate();
+    }
+
+    #[test]
+    #[should_panic(expected = "final_phase_budget")]
+    fn test_invalid_small_final_phase_budget() {
+        let options = Options {
+            final_phase_budget: -0.1,
+            ..Default::default()
+        };
+        options.validate();
+    }
+
+    #[test]
+    #[should_panic(expected = "screening_fraction")]
+    fn test_invalid_screening_fraction() {
+        let options = Options {
+            screening_fraction: 0.0,
+            ..Default::default()
+        };
+        options.validate();
+    }
+
+    #[test]
+    #[should_panic(expected = "screening_neighbors")]
+    fn test_invalid_screening_neighbors() {
+        let options = Options {
+            screening_neighbors: 0,
+            ..Default::default()
+        };
+        options.validate();
+    }
+}
@@ -0,0 +1,161 @@
+use std::sync::atomic::{AtomicUsize, Ordering};
+use std::sync::Mutex;
+use std::thread;
+use std::time::{Duration, Instant};
+
+use rand::rngs::StdRng;
+use rand::{RngCore, SeedableRng};
+
+use crate::arm::OptimizationFn;
+use crate::evobandits::EvoBandits;
+use crate::genetic::GeneticAlgorithm;
+use crate::options::Options;
+
+/// Outcome of one independent optimization run.
+#[derive(Debug, Clone, PartialEq)]
+pub struct Replication {
+    pub seed: u64,
+    pub action_vector: Vec<i32>,
+    pub elapsed: Duration,
+}
+
+// Shares one objective between the threads, forwarding both seeded and unseeded evaluations.
+struct SharedFn<'a, F>(&'a F);
+
+impl<F: OptimizationFn> OptimizationFn for SharedFn<'_, F> {
+    fn evaluate(&self, action_vector: &[i32]) -> f64 {
+        self.0.evaluate(action_vector)
+    }
+
+    fn evaluate_seeded(&self, action_vector: &[i32], seed: u64) -> f64 {
+        self.0.evaluate_seeded(action_vector, seed)
+    }
+}
+
+/// Derive `n_runs` deterministic seeds from a single seed, or from system entropy if it is None.
+pub fn derive_seeds(seed: Option<u64>, n_runs: usize) -> Vec<u64> {
+    let seed = seed.unwrap_or_else(|| rand::rng().next_u64());
+    let mut rng: StdRng = SeedableRng::seed_from_u64(seed);
+    (0..n_runs).map(|_| rng.next_u64()).collect()
+}
+
+/// Run one independent optimization of the same problem for each seed on up to `n_threads` threads.
+///
+/// Each run uses a fresh EvoBandits instance with copies of `genetic_algorithm` and `options`.
+/// Use `derive_seeds` to obtain the seeds for a number of runs from a single seed. The results
+/// are returned in the order of the seeds, so the outcome does not depend on the number of
+/// threads. If `n_threads` is 0, the available parallelism of the system is used.
+pub fn replicate<F: OptimizationFn + Sync>(
+    genetic_algorithm: &GeneticAlgorithm,
+    options: &Options,
+    opti_function: &F,
+    bounds: &[(i32, i32)],
+    simulation_budget: usize,
+    seeds: &[u64],
+    n_threads: usize,
+) -> Vec<Replication> {
+    let n_runs = seeds.len();
+    let n_threads = if n_threads == 0 {
+        thread::available_parallelism().map_or(1, |n| n.get())
+    } else {
+        n_threads
+    };
+
+    let next_run = AtomicUsize::new(0);
+    let results: Mutex<Vec<Option<Replication>>> = Mutex::new(vec![None; n_runs]);
+
+    thread::scope(|scope| {
+        for _ in 0..n_threads.min(n_runs) {
+            scope.spawn(|| loop {
+                let run = next_run.fetch_add(1, Ordering::Relaxed);
+                if run >= n_runs {
+                    break;
+                }
+
+                let start_time = Instant::now();
+                let mut evobandits =
+                    EvoBandits::with_options(genetic_algorithm.clone(), options.clone());
+                let action_vector = evobandits.optimize(
+                    SharedFn(opti_function),
+                    bounds.to_vec(),
+                    simulation_budget,
+                    Some(seeds[run]),
+                );
+
+                results.lock().unwrap()[run] = Some(Replication {
+                    seed: seeds[run],
+                    action_vector,
+                    elapsed: start_time.elapsed(),
+                });
+            });
+        }
+    });
+
+    results
+        .into_inner()
+        .unwrap()
+        .into_iter()
+        .map(|replication| replication.expect("every run is executed exactly once"))
+        .collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn mock_opti_function(vec: &[i32]) -> f64 {
+        vec.iter().map(|&x| x as f64).sum()
+    }
+
+    #[test]
+    fn test_derive_seeds() {
+        assert_eq!(derive_seeds(Some(42), 10), derive_seeds(Some(42), 10));
+        assert_ne!(derive_seeds(Some(42), 10), derive_seeds(Some(43), 10));
+
+        // The first seeds do not depend on the number of runs
+        assert_eq!(derive_seeds(Some(42), 5), derive_seeds(Some(42), 10)[..5]);
+    }
+
+    #[test]
+    fn test_replicate() {
+        let bounds = vec![(1, 100), (1, 100)];
+        let replications = replicate(
+            &Default::default(),
+            &Default::default(),
+            &mock_opti_function,
+            &bounds,
+            100,
+            &derive_seeds(Some(42), 8),
+            4,
+        );
+
+        assert_eq!(replications.len(), 8);
+        for (replication, seed) in replications.iter().zip(derive_seeds(Some(42), 8)) {
+            assert_eq!(replication.seed, seed);
+            assert_eq!(replication.action_vector.len(), 2);
+        }
+    }
+
+    #[test]
+    fn test_replicate_independent_of_threads() {
+        // Helper function that returns the best action vectors of a seeded replication
+        fn generate_results(n_threads: usize) -> Vec<Vec<i32>> {
+            let bounds = vec![(1, 100), (1, 100)];
+            replicate(
+                &Default::default(),
+                &Default::default(),
+                &mock_opti_function,
+                &bounds,
+                100,
+                &derive_seeds(Some(42), 6),
+                n_threads,
+            )
+            .into_iter()
+            .map(|replication| replication.action_vector)
+            .collect()
+        }
+
+        assert_eq!(generate_results(1), generate_results(3));
+        assert_eq!(generate_results(1), generate_results(0));
+    }
+}
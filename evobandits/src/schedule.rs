@@ -0,0 +1,86 @@
+// Share of the new offspring that enter the population at which the mutation span is kept, as in
+// the one-fifth success rule of evolution strategies.
+const TARGET_SUCCESS_RATE: f64 = 0.2;
+// Weight of the latest generation in the smoothed success rate, which damps the noise of the
+// rewards and of small generations.
+const SMOOTHING: f64 = 0.3;
+// Change of the logarithm of the mutation span per generation, at a success rate of 1.0.
+const ADAPTATION_RATE: f64 = 2.0;
+// Share of the configured mutation span below which the span does not shrink.
+const MIN_SPAN_SHARE: f64 = 0.1;
+
+/// The state of the adaptive operator schedule of an optimization, see
+/// `OperatorSchedule::SuccessRate`.
+///
+/// The schedule draws no random numbers, so a seeded optimization follows the same schedule each
+/// time. The state can be read after any batch and restored with
+/// `EvoBandits::set_schedule_state`, e.g. to continue from a checkpoint.
+#[derive(Debug, Clone, PartialEq)]
+pub struct ScheduleState {
+    /// The mutation span of the next generation
+    pub mutation_span: f64,
+    /// The smoothed share of the new offspring that entered the population
+    pub success_rate: f64,
+    /// Generations whose new offspring were evaluated
+    pub generations: usize,
+}
+
+impl ScheduleState {
+    pub(crate) fn new(mutation_span: f64) -> ScheduleState {
+        ScheduleState {
+            mutation_span,
+            success_rate: TARGET_SUCCESS_RATE,
+            generations: 0,
+        }
+    }
+
+    /// Update the success rate with the outcome of a generation, and widen the mutation span
+    /// above the target rate or narrow it below, within a tenth of max_span and max_span.
+    pub(crate) fn update(&mut self, num_offspring: usize, num_successes: usize, max_span: f64) {
+        if num_offspring == 0 {
+            return;
+        }
+        let observed = num_successes as f64 / num_offspring as f64;
+        self.success_rate = (1.0 - SMOOTHING) * self.success_rate + SMOOTHING * observed;
+        let deviation = (self.success_rate - TARGET_SUCCESS_RATE) / (1.0 - TARGET_SUCCESS_RATE);
+        self.mutation_span = (self.mutation_span * (ADAPTATION_RATE * deviation).exp())
+            .clamp(MIN_SPAN_SHARE * max_span, max_span);
+        self.generations += 1;
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_update() {
+        // The span narrows while the offspring fail, down to its minimum
+        let mut state = ScheduleState::new(0.5);
+        state.update(10, 0, 0.5);
+        assert!(state.mutation_span < 0.5);
+        assert!(state.success_rate < TARGET_SUCCESS_RATE);
+        for _ in 0..100 {
+            state.update(10, 0, 0.5);
+        }
+        assert_eq!(state.mutation_span, MIN_SPAN_SHARE * 0.5);
+        assert_eq!(state.generations, 101);
+
+        // and widens again while they succeed, up to the configured span
+        let narrow_span = state.mutation_span;
+        state.update(10, 10, 0.5);
+        state.update(10, 10, 0.5);
+        assert!(state.mutation_span > narrow_span);
+        for _ in 0..100 {
+            state.update(10, 10, 0.5);
+        }
+        assert_eq!(state.mutation_span, 0.5);
+    }
+
+    #[test]
+    fn test_update_without_offspring() {
+        let mut state = ScheduleState::new(0.5);
+        state.update(0, 0, 0.5);
+        assert_eq!(state, ScheduleState::new(0.5));
+    }
+}
@@ -0,0 +1,89 @@
+use std::time::{Duration, Instant};
+
+/// Timings and counters of one optimization, collected if `Options::collect_stats` is set.
+///
+/// The timings are wall-clock times of the phases of the optimization, so the overhead of the
+/// optimizer is the total time minus the objective time.
+#[derive(Debug, Default, Clone, PartialEq)]
+pub struct Stats {
+    pub total_time: Duration,
+    /// Time spent in the objective function, or between `EvoBandits::ask` and `EvoBandits::tell`
+    pub objective_time: Duration,
+    /// Time spent in the selection of the population, crossover and mutation
+    pub genetic_operators_time: Duration,
+    /// Time spent updating the sample average tree, the arm memory and the lookup table
+    pub tree_maintenance_time: Duration,
+    /// Time spent selecting the best arm by its UCB value
+    pub ucb_selection_time: Duration,
+    /// Time spent screening the offspring with the surrogate, see `Options::screening_fraction`
+    pub surrogate_time: Duration,
+    /// Offspring that were found in the lookup table
+    pub lookup_hits: usize,
+    /// Offspring that were skipped because they are part of the current population
+    pub skipped_offspring: usize,
+    /// Children of the crossover that mutated into a duplicate and were discarded
+    pub duplicate_children: usize,
+    /// Candidates that were rejected by the feasibility check before they were simulated
+    pub infeasible_candidates: usize,
+    /// Candidates that were rejected by the surrogate before they were simulated
+    pub screened_offspring: usize,
+    /// Simulations of arms that were simulated before
+    pub repulls: usize,
+    /// Simulations of new arms
+    pub new_arms: usize,
+    pub generations: usize,
+}
+
+/// Start a measurement, if stats are collected.
+pub(crate) fn start_timer(stats: &Option<Stats>) -> Option<Instant> {
+    stats.as_ref().map(|_| Instant::now())
+}
+
+/// Add the time since the start of the measurement to a phase.
+pub(crate) fn record_time(
+    stats: &mut Option<Stats>,
+    timer: Option<Instant>,
+    phase: fn(&mut Stats) -> &mut Duration,
+) {
+    if let (Some(stats), Some(start)) = (stats.as_mut(), timer) {
+        *phase(stats) += start.elapsed();
+    }
+}
+
+/// Increase a counter, if stats are collected.
+pub(crate) fn count(stats: &mut Option<Stats>, counter: fn(&mut Stats) -> &mut usize, n: usize) {
+    if let Some(stats) = stats.as_mut() {
+        *counter(stats) += n;
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_disabled_stats() {
+        let mut stats: Option<Stats> = None;
+        let timer = start_timer(&stats);
+        assert_eq!(timer, None);
+
+        record_time(&mut stats, timer, |stats| &mut stats.objective_time);
+        count(&mut stats, |stats| &mut stats.generations, 1);
+        assert_eq!(stats, None);
+    }
+
+    #[test]
+    fn test_enabled_stats() {
+        let mut stats = Some(Stats::default());
+        let timer = start_timer(&stats);
+        assert!(timer.is_some());
+        std::thread::sleep(Duration::from_millis(1));
+
+        record_time(&mut stats, timer, |stats| &mut stats.objective_time);
+        count(&mut stats, |stats| &mut stats.generations, 2);
+        let stats = stats.unwrap();
+        assert!(stats.objective_time > Duration::ZERO);
+        assert_eq!(stats.generations, 2);
+        assert_eq!(stats.total_time, Duration::ZERO);
+    }
+}
@@ -0,0 +1,96 @@
+use crate::arm::Arm;
+
+/// A k-nearest-neighbour surrogate of the objective over the simulated arms.
+///
+/// The prediction for an action vector is the average mean reward of the k nearest arms. The
+/// distances are measured on the action vectors scaled to the bounds, so that all dimensions
+/// weigh equally.
+pub(crate) struct NearestNeighbors<'a> {
+    arms: &'a [Arm],
+    inverse_ranges: Vec<f64>,
+    k: usize,
+}
+
+impl<'a> NearestNeighbors<'a> {
+    pub(crate) fn new(
+        arms: &'a [Arm],
+        lower_bound: &[i32],
+        upper_bound: &[i32],
+        k: usize,
+    ) -> NearestNeighbors<'a> {
+        let inverse_ranges = lower_bound
+            .iter()
+            .zip(upper_bound)
+            .map(|(&low, &high)| 1.0 / (high - low).max(1) as f64)
+            .collect();
+        NearestNeighbors {
+            arms,
+            inverse_ranges,
+            k,
+        }
+    }
+
+    fn squared_distance(&self, a: &[i32], b: &[i32]) -> f64 {
+        a.iter()
+            .zip(b)
+            .zip(&self.inverse_ranges)
+            .map(|((&a_i, &b_i), inverse_range)| ((a_i - b_i) as f64 * inverse_range).powi(2))
+            .sum()
+    }
+
+    pub(crate) fn predict(&self, action_vector: &[i32]) -> f64 {
+        let mut neighbors: Vec<(f64, f64)> = self
+            .arms
+            .iter()
+            .map(|arm| {
+                let distance = self.squared_distance(arm.get_action_vector(), action_vector);
+                (distance, arm.get_mean_reward())
+            })
+            .collect();
+
+        let k = self.k.min(neighbors.len());
+        if k < neighbors.len() {
+            neighbors.select_nth_unstable_by(k - 1, |a, b| a.0.total_cmp(&b.0));
+        }
+        neighbors[..k]
+            .iter()
+            .map(|&(_, mean_reward)| mean_reward)
+            .sum::<f64>()
+            / k as f64
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn simulated_arm(action_vector: &[i32], reward: f64) -> Arm {
+        let mut arm = Arm::new(action_vector);
+        arm.update(reward);
+        arm
+    }
+
+    #[test]
+    fn test_predict() {
+        let arms = vec![
+            simulated_arm(&[0, 0], 1.0),
+            simulated_arm(&[1, 0], 3.0),
+            simulated_arm(&[10, 10], 100.0),
+        ];
+        let surrogate = NearestNeighbors::new(&arms, &[0, 0], &[10, 10], 2);
+        assert_eq!(surrogate.predict(&[0, 1]), 2.0);
+        assert_eq!(surrogate.predict(&[9, 9]), (100.0 + 3.0) / 2.0);
+
+        // With fewer arms than neighbours, all arms are used
+        let surrogate = NearestNeighbors::new(&arms, &[0, 0], &[10, 10], 5);
+        assert_eq!(surrogate.predict(&[0, 0]), 104.0 / 3.0);
+    }
+
+    #[test]
+    fn test_scaled_distance() {
+        // The first dimension spans a much larger range, so a difference of 10 is smaller there
+        let arms = vec![simulated_arm(&[10, 0], 1.0), simulated_arm(&[0, 10], 2.0)];
+        let surrogate = NearestNeighbors::new(&arms, &[0, 0], &[1000, 10], 1);
+        assert_eq!(surrogate.predict(&[0, 0]), 1.0);
+    }
+}
@@ -0,0 +1,103 @@
+"""
+Benchmarks for the overhead of the optimizer per trial.
+
+The objectives are (almost) free, so the measured time is spent in EvoBandits, at the boundary
+between Rust and Python, and in the Study. See benchmarks/README.md for how to run and compare
+the benchmarks.
+"""
+
+import random
+
+import pytest
+from evobandits import CategoricalParam, EvoBandits, FloatParam, IntParam, Study
+
+pytest.importorskip("pytest_benchmark")
+
+SEED = 42
+BUDGETS = [10**3, 10**4, 10**5, 10**6]
+DIMENSIONS = [10, 100, 1000]
+
+MIXED_PARAMS = {
+    "n_items": IntParam(0, 100, size=3),
+    "weights": FloatParam(0.0, 1.0, size=3),
+    "learning_rate": FloatParam(1e-4, 1.0, log=True),
+    "strategy": CategoricalParam(["greedy", "random", "round_robin", None]),
+}
+
+# A constant reward would put all arms on one key of the sample average tree, which is not
+# representative. Random rewards are just as cheap, and keep the arms apart.
+_rng = random.Random(SEED)
+
+
+def noop_function(action_vector: list) -> float:
+    return _rng.random()
+
+
+def noop_objective(**params) -> float:
+    return _rng.random()
+
+
+def run_trials(benchmark, function, trials: int):
+    """
+    Benchmark a function that runs the given number of trials, and record the time per trial.
+
+    Large budgets are measured in fewer rounds to keep the duration of the suite manageable.
+    """
+    rounds = min(5, max(1, 10**6 // trials))
+    result = benchmark.pedantic(function, rounds=rounds, iterations=1)
+    benchmark.extra_info["trials"] = trials
+    benchmark.extra_info["seconds_per_trial"] = benchmark.stats.stats.mean / trials
+    return result
+
+
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_evobandits_optimize(benchmark, budget):
+    bounds = [(0, 100)] * 10
+
+    def optimize():
+        return EvoBandits().optimize(noop_function, bounds, budget, SEED)
+
+    run_trials(benchmark, optimize, budget)
+
+
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_study_optimize(benchmark, budget):
+    def optimize():
+        study = Study(seed=SEED, algorithm=EvoBandits())
+        return study.optimize(noop_objective, MIXED_PARAMS, budget)
+
+    run_trials(benchmark, optimize, budget)
+
+
+@pytest.mark.parametrize("dimension", DIMENSIONS)
+def test_study_decode(benchmark, dimension):
+    study = Study(seed=SEED, algorithm=EvoBandits())
+    study.params = {
+        "int_vector": IntParam(0, 100, size=dimension),
+        "float_vector": FloatParam(0.0, 1.0, size=dimension),
+        "log_vector": FloatParam(1e-4, 1.0, size=dimension, log=True),
+    }
+    rng = random.Random(SEED)
+    action_vector = [rng.randint(low, high) for low, high in study._collect_bounds()]
+
+    benchmark(study._decode, action_vector)
+    benchmark.extra_info["dimension"] = dimension
+
+
+@pytest.mark.parametrize("budget", [50, 10**2])
+def test_search_cv(benchmark, budget):
+    pytest.importorskip("sklearn")
+    from evobandits import EvoBanditsSearchCV
+    from sklearn.datasets import make_classification
+    from sklearn.dummy import DummyClassifier
+
+    # The dummy estimator is fitted in no time, which leaves the overhead of the search
+    x, y = make_classification(n_samples=100, random_state=SEED)
+    search = EvoBanditsSearchCV(
+        DummyClassifier(),
+        param_distributions={"random_state": (0, 10**6)},
+        cv=2,
+        evobandits_iterations=budget,
+    )
+
+    run_trials(benchmark, lambda: search.fit(x, y), budget)
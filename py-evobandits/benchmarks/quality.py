@@ -0,0 +1,260 @@
+"""
+Solution quality versus simulation budget on reference problems.
+
+Each problem is optimized with the same seeds at each budget checkpoint, and the true (noise-free)
+objective value of the returned solution is recorded. Since a seeded run with a smaller budget
+follows the same trajectory as one with a larger budget until it stops, the checkpoints form an
+anytime-performance curve. All problems are minimized.
+
+Run from the py-evobandits directory, e.g.:
+
+    python -m benchmarks.quality --problems rosenbrock inventory --output quality.json
+    python -m benchmarks.quality --baseline quality.json
+
+With a baseline, the script exits with status 1 if the median quality at any budget that both
+runs share is worse than in the baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import random
+import re
+import statistics
+import sys
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+from evobandits import EvoBandits, IntParam, Study
+
+from tests._functions import rosenbrock as rb
+
+SEED = 42
+N_RUNS_DEFAULT = 30
+TOLERANCE_DEFAULT = 0.05
+
+INVENTORY_EXAMPLE = Path(__file__).parents[2] / "evobandits" / "examples" / "inventory.rs"
+
+
+@dataclass
+class Problem:
+    """
+    A reference problem.
+
+    Attributes:
+        params (dict): The parameters of the problem.
+        objective (Callable): The noisy objective, which takes a seed for each evaluation.
+        true_objective (Callable): The noise-free objective value of a solution.
+        budgets (list[int]): The budget checkpoints.
+    """
+
+    params: dict
+    objective: Callable
+    true_objective: Callable
+    budgets: list[int]
+
+
+def noisy_rosenbrock(number: list, seed: int) -> float:
+    return rb.function(number) + random.Random(seed).gauss(0.0, 100.0)
+
+
+def true_rosenbrock(number: list) -> float:
+    return rb.function(number)
+
+
+@cache
+def _inventory_table() -> list[float]:
+    """The true objective values of the inventory problem, as listed in the Rust example."""
+    source = INVENTORY_EXAMPLE.read_text()
+    match = re.search(r"let results = vec!\[(.*?)\];", source, re.DOTALL)
+    if match is None:
+        raise RuntimeError(f"No table of true objective values found in {INVENTORY_EXAMPLE}.")
+    return [float(value) for value in match.group(1).split(",") if value.strip()]
+
+
+def inventory(s: int, delta: int, seed: int) -> float:
+    """
+    Average cost per period of an (s, S) inventory policy with S = s + delta over 30 periods.
+
+    A port of the simulation in evobandits/examples/inventory.rs.
+    """
+    demands = np.random.default_rng(seed % 2**64).poisson(25.0, size=30)
+    big_s = s + delta
+    inventory_level = big_s
+    costs = 0.0
+    for demand in demands:
+        if inventory_level <= s:
+            costs += 32.0 + 3.0 * (big_s - inventory_level)
+            inventory_level = big_s
+        inventory_level -= int(demand)
+        costs += inventory_level if inventory_level >= 0 else -5.0 * inventory_level
+    return costs / 30.0
+
+
+def true_inventory(s: int, delta: int) -> float:
+    return _inventory_table()[(s - 1) * 100 + (delta - 1)]
+
+
+def clustering(seed: int, **params) -> float:
+    from tests._functions import clustering as cl
+
+    return cl.function(**params, random_state=seed % 2**32)
+
+
+@cache
+def _true_clustering(params: tuple) -> float:
+    from tests._functions import clustering as cl
+
+    # The inertia depends on the initialization, so its expectation is approximated
+    return statistics.fmean(cl.function(**dict(params), random_state=r) for r in range(10))
+
+
+def true_clustering(**params) -> float:
+    return _true_clustering(tuple(sorted(params.items(), key=lambda item: item[0])))
+
+
+def _clustering_params() -> dict:
+    from tests._functions import clustering as cl
+
+    return cl.PARAMS
+
+
+PROBLEMS: dict[str, Callable[[], Problem]] = {
+    "rosenbrock": lambda: Problem(
+        params={"number": IntParam(-5, 10, size=3)},
+        objective=noisy_rosenbrock,
+        true_objective=true_rosenbrock,
+        budgets=[500, 1_000, 2_000, 5_000, 10_000],
+    ),
+    "inventory": lambda: Problem(
+        params={"s": IntParam(1, 100), "delta": IntParam(1, 100)},
+        objective=inventory,
+        true_objective=true_inventory,
+        budgets=[1_000, 2_000, 5_000, 10_000],
+    ),
+    "clustering": lambda: Problem(
+        params=_clustering_params(),
+        objective=clustering,
+        true_objective=true_clustering,
+        budgets=[25, 50, 100],
+    ),
+}
+
+
+def run(
+    problem: Problem,
+    n_runs: int,
+    n_jobs: int,
+    screening_fraction: float = 1.0,
+    operator_schedule: str | None = None,
+) -> dict[int, list[float]]:
+    """
+    Optimize the problem in n_runs seeded runs at each budget checkpoint.
+
+    Returns:
+        dict: The true objective value of the best solution of each run, by budget.
+    """
+    algorithm = EvoBandits(
+        pull_seeding="independent",
+        screening_fraction=screening_fraction,
+        operator_schedule=operator_schedule,
+    )
+    values = {}
+    for budget in problem.budgets:
+        study = Study(seed=SEED, algorithm=algorithm)
+        result = study.replicate(problem.objective, problem.params, budget, n_runs, n_jobs)
+        values[budget] = [problem.true_objective(**trial) for trial in result.best_trials]
+    return values
+
+
+def curve(values: dict[int, list[float]]) -> dict[int, dict]:
+    """The anytime-performance curve: quartiles and mean of the true objective by budget."""
+    points = {}
+    for budget, budget_values in values.items():
+        q1, median, q3 = statistics.quantiles(budget_values, n=4, method="inclusive")
+        points[budget] = {
+            "median": median,
+            "q1": q1,
+            "q3": q3,
+            "mean": statistics.fmean(budget_values),
+        }
+    return points
+
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare the median quality at each budget with the baseline.
+
+    A median is a regression if it exceeds the baseline median by more than the tolerance,
+    relative to the magnitude of the baseline median. The budgets are keys of JSON objects in
+    the baseline, and therefore strings.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline_curve = baseline.get(name, {}).get("curve", {})
+        for budget, point in result["curve"].items():
+            baseline_point = baseline_curve.get(str(budget))
+            if baseline_point is None:
+                continue
+            limit = baseline_point["median"] + tolerance * abs(baseline_point["median"])
+            if point["median"] > limit:
+                regressions.append(
+                    f"{name} at budget {budget}: median {point['median']:.4f} > "
+                    f"{limit:.4f} (baseline {baseline_point['median']:.4f})"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--problems", nargs="+", choices=list(PROBLEMS), default=["rosenbrock"])
+    parser.add_argument("--n-runs", type=int, default=N_RUNS_DEFAULT)
+    parser.add_argument("--n-jobs", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", type=Path, help="Compare with results from this file.")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE_DEFAULT)
+    parser.add_argument(
+        "--screening-fraction",
+        type=float,
+        default=1.0,
+        help="Screen the offspring with the surrogate, see EvoBandits(screening_fraction=...).",
+    )
+    parser.add_argument(
+        "--operator-schedule",
+        choices=["success_rate"],
+        help="Adapt the mutation span, see EvoBandits(operator_schedule=...).",
+    )
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.problems:
+        problem = PROBLEMS[name]()
+        values = run(
+            problem, args.n_runs, args.n_jobs, args.screening_fraction, args.operator_schedule
+        )
+        results[name] = {"n_runs": args.n_runs, "values": values, "curve": curve(values)}
+
+        print(f"{name}: true objective of the returned solution over {args.n_runs} runs")
+        print(f"{'budget':>8} {'q1':>12} {'median':>12} {'q3':>12} {'mean':>12}")
+        for budget, point in results[name]["curve"].items():
+            print(
+                f"{budget:>8} {point['q1']:>12.4f} {point['median']:>12.4f} "
+                f"{point['q3']:>12.4f} {point['mean']:>12.4f}"
+            )
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = find_regressions(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
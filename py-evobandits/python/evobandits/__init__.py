@@ -1,22 +1,76 @@
-import importlib.util
+"""
+EvoBandits: a genetic multi-armed bandit algorithm for noisy optimization problems.
 
-from evobandits import logging
-from evobandits.evobandits import EvoBandits
-from evobandits.params import CategoricalParam, FloatParam, IntParam
-from evobandits.study import ALGORITHM_DEFAULT, Study
+The public names are loaded on first access (PEP 562), so that importing the package is cheap,
+e.g. in short-lived worker processes. In particular, EvoBanditsSearchCV imports scikit-learn and
+NumPy only when it is used.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from evobandits import logging
+    from evobandits.evobandits import EvoBandits
+    from evobandits.params import CategoricalParam, ConditionalParam, FloatParam, IntParam
+    from evobandits.search import EvoBanditsSearchCV  # noqa: F401
+    from evobandits.study import (
+        ALGORITHM_DEFAULT,
+        FaultPolicy,
+        ReplicationResult,
+        Study,
+        StudyProgress,
+        StudyResult,
+        StudyScheduler,
+    )
+
+# The module of each public name
+_LAZY_ATTRIBUTES = {
+    "ALGORITHM_DEFAULT": "evobandits.study",
+    "EvoBandits": "evobandits.evobandits",
+    "Study": "evobandits.study",
+    "FaultPolicy": "evobandits.study",
+    "ReplicationResult": "evobandits.study",
+    "StudyProgress": "evobandits.study",
+    "StudyResult": "evobandits.study",
+    "StudyScheduler": "evobandits.study",
+    "CategoricalParam": "evobandits.params",
+    "ConditionalParam": "evobandits.params",
+    "FloatParam": "evobandits.params",
+    "IntParam": "evobandits.params",
+    # Requires scikit-learn, and is therefore not part of __all__
+    "EvoBanditsSearchCV": "evobandits.search",
+}
 
 __all__ = [
     "ALGORITHM_DEFAULT",
     "EvoBandits",
     "logging",
     "Study",
+    "FaultPolicy",
+    "ReplicationResult",
+    "StudyProgress",
+    "StudyResult",
+    "StudyScheduler",
     "CategoricalParam",
+    "ConditionalParam",
     "FloatParam",
     "IntParam",
 ]
 
-if importlib.util.find_spec("sklearn") is not None:
-    # Only import and expose EvoBanditsSearchCV if sklearn is available
-    from evobandits.search import EvoBanditsSearchCV  # noqa
 
-    __all__.append("EvoBanditsSearchCV")
+def __getattr__(name: str):
+    if name == "logging":
+        return importlib.import_module("evobandits.logging")
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    # Cache the name for the next access, except the default algorithm, which is new each time
+    if name != "ALGORITHM_DEFAULT":
+        globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | {"logging"})
@@ -0,0 +1,4 @@
+from evobandits.distributed.coordinator import Coordinator
+from evobandits.distributed.worker import run_worker
+
+__all__ = ["Coordinator", "run_worker"]
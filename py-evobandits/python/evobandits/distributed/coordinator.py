@@ -0,0 +1,168 @@
+import asyncio
+import itertools
+from dataclasses import dataclass
+
+from evobandits import logging
+from evobandits.distributed.protocol import Address, decode, encode
+
+_logger = logging.get_logger(__name__, configure=False)
+
+HEARTBEAT_TIMEOUT_DEFAULT = 10.0
+
+
+@dataclass
+class _Task:
+    id: int
+    message: bytes  # The encoded task message for the worker
+    future: asyncio.Future
+
+
+class Coordinator:
+    """
+    Serves the trials of an optimization to worker processes over TCP or Unix sockets.
+
+    The coordinator runs on the event loop of the optimization. Its evaluate coroutine is the
+    objective of Study.optimize_async: each call queues a trial until a worker requests it, and
+    returns the value that the worker reports. A worker that closes its connection, or that does
+    not send a heartbeat within heartbeat_timeout while it evaluates a trial, is considered dead,
+    and its trial is dispatched to another worker. Workers are started with
+    `python -m evobandits.worker`, see evobandits.distributed.worker.
+
+    Example:
+        async with Coordinator(("0.0.0.0", 5555)) as coordinator:
+            best_trial = await study.optimize_async(coordinator.evaluate, params, trials)
+    """
+
+    def __init__(
+        self, address: Address, heartbeat_timeout: float = HEARTBEAT_TIMEOUT_DEFAULT
+    ) -> None:
+        """
+        Initialize a Coordinator.
+
+        Args:
+            address: A (host, port) tuple to listen on TCP, or a path to listen on a Unix socket.
+                Port 0 selects a free port, see Coordinator.address.
+            heartbeat_timeout: Seconds without a message from a busy worker, after which its
+                trial is dispatched again. Default is 10.0.
+
+        Raises:
+            ValueError: If heartbeat_timeout is not positive.
+        """
+        if heartbeat_timeout <= 0:
+            raise ValueError(f"heartbeat_timeout must be positive, got {heartbeat_timeout}.")
+        logging.configure()
+
+        self.heartbeat_timeout = heartbeat_timeout
+        self._address = address
+        self._server: asyncio.AbstractServer | None = None
+        self._queue: asyncio.Queue[_Task] | None = None
+        self._handlers: set[asyncio.Task] = set()
+        self._ids = itertools.count()
+
+    @property
+    def address(self) -> Address:
+        """The address that the coordinator listens on, with the selected port for port 0."""
+        if self._server is None or isinstance(self._address, str):
+            return self._address
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def start(self) -> None:
+        """Start listening for workers."""
+        self._queue = asyncio.Queue()
+        if isinstance(self._address, str):
+            self._server = await asyncio.start_unix_server(self._handle, path=self._address)
+        else:
+            host, port = self._address
+            self._server = await asyncio.start_server(self._handle, host, port)
+        _logger.info("Coordinator listening on %s", self.address)
+
+    async def close(self) -> None:
+        """Stop listening and disconnect all workers, which then exit."""
+        if self._server is None:
+            return
+        self._server.close()
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+        self._server = None
+
+    async def __aenter__(self) -> "Coordinator":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def evaluate(self, **kwargs) -> float:
+        """
+        Evaluate a trial on the next available worker.
+
+        Args:
+            **kwargs: The keyword arguments of the objective, which must be JSON serializable.
+
+        Returns:
+            float: The value of the objective.
+
+        Raises:
+            RuntimeError: If the coordinator is not started, or the objective raised on the worker.
+            TypeError: If the keyword arguments are not JSON serializable.
+        """
+        if self._queue is None:
+            raise RuntimeError("The coordinator must be started before evaluating trials.")
+        # Encode the trial before it is queued, so that it cannot fail in the worker's handler
+        task_id = next(self._ids)
+        try:
+            message = encode({"type": "task", "id": task_id, "kwargs": kwargs})
+        except (TypeError, ValueError) as error:
+            raise TypeError(
+                f"The trial cannot be sent to a worker, its parameters must be JSON serializable: "
+                f"{error}"
+            ) from error
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Task(task_id, message, future))
+        return await future
+
+    async def _next_task(self) -> _Task:
+        # Skip trials that were cancelled, e.g. because another trial of the generation failed
+        while True:
+            task = await self._queue.get()
+            if not task.future.done():
+                return task
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve the trials to one worker, until it disconnects or is considered dead."""
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        task: _Task | None = None
+        try:
+            while True:
+                # Only a busy worker needs to send heartbeats
+                timeout = self.heartbeat_timeout if task is not None else None
+                line = await asyncio.wait_for(reader.readline(), timeout)
+                if not line:
+                    break
+                message = decode(line)
+
+                if message["type"] == "request":
+                    task = await self._next_task()
+                    writer.write(task.message)
+                    await writer.drain()
+                elif message["type"] in ("result", "error") and task is not None:
+                    if message["id"] == task.id and not task.future.done():
+                        if message["type"] == "result":
+                            task.future.set_result(message["value"])
+                        else:
+                            task.future.set_exception(RuntimeError(message["message"]))
+                    task = None
+        except asyncio.TimeoutError:
+            _logger.warning("Worker missed its heartbeat, dispatching its trial again.")
+        except (ConnectionError, ValueError) as error:
+            _logger.warning("Lost connection to a worker: %s", error)
+        except (KeyError, TypeError) as error:
+            _logger.warning("Disconnecting a worker that sent an invalid message: %r", error)
+        finally:
+            self._handlers.discard(handler)
+            writer.close()
+            if task is not None and not task.future.done():
+                self._queue.put_nowait(task)
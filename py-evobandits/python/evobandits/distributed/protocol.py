@@ -0,0 +1,23 @@
+"""
+The messages between a Coordinator and its workers: one JSON object per line.
+
+A worker sends {"type": "request"} when it is ready for a task, and the coordinator answers with
+{"type": "task", "id": ..., "kwargs": ...} once a trial is pending. While the worker evaluates the
+objective, it sends {"type": "heartbeat"} periodically, and finally {"type": "result", "id": ...,
+"value": ...} or {"type": "error", "id": ..., "message": ...}. The coordinator closes the
+connection when it shuts down.
+"""
+
+import json
+
+Address = str | tuple[str, int]
+
+
+def encode(message: dict) -> bytes:
+    """Encode a message as a line of JSON."""
+    return json.dumps(message).encode() + b"\n"
+
+
+def decode(line: bytes) -> dict:
+    """Decode a line of JSON to a message."""
+    return json.loads(line)
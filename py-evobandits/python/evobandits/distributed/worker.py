@@ -0,0 +1,127 @@
+"""
+A worker process that evaluates the trials of a Coordinator.
+
+Run with e.g.:
+
+    python -m evobandits.worker --tcp coordinator-host:5555 --objective my_package.module:objective
+
+The objective is imported from the given module, and called with the keyword arguments of each
+trial. The worker exits when the coordinator closes the connection.
+"""
+
+import argparse
+import importlib
+import socket
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+
+from evobandits.distributed.protocol import Address, decode, encode
+
+HEARTBEAT_INTERVAL_DEFAULT = 1.0
+
+
+def load_objective(path: str) -> Callable:
+    """Import an objective given as 'module:function'."""
+    module_name, _, name = path.partition(":")
+    if not name:
+        raise ValueError(f"The objective must be given as 'module:function', got '{path}'.")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def _connect(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        return sock
+    sock = socket.create_connection(address)
+    # The messages are small, send them without waiting for the acknowledgement of the last one
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def run_worker(
+    objective: Callable,
+    address: Address,
+    heartbeat_interval: float = HEARTBEAT_INTERVAL_DEFAULT,
+) -> int:
+    """
+    Evaluate trials of the coordinator at the address, until it closes the connection.
+
+    Args:
+        objective (Callable): The objective function, called with the keyword arguments of each
+            trial.
+        address: The (host, port) tuple or Unix socket path of the coordinator.
+        heartbeat_interval (float): Seconds between heartbeats while a trial is evaluated. Must be
+            well below the heartbeat_timeout of the coordinator. Default is 1.0.
+
+    Returns:
+        int: The number of evaluated trials.
+    """
+    num_trials = 0
+    lock = threading.Lock()
+
+    def send(message: dict) -> None:
+        with lock:
+            sock.sendall(encode(message))
+
+    def send_heartbeats(done: threading.Event) -> None:
+        while not done.wait(heartbeat_interval):
+            try:
+                send({"type": "heartbeat"})
+            except OSError:
+                return
+
+    with _connect(address) as sock, sock.makefile("rb") as reader:
+        while True:
+            try:
+                send({"type": "request"})
+                line = reader.readline()
+            except OSError:
+                break
+            if not line:
+                break
+            task = decode(line)
+
+            done = threading.Event()
+            heartbeat = threading.Thread(target=send_heartbeats, args=(done,), daemon=True)
+            heartbeat.start()
+            try:
+                message = {"type": "result", "value": float(objective(**task["kwargs"]))}
+            except Exception:
+                message = {"type": "error", "message": traceback.format_exc()}
+            finally:
+                done.set()
+                heartbeat.join()
+
+            try:
+                send({**message, "id": task["id"]})
+            except OSError:
+                break
+            num_trials += 1
+
+    return num_trials
+
+
+def _parse_tcp_address(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    return host, int(port)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    address = parser.add_mutually_exclusive_group(required=True)
+    address.add_argument("--tcp", type=_parse_tcp_address, help="HOST:PORT of the coordinator.")
+    address.add_argument("--unix", help="Path of the Unix socket of the coordinator.")
+    parser.add_argument("--objective", required=True, help="The objective as module:function.")
+    parser.add_argument("--heartbeat-interval", type=float, default=HEARTBEAT_INTERVAL_DEFAULT)
+    args = parser.parse_args(argv)
+
+    objective = load_objective(args.objective)
+    run_worker(objective, args.tcp or args.unix, args.heartbeat_interval)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
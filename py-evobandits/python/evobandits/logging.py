@@ -11,6 +11,9 @@ __all__ = [
 ]
 
 _default_handler: logging.Handler | None = None
+# Whether the library root logger was configured, or its default handler disabled. The library
+# configures it on first use instead of on import, and does not undo a disable.
+_configured: bool = False
 _default_fmt: str = "[%(asctime)s] %(levelname)-8s - %(name)s - %(message)s"
 
 
@@ -19,25 +22,40 @@ def _get_library_root_logger() -> logging.Logger:
 
 
 def _configure_library_root_logger() -> None:
-    global _default_handler
+    global _default_handler, _configured
 
-    if _default_handler:
+    if _configured:
         return  # This library has already configured the library root logger.
+    _configured = True
 
     _default_handler = logging.StreamHandler(sys.stderr)
     _default_handler.setFormatter(logging.Formatter(_default_fmt))
     library_root_logger: logging.Logger = _get_library_root_logger()
     library_root_logger.addHandler(_default_handler)
-    library_root_logger.setLevel(logging.INFO)
+    # Keep a level that was set before the library was first used
+    if library_root_logger.level == logging.NOTSET:
+        library_root_logger.setLevel(logging.INFO)
     # library_root_logger.propagate = False
 
 
-def get_logger(name: str) -> logging.Logger:
-    """Return a logger with the specified name."""
-    _configure_library_root_logger()
+def get_logger(name: str, configure: bool = True) -> logging.Logger:
+    """Return a logger with the specified name.
+
+    Args:
+        configure:
+            Whether to add the default handler to evobandits's root logger now. The modules of
+            the library pass False on import, and call configure when they are first used.
+    """
+    if configure:
+        _configure_library_root_logger()
     return logging.getLogger(name)
 
 
+def configure() -> None:
+    """Add the default handler to evobandits's root logger, unless it was added or disabled"""
+    _configure_library_root_logger()
+
+
 def set_level(level: int) -> None:
     """Set the level for evobandits's root logger.
 
@@ -52,7 +70,8 @@ def set_level(level: int) -> None:
 
 def disable() -> None:
     """Disable the default handler of evobandits's root logger"""
-    global _default_handler
+    global _default_handler, _configured
+    _configured = True
     if _default_handler:
         library_root_logger: logging.Logger = _get_library_root_logger()
         library_root_logger.removeHandler(_default_handler)
@@ -61,5 +80,8 @@ def disable() -> None:
 
 def enable() -> None:
     """Enable the default handler of evobandits's root logger"""
+    global _configured
+    if _default_handler is None:
+        _configured = False
     _configure_library_root_logger()
     _get_library_root_logger()
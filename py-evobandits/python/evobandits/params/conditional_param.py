@@ -0,0 +1,78 @@
+from functools import cached_property
+
+from evobandits.params.base_param import BaseParam
+from evobandits.params.categorical_param import ChoiceType
+
+
+class ConditionalParam(BaseParam):
+    """
+    A class representing a parameter that only applies to some choices of a categorical parameter.
+    """
+
+    def __init__(self, param: BaseParam, parent: str, choices: list[ChoiceType]):
+        """
+        Creates a ConditionalParam that is only active if its parent takes one of the choices.
+
+        The parent is the name of a CategoricalParam, or of a ConditionalParam of a
+        CategoricalParam, that is defined before this parameter. If the parameter is inactive,
+        its value is not passed to the objective, and the optimization treats trials that differ
+        only in inactive parameters as the same trial.
+
+        Args:
+            param (BaseParam): The parameter that suggests the values if it is active.
+            parent (str): The name of the parent parameter.
+            choices (list[ChoiceType]): The choices of the parent that activate the parameter.
+
+        Returns:
+            ConditionalParam: An instance of the parameter with the specified properties.
+
+        Raises:
+            ValueError: If param is not a parameter, or is a ConditionalParam itself, or if
+            choices is not a non-empty list.
+
+        Example:
+        >>> params = {
+        ...     "algorithm": CategoricalParam([KMeans, MiniBatchKMeans]),
+        ...     "batch_size": ConditionalParam(IntParam(64, 1024), "algorithm", [MiniBatchKMeans]),
+        ... }
+        """
+        if not isinstance(param, BaseParam) or isinstance(param, ConditionalParam):
+            raise ValueError("param must be a parameter, and cannot be a ConditionalParam.")
+        if not isinstance(choices, list) or not choices:
+            raise ValueError("choices must be a non-empty list.")
+
+        super().__init__(param.size)
+        self.param: BaseParam = param
+        self.parent: str = parent
+        self.choices: list[ChoiceType] = choices
+
+    def __repr__(self):
+        return f"ConditionalParam({self.param}, parent={self.parent!r}, choices={self.choices})"
+
+    @cached_property
+    def bounds(self) -> list[tuple]:
+        """
+        Returns the internal bounds of the parameter, see BaseParam.bounds.
+
+        Returns:
+            list[tuple]: A list of tuples representing the bounds.
+        """
+        return self.param.bounds
+
+    def decode(self, actions: list[int]) -> bool | int | str | float | list:
+        """
+        Decodes an action to the value of the parameter, if it is active.
+
+        Args:
+            actions (list[int]): A list of integers to map.
+
+        Returns:
+            bool | int | str | float | list: The resulting parameter value(s).
+        """
+        return self.param.decode(actions)
+
+    def is_active(self, parent_value: ChoiceType) -> bool:
+        """
+        Returns whether the parameter is active if its parent takes the given value.
+        """
+        return parent_value in self.choices
@@ -3,6 +3,8 @@ from functools import cached_property
 
 from evobandits.params.base_param import BaseParam
 
+REFINE_FACTOR_DEFAULT = 10
+
 
 class FloatParam(BaseParam):
     """
@@ -10,7 +12,14 @@ class FloatParam(BaseParam):
     """
 
     def __init__(
-        self, low: float, high: float, size: int = 1, nsteps: float = 100, log: bool = False
+        self,
+        low: float,
+        high: float,
+        size: int = 1,
+        nsteps: float = 100,
+        log: bool = False,
+        refinements: int = 0,
+        refine_factor: int = REFINE_FACTOR_DEFAULT,
     ):
         """
         Creates a FloatParam that will suggest float values during the optimization.
@@ -19,19 +28,29 @@ class FloatParam(BaseParam):
         size. The values sampled by the optimizaton will be limited to the specified granularity,
         lower and upper bounds.
 
+        With refinements, the grid is adaptive: The optimization starts on the coarse grid of
+        nsteps, and the study refines it by refine_factor at evenly spaced points of the budget,
+        up to nsteps * refine_factor**refinements steps. The statistics of the evaluated trials
+        are kept on the finer grid, and the following generations explore the new values around
+        the best trials so far.
+
         Args:
             low (float): The lower bound of the suggested values.
             high (float): The upper bound of the suggested values.
             size (int): The size if the parameter shall be a list of floats. Default is 1.
             nsteps (int): The number of steps between low and high. Default is 100.
             log (bool): A flag to indicate log-transformation. Default is False.
+            refinements (int): The number of refinements of the grid. Default is 0.
+            refine_factor (int): The factor by which nsteps grows with each refinement. Default
+                is 10.
 
         Returns:
             FloatParam: An instance of the parameter with the specified properties.
 
         Raises:
             ValueError: If low is not an float, if high is not an float that is greater than
-            low, or if size is not a positive integer, or if step is not a positive float.
+            low, or if size is not a positive integer, or if step is not a positive float, or if
+            refinements is negative, or if refine_factor is smaller than 2.
 
         Example:
         >>> param = FloatParam(low=1.0, high=10.0, size=3, nsteps=100)
@@ -44,17 +63,47 @@ class FloatParam(BaseParam):
             raise ValueError("steps must be positive integer.")
         if log and low <= 0.0:
             raise ValueError("low must be greater than 0 for a log-transformation.")
+        if refinements < 0:
+            raise ValueError("refinements must be a non-negative integer.")
+        if refine_factor < 2:
+            raise ValueError("refine_factor must be an integer of at least 2.")
 
         super().__init__(size)
         self.log: bool = bool(log)
         self.low: float = float(low)
         self.high: float = float(high)
         self.nsteps: int = int(nsteps)
+        self.refinements: int = int(refinements)
+        self.refine_factor: int = int(refine_factor)
 
     def __repr__(self):
         repr = f"FloatParam(low={self.low}, high={self.high}, size={self.size}, "
-        repr += f"nsteps={self.nsteps}, log={self.log})"
-        return repr
+        repr += f"nsteps={self.nsteps}, log={self.log}"
+        if self.refinements:
+            repr += f", refinements={self.refinements}, refine_factor={self.refine_factor}"
+        return repr + ")"
+
+    def refined(self) -> "FloatParam":
+        """
+        Returns the parameter on the next finer grid, with one refinement less.
+
+        The action a on the current grid corresponds to the action a * refine_factor on the
+        refined grid.
+
+        Raises:
+            ValueError: If the grid of the parameter has no refinements left.
+        """
+        if self.refinements == 0:
+            raise ValueError("The grid of the parameter has no refinements left.")
+        return FloatParam(
+            self.low,
+            self.high,
+            self.size,
+            self.nsteps * self.refine_factor,
+            self.log,
+            self.refinements - 1,
+            self.refine_factor,
+        )
 
     @cached_property
     def _low_trans(self):
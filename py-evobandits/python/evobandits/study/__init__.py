@@ -1,3 +1,26 @@
-from evobandits.study.study import ALGORITHM_DEFAULT, Study
+from evobandits.study.faults import FaultPolicy
+from evobandits.study.replication import ReplicationResult
+from evobandits.study.result import StudyProgress, StudyResult
+from evobandits.study.scheduler import SchedulerMetrics, StudyMetrics, StudyScheduler
+from evobandits.study.study import Study
 
-__all__ = ["Study", "ALGORITHM_DEFAULT"]
+__all__ = [
+    "Study",
+    "ALGORITHM_DEFAULT",
+    "FaultPolicy",
+    "ReplicationResult",
+    "StudyProgress",
+    "StudyResult",
+    "StudyScheduler",
+    "SchedulerMetrics",
+    "StudyMetrics",
+]
+
+
+def __getattr__(name: str):
+    # A new instance on each access, see evobandits.study.study.ALGORITHM_DEFAULT
+    if name == "ALGORITHM_DEFAULT":
+        from evobandits.study import study
+
+        return study.ALGORITHM_DEFAULT
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
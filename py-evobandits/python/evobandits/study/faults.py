@@ -0,0 +1,82 @@
+import math
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Literal
+
+ON_FAILURE_OPTIONS = ("raise", "penalty", "skip")
+
+
+@dataclass(frozen=True)
+class FaultPolicy:
+    """
+    The handling of trials whose evaluation of the objective fails or times out.
+
+    A failing trial is evaluated again up to retries times. If it still fails, the policy either
+    raises the error, records the penalty as the result of the trial, or skips the trial without
+    consuming budget.
+
+    Attributes:
+        retries (int): The number of additional attempts of a failing trial. Default is 0.
+        on_failure (str): "raise", "penalty" or "skip". Default is "raise".
+        penalty (float | None): The result of a failed trial, in the direction of the objective.
+            Required if on_failure is "penalty", e.g. a large finite value for a minimization.
+        timeout (float | None): The time limit of one attempt in seconds. Default is None.
+        max_consecutive_skips (int): The number of trials in a row that may be skipped before the
+            optimization is aborted, since skipped trials do not consume budget. Default is 100.
+    """
+
+    retries: int = 0
+    on_failure: Literal["raise", "penalty", "skip"] = "raise"
+    penalty: float | None = None
+    timeout: float | None = None
+    max_consecutive_skips: int = 100
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.retries, int) or self.retries < 0:
+            raise ValueError(f"retries must be a non-negative integer, got {self.retries}.")
+        if self.on_failure not in ON_FAILURE_OPTIONS:
+            raise ValueError(
+                f"on_failure must be 'raise', 'penalty' or 'skip', got '{self.on_failure}'."
+            )
+        if (self.penalty is None) == (self.on_failure == "penalty"):
+            raise ValueError("penalty must be set if and only if on_failure is 'penalty'.")
+        if self.penalty is not None and not math.isfinite(self.penalty):
+            raise ValueError(f"penalty must be finite, got {self.penalty}.")
+        if self.timeout is not None and self.timeout <= 0:
+            raise ValueError(f"timeout must be positive, got {self.timeout}.")
+        if self.max_consecutive_skips < 1:
+            raise ValueError(
+                f"max_consecutive_skips must be positive, got {self.max_consecutive_skips}."
+            )
+
+
+FAULT_POLICY_DEFAULT = FaultPolicy()
+
+
+def call_with_timeout(func: Callable, timeout: float | None, **kwargs):
+    """
+    Call func with the keyword arguments, and raise a TimeoutError after timeout seconds.
+
+    Python cannot interrupt a running function, so on a timeout the call continues in a daemon
+    thread and its result is discarded.
+    """
+    if timeout is None:
+        return func(**kwargs)
+
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = func(**kwargs)
+        except BaseException as error:
+            outcome["error"] = error
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"The evaluation did not finish within {timeout} seconds.")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
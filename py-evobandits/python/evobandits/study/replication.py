@@ -0,0 +1,62 @@
+import statistics
+from collections import Counter
+from dataclasses import dataclass
+
+
+def _summarize(values: list) -> dict | list:
+    """
+    Summarize the values of one parameter across replications.
+
+    Numeric values are described by their mean, standard deviation, minimum and maximum. Lists are
+    summarized element-wise, and all other values by the frequency of each distinct value.
+    """
+    if all(isinstance(v, list) for v in values):
+        return [_summarize(list(elements)) for elements in zip(*values, strict=True)]
+    if all(isinstance(v, int | float) and not isinstance(v, bool) for v in values):
+        return {
+            "mean": statistics.fmean(values),
+            "std": statistics.stdev(values) if len(values) > 1 else 0.0,
+            "min": min(values),
+            "max": max(values),
+        }
+    return {"counts": dict(Counter(values))}
+
+
+@dataclass
+class ReplicationResult:
+    """
+    The aggregated result of independent, seeded replications of an optimization.
+
+    Attributes:
+        seeds (list[int]): The seed that was used for each run.
+        best_trials (list[dict]): The best parameter values found in each run.
+        timings (list[float]): The wall-clock time of each run in seconds.
+    """
+
+    seeds: list[int]
+    best_trials: list[dict]
+    timings: list[float]
+
+    @property
+    def n_runs(self) -> int:
+        """The number of runs."""
+        return len(self.seeds)
+
+    @property
+    def summary(self) -> dict:
+        """
+        Summary statistics of the best parameter values and the timings across all runs.
+
+        A conditional parameter that is inactive in the best trial of a run is summarized over
+        the other runs.
+
+        Returns:
+            dict: A dictionary with the statistics for each parameter under "params", and the
+            statistics of the timings under "timings".
+        """
+        keys = dict.fromkeys(key for trial in self.best_trials for key in trial)
+        params = {
+            key: _summarize([trial[key] for trial in self.best_trials if key in trial])
+            for key in keys
+        }
+        return {"params": params, "timings": _summarize(self.timings)}
@@ -0,0 +1,109 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from evobandits.evobandits import OptimizationResult
+
+
+@dataclass
+class StudyResult:
+    """
+    The result of an optimization, with the top trials decoded to parameter values.
+
+    The trials are ordered by their mean objective value, starting with the best one. The best
+    trial is the one that the optimization returned, which does not need to be the first trial.
+
+    Attributes:
+        best_trial (dict): The parameter values of the best trial.
+        best_value (float): The mean objective value of the best trial.
+        trials (list[dict]): The parameter values of the top trials.
+        values (np.ndarray): The mean objective value of each top trial.
+        num_pulls (np.ndarray): How often each top trial was evaluated.
+        ucb_values (np.ndarray): The UCB value of each top trial, on the scale that the
+            algorithm minimizes. Lower values are better.
+        simulations_used (int): The number of evaluations of the objective.
+    """
+
+    best_trial: dict
+    best_value: float
+    trials: list[dict]
+    values: "np.ndarray"
+    num_pulls: "np.ndarray"
+    ucb_values: "np.ndarray"
+    simulations_used: int
+
+    @classmethod
+    def from_optimization_result(
+        cls, result: "OptimizationResult", decode: Callable[[list], dict], direction: int
+    ) -> "StudyResult":
+        """
+        Decode the result of the algorithm.
+
+        Args:
+            result (OptimizationResult): The result of the algorithm.
+            decode (Callable): Maps an action vector to the parameter values.
+            direction (int): 1 if the objective was minimized, -1 if it was maximized.
+
+        Returns:
+            StudyResult: The decoded result, with mean values on the scale of the objective.
+        """
+        return cls(
+            best_trial=decode(result.best_arm["action_vector"]),
+            best_value=direction * result.best_arm["mean_reward"],
+            trials=[decode(action_vector.tolist()) for action_vector in result.action_vectors],
+            values=direction * result.mean_rewards,
+            num_pulls=result.num_pulls,
+            ucb_values=result.ucb_values,
+            simulations_used=result.simulations_used,
+        )
+
+
+@dataclass
+class StudyProgress:
+    """
+    A snapshot of an optimization in progress, as yielded by Study.iter_optimize.
+
+    Attributes:
+        generation (int): The number of generations of the genetic algorithm so far.
+        simulations_used (int): The number of evaluations of the objective so far.
+        best_trial (dict): The parameter values of the trial that the optimization would return
+            if it stopped now.
+        best_value (float): The mean objective value of the best trial.
+        best_num_pulls (int): How often the best trial was evaluated.
+        population_mean (float): The average mean objective value of the current population.
+    """
+
+    generation: int
+    simulations_used: int
+    best_trial: dict
+    best_value: float
+    best_num_pulls: int
+    population_mean: float
+
+    @classmethod
+    def from_progress(
+        cls, progress: dict, decode: Callable[[list], dict], direction: int
+    ) -> "StudyProgress":
+        """
+        Decode the progress of the algorithm.
+
+        Args:
+            progress (dict): The progress of the algorithm, see EvoBandits.progress.
+            decode (Callable): Maps an action vector to the parameter values.
+            direction (int): 1 if the objective is minimized, -1 if it is maximized.
+
+        Returns:
+            StudyProgress: The decoded progress, with mean values on the scale of the objective.
+        """
+        best_arm = progress["best_arm"]
+        return cls(
+            generation=progress["generation"],
+            simulations_used=progress["simulations_used"],
+            best_trial=decode(best_arm["action_vector"]),
+            best_value=direction * best_arm["mean_reward"],
+            best_num_pulls=best_arm["num_pulls"],
+            population_mean=direction * progress["population_mean"],
+        )
@@ -0,0 +1,486 @@
+import math
+import os
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass, field
+
+from evobandits import logging
+from evobandits.evobandits import TOP_K_DEFAULT
+from evobandits.study.faults import FAULT_POLICY_DEFAULT, FaultPolicy, call_with_timeout
+from evobandits.study.study import ParamsType, Study
+
+_logger = logging.get_logger(__name__, configure=False)
+
+EXECUTOR_OPTIONS = ("thread", "process")
+PATIENCE_DEFAULT = 10
+
+
+@dataclass
+class StudyMetrics:
+    """
+    The metrics of one study of a StudyScheduler.
+
+    Attributes:
+        priority (float): The priority of the study.
+        budget (int): The trials of the study, including the trials it received from converged
+            studies.
+        trials (int): The number of completed trials, including failed and skipped trials.
+        generations (int): The number of completed generations, without the initial population
+            and the rounds of the final phase.
+        mean_trial_latency (float): The mean time in seconds from the submission of a trial to
+            the pool until its result.
+        mean_generation_latency (float): The mean time in seconds from the start of a generation
+            until the results of all its trials.
+        converged (bool): Whether the study was stopped because it stopped improving.
+        finished (bool): Whether the optimization of the study is complete.
+    """
+
+    priority: float
+    budget: int
+    trials: int
+    generations: int
+    mean_trial_latency: float
+    mean_generation_latency: float
+    converged: bool
+    finished: bool
+
+
+@dataclass
+class SchedulerMetrics:
+    """
+    The metrics of a StudyScheduler.
+
+    Attributes:
+        elapsed (float): The wall-clock time of the last run in seconds.
+        trials (int): The number of completed trials of all studies.
+        throughput (float): The completed trials per second of the last run.
+        studies (dict[str, StudyMetrics]): The metrics of each study, by name.
+    """
+
+    elapsed: float
+    trials: int
+    throughput: float
+    studies: dict[str, StudyMetrics]
+
+
+@dataclass
+class _Entry:
+    """A study that is registered with a StudyScheduler, and the state of its generation."""
+
+    name: str
+    study: Study
+    objective: Callable
+    params: ParamsType
+    trials: int
+    priority: float
+    maximize: bool
+    top_k: int
+    fault_policy: FaultPolicy
+    feasible: Callable | None
+    vectorized_feasible: bool
+
+    # The state of the run
+    budget: int = 0
+    extra_budget: int = 0  # Received from converged studies, added before the next generation
+    batch: list = field(default_factory=list)
+    rewards: list = field(default_factory=list)
+    attempts: list[int] = field(default_factory=list)
+    queue: deque[int] = field(default_factory=deque)  # The trials that wait for a worker
+    outstanding: int = 0  # The trials of the generation without a result
+    last_generation: int = 0  # The generation of the algorithm at the last convergence check
+    best_population_mean: float = math.inf
+    stale_generations: int = 0
+    converged: bool = False
+    finished: bool = False
+
+    # The metrics of the run
+    submitted: int = 0
+    completed: int = 0
+    generations: int = 0
+    trial_latency: float = 0.0
+    generation_latency: float = 0.0
+    generation_start: float = 0.0
+
+    def metrics(self) -> StudyMetrics:
+        return StudyMetrics(
+            priority=self.priority,
+            budget=self.budget,
+            trials=self.completed,
+            generations=self.generations,
+            mean_trial_latency=self.trial_latency / self.completed if self.completed else 0.0,
+            mean_generation_latency=(
+                self.generation_latency / self.generations if self.generations else 0.0
+            ),
+            converged=self.converged,
+            finished=self.finished,
+        )
+
+
+class StudyScheduler:
+    """
+    Runs the optimizations of many studies on one shared pool of workers.
+
+    The generations of the registered studies are interleaved: while a study waits for the last
+    trials of its generation, the free workers evaluate the trials of the other studies. Each
+    study receives a share of the workers in proportion to its priority. A study whose population
+    does not improve for patience generations is considered converged and stopped, and its
+    remaining trials are added to the budgets of the studies that are still improving, in
+    proportion to their priorities. A study in its final phase is not stopped.
+
+    Example:
+        scheduler = StudyScheduler(n_workers=8)
+        scheduler.add("retail", Study(seed=1), retail_objective, retail_params, 2000, priority=2.0)
+        scheduler.add("wholesale", Study(seed=2), wholesale_objective, wholesale_params, 1000)
+        best_trials = scheduler.run()
+        print(scheduler.metrics.throughput)
+    """
+
+    def __init__(
+        self,
+        n_workers: int = 1,
+        executor: str = "thread",
+        patience: int | None = PATIENCE_DEFAULT,
+        tolerance: float = 0.0,
+    ) -> None:
+        """
+        Initialize a StudyScheduler.
+
+        Args:
+            n_workers: The number of workers of the pool. -1 uses all CPUs. Default is 1.
+            executor: "thread" for a pool of threads, or "process" for a pool of worker processes,
+                which requires the objectives to be picklable. Default is "thread".
+            patience: The number of generations without improvement after which a study is
+                stopped, or None to run every study to its budget. Default is 10.
+            tolerance: The relative improvement of the mean objective value of the population
+                that counts as an improvement. Default is 0.0.
+
+        Raises:
+            ValueError: If n_workers is 0 or smaller than -1, executor is not "thread" or
+                "process", patience is not positive, or tolerance is negative.
+        """
+        if n_workers == -1:
+            n_workers = os.cpu_count() or 1
+        if n_workers < 1:
+            raise ValueError(f"n_workers must be a positive integer or -1, got {n_workers}.")
+        if executor not in EXECUTOR_OPTIONS:
+            raise ValueError(f"executor must be 'thread' or 'process', got '{executor}'.")
+        if patience is not None and patience < 1:
+            raise ValueError(f"patience must be a positive integer or None, got {patience}.")
+        if tolerance < 0:
+            raise ValueError(f"tolerance must not be negative, got {tolerance}.")
+        logging.configure()
+
+        self.n_workers = n_workers
+        self.executor = executor
+        self.patience = patience
+        self.tolerance = tolerance
+        self._entries: dict[str, _Entry] = {}
+        self._elapsed = 0.0
+
+    def add(
+        self,
+        name: str,
+        study: Study,
+        objective: Callable,
+        params: ParamsType,
+        trials: int,
+        priority: float = 1.0,
+        maximize: bool = False,
+        top_k: int = TOP_K_DEFAULT,
+        fault_policy: FaultPolicy = FAULT_POLICY_DEFAULT,
+        feasible: Callable | None = None,
+        vectorized_feasible: bool = False,
+    ) -> None:
+        """
+        Register the optimization of a study for the next run. The arguments are those of
+        Study.optimize, in addition to the name and the priority.
+
+        Args:
+            name (str): The name of the study in the results and the metrics.
+            study (Study): The study to optimize. Afterwards, its result is available as
+                Study.result, as after Study.optimize.
+            objective (Callable): The objective function to optimize.
+            params (dict): A dictionary of parameters with their bounds.
+            trials (int): The number of trials to run.
+            priority (float): The share of the workers relative to the other studies. Default
+                is 1.0.
+            maximize (bool): Indicates if objective is maximized. Default is False.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+            fault_policy (FaultPolicy): The handling of failing trials. Default is to raise.
+            feasible (Callable | None): A cheap check of the parameter constraints, see
+                Study.optimize. Default is None.
+            vectorized_feasible (bool): If True, feasible is called once per batch with a list of
+                trials. Default is False.
+
+        Raises:
+            ValueError: If the name is registered already, or trials or priority is not
+                positive.
+        """
+        if name in self._entries:
+            raise ValueError(f"A study named '{name}' is registered already.")
+        if trials < 1:
+            raise ValueError(f"trials must be a positive integer, got {trials}.")
+        if not priority > 0:
+            raise ValueError(f"priority must be positive, got {priority}.")
+        self._entries[name] = _Entry(
+            name,
+            study,
+            objective,
+            params,
+            trials,
+            priority,
+            maximize,
+            top_k,
+            fault_policy,
+            feasible,
+            vectorized_feasible,
+        )
+
+    @property
+    def metrics(self) -> SchedulerMetrics:
+        """The throughput of the last run, and the metrics of each study."""
+        studies = {name: entry.metrics() for name, entry in self._entries.items()}
+        trials = sum(metrics.trials for metrics in studies.values())
+        return SchedulerMetrics(
+            elapsed=self._elapsed,
+            trials=trials,
+            throughput=trials / self._elapsed if self._elapsed > 0 else 0.0,
+            studies=studies,
+        )
+
+    def run(self) -> dict[str, dict]:
+        """
+        Optimize all registered studies on one pool of workers, until each study used its budget
+        or converged.
+
+        After an error, the studies are left as after an error of Study.optimize: their results
+        cover the completed trials, and each one can be continued with Study.resume.
+
+        Returns:
+            dict: The best parameter values of each study, by name.
+
+        Raises:
+            RuntimeError: If no study is registered.
+        """
+        if not self._entries:
+            raise RuntimeError("There are no studies to run, register them with add first.")
+        if self.executor == "thread":
+            from concurrent.futures import ThreadPoolExecutor as Executor
+        else:
+            from concurrent.futures import ProcessPoolExecutor as Executor
+
+        start_time = time.perf_counter()
+        in_flight: dict[Future, tuple[_Entry, int, float]] = {}
+        try:
+            for entry in self._entries.values():
+                self._start(entry)
+            with Executor(max_workers=self.n_workers) as executor:
+                try:
+                    while True:
+                        while len(in_flight) < self.n_workers:
+                            entry = self._next_entry()
+                            if entry is None:
+                                break
+                            index = entry.queue.popleft()
+                            future = executor.submit(
+                                _call_objective,
+                                entry.objective,
+                                self._solution(entry, index),
+                                entry.fault_policy.timeout,
+                            )
+                            in_flight[future] = (entry, index, time.perf_counter())
+                            entry.submitted += 1
+                        if not in_flight:
+                            break
+                        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            self._complete(*in_flight.pop(future), future)
+                finally:
+                    for future in in_flight:
+                        future.cancel()
+        finally:
+            self._elapsed = time.perf_counter() - start_time
+            for entry in self._entries.values():
+                self._abort(entry)
+
+        return {
+            name: entry.study._decode(entry.study._result.best_arm["action_vector"])
+            for name, entry in self._entries.items()
+        }
+
+    def _start(self, entry: _Entry) -> None:
+        """Start the optimization of the study, and request its first generation."""
+        study = entry.study
+        study._setup(entry.objective, entry.params, entry.maximize, entry.fault_policy)
+        study._start(entry.trials, entry.feasible, entry.vectorized_feasible)
+
+        entry.budget = entry.trials
+        entry.extra_budget = 0
+        entry.best_population_mean = math.inf
+        entry.stale_generations = entry.last_generation = 0
+        entry.converged = entry.finished = False
+        entry.submitted = entry.completed = entry.generations = 0
+        entry.trial_latency = entry.generation_latency = 0.0
+        self._next_generation(entry)
+
+    def _next_generation(self, entry: _Entry) -> None:
+        """Request the next generation of the study, or store its result if it is complete."""
+        study = entry.study
+        if entry.extra_budget:
+            study.algorithm.resume(entry.extra_budget)
+            entry.extra_budget = 0
+        batch = study.algorithm.ask()
+        if batch is None:
+            self._finish(entry)
+            return
+        entry.batch = batch
+        entry.rewards = [None] * len(batch)
+        entry.attempts = [0] * len(batch)
+        entry.queue = deque(range(len(batch)))
+        entry.outstanding = len(batch)
+        entry.generation_start = time.perf_counter()
+
+    def _next_entry(self) -> _Entry | None:
+        """
+        The study whose trial is submitted next: the one with the fewest submitted trials relative
+        to its priority, among the studies with trials that wait for a worker.
+        """
+        waiting = [entry for entry in self._entries.values() if entry.queue]
+        return min(waiting, key=lambda entry: (entry.submitted + 1) / entry.priority, default=None)
+
+    def _solution(self, entry: _Entry, index: int) -> dict:
+        """The parameter values of a trial of the current generation, with its seed if any."""
+        action_vector, seed = entry.batch[index]
+        solution = entry.study._decode(action_vector)
+        if seed is not None:
+            solution["seed"] = seed
+        return solution
+
+    def _complete(self, entry: _Entry, index: int, submitted: float, future: Future) -> None:
+        """
+        Record the result of a trial with the fault policy of the study, and complete the
+        generation once all its trials have a result. A failed trial is submitted again while it
+        has retries left.
+        """
+        study = entry.study
+        action_vector = entry.batch[index][0]
+        try:
+            evaluation = study._direction * future.result()
+            if math.isnan(evaluation):
+                raise ValueError(f"The objective returned NaN for {self._solution(entry, index)}.")
+        except Exception as error:
+            entry.attempts[index] += 1
+            if entry.attempts[index] <= entry.fault_policy.retries:
+                _logger.warning(
+                    "Trial %s failed: %r. Retrying.", study._decode(action_vector), error
+                )
+                entry.queue.appendleft(index)
+                return
+            evaluation = study._handle_failure(action_vector, error)
+
+        entry.rewards[index] = evaluation
+        entry.outstanding -= 1
+        entry.completed += 1
+        entry.trial_latency += time.perf_counter() - submitted
+        if entry.outstanding == 0:
+            self._end_generation(entry)
+
+    def _end_generation(self, entry: _Entry) -> None:
+        """
+        Tell the results of the batch, stop the study if it converged, and request the next
+        batch.
+
+        Only the batches that complete a generation of the algorithm are counted and checked for
+        convergence. The initial population, the replacements of skipped trials and the rounds of
+        the final phase leave the generation of the algorithm as it is.
+        """
+        study = entry.study
+        rewards, entry.batch, entry.rewards = entry.rewards, [], []
+        study.algorithm.tell(rewards)
+        study._check_skips(rewards)
+        study._refine_grids()
+        progress = study.algorithm.progress()
+        if progress is None or progress["generation"] == entry.last_generation:
+            self._next_generation(entry)
+            return
+        entry.last_generation = progress["generation"]
+        entry.generations += 1
+        entry.generation_latency += time.perf_counter() - entry.generation_start
+
+        if self._has_converged(entry, progress["population_mean"]):
+            entry.converged = True
+            study.algorithm.finish()
+            remaining = entry.budget - progress["simulations_used"]
+            _logger.info(
+                "Study '%s' stopped after %d generations without improvement, reallocating %d "
+                "trials.",
+                entry.name,
+                entry.stale_generations,
+                remaining,
+            )
+            self._reallocate(remaining)
+            self._finish(entry)
+            return
+        self._next_generation(entry)
+
+    def _has_converged(self, entry: _Entry, population_mean: float) -> bool:
+        """
+        Update the convergence state of the study with the mean objective value of its population,
+        which is more stable than the value of the best trial alone.
+        """
+        if self.patience is None:
+            return False
+        best = entry.best_population_mean
+        if best == math.inf or population_mean < best - self.tolerance * abs(best):
+            entry.best_population_mean = population_mean
+            entry.stale_generations = 0
+        else:
+            entry.stale_generations += 1
+        return entry.stale_generations >= self.patience
+
+    def _reallocate(self, trials: int) -> None:
+        """
+        Add the trials to the budgets of the studies that are still running, in proportion to
+        their priorities. The budgets grow before the next generation of each study.
+        """
+        running = [entry for entry in self._entries.values() if not entry.finished]
+        running = [entry for entry in running if not entry.converged]
+        if trials < 1 or not running:
+            return
+        total_priority = sum(entry.priority for entry in running)
+        shares = [int(trials * entry.priority / total_priority) for entry in running]
+        # The trials that are lost to rounding go to the study with the highest priority
+        shares[max(range(len(running)), key=lambda i: running[i].priority)] += trials - sum(shares)
+        for entry, share in zip(running, shares, strict=True):
+            entry.budget += share
+            entry.extra_budget += share
+
+    def _finish(self, entry: _Entry) -> None:
+        """Store the result of the completed optimization of the study."""
+        entry.finished = True
+        entry.queue.clear()
+        entry.study._store_result(entry.top_k)
+
+    def _abort(self, entry: _Entry) -> None:
+        """
+        Tell the completed trials of an interrupted generation and skip the others, so that the
+        study can be resumed, and store its result so far.
+        """
+        if entry.finished:
+            return
+        if entry.batch:
+            entry.study.algorithm.tell(entry.rewards)
+            entry.batch, entry.rewards = [], []
+        entry.queue.clear()
+        entry.study._store_result(entry.top_k)
+
+
+def _call_objective(objective: Callable, solution: dict, timeout: float | None):
+    """
+    Evaluate the objective with the timeout of the fault policy.
+
+    Defined on module level, so that it can be pickled and executed in a worker process.
+    """
+    return call_with_timeout(objective, timeout, **solution)
@@ -1,19 +1,34 @@
-from collections.abc import Callable, Mapping
+import asyncio
+import copy
+import math
+import os
+import random
+import time
+from collections.abc import Callable, Iterator, Mapping
 from typing import TypeAlias
 
 from evobandits import logging
 from evobandits.evobandits import (
+    TOP_K_DEFAULT,
     EvoBandits,
 )
-from evobandits.params import BaseParam
+from evobandits.params import BaseParam, CategoricalParam, ConditionalParam, FloatParam
+from evobandits.study.faults import FAULT_POLICY_DEFAULT, FaultPolicy, call_with_timeout
+from evobandits.study.replication import ReplicationResult
+from evobandits.study.result import StudyProgress, StudyResult
 
-_logger = logging.get_logger(__name__)
+_logger = logging.get_logger(__name__, configure=False)
 
 
 ParamsType: TypeAlias = Mapping[str, BaseParam]
 
 
-ALGORITHM_DEFAULT = EvoBandits()
+def __getattr__(name: str):
+    # ALGORITHM_DEFAULT is the configuration of the default algorithm. It is created on access,
+    # so that importing the module does not create an instance, and every access is unmodified.
+    if name == "ALGORITHM_DEFAULT":
+        return EvoBandits()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class Study:
@@ -24,26 +39,168 @@ class Study:
     and to manage user-defined attributes related to the study.
     """
 
-    def __init__(self, seed: int | None = None, algorithm=ALGORITHM_DEFAULT) -> None:
+    def __init__(self, seed: int | None = None, algorithm=None) -> None:
         """
         Initialize a Study instance.
 
         Args:
             seed: The seed for the Study. Defaults to None (use system entropy).
-            algorithm: The optimization algorithm to use. Defaults to EvoBandits.
+            algorithm: The optimization algorithm to use. Defaults to a new EvoBandits instance,
+                so that each study has its own state. An algorithm that is passed explicitly
+                should not be shared with other studies that are extended later.
         """
+        logging.configure()
         if seed is None:
             _logger.warning("No seed provided. Results will not be reproducible.")
         elif not isinstance(seed, int):
             raise TypeError(f"Seed must be integer: {seed}")
 
         self.seed: int | None = seed
-        self.algorithm = algorithm  # ToDo Issue #23: type and input validation
+        self.algorithm = (
+            algorithm if algorithm is not None else EvoBandits()
+        )  # ToDo Issue #23: type and input validation
         self.objective: Callable | None = None  # ToDo Issue #23: type and input validation
         self.params: ParamsType | None = None  # ToDo Issue #23: Input validation
+        self.fault_policy: FaultPolicy = FAULT_POLICY_DEFAULT
+        self._consecutive_skips: int = 0
+
+        # The numbers of simulations after which the adaptive grids are refined, see FloatParam.
+        self._refinement_schedule: list[int] = []
 
         # 1 for minimization, -1 for maximization to avoid repeated branching during optimization.
         self._direction: int = 1
+
+        # Statistics of the top arms of the last optimization, decoded on access.
+        self._result = None
+
+        # Timings and counters of the last optimization, if the algorithm collects stats.
+        self._stats: dict | None = None
+
+    @property
+    def result(self) -> StudyResult | None:
+        """
+        The best trial and the top trials of the last optimization with their statistics, or None
+        if the study was not optimized yet.
+        """
+        if self._result is None:
+            return None
+        return StudyResult.from_optimization_result(self._result, self._decode, self._direction)
+
+    @property
+    def stats(self) -> dict | None:
+        """
+        Timings in seconds and counters of the last optimization, or None if the study was not
+        optimized yet or the algorithm does not collect stats, see EvoBandits(collect_stats=True).
+        """
+        return self._stats
+
+    def _setup(
+        self, objective: Callable, params: ParamsType, maximize: bool, fault_policy: FaultPolicy
+    ) -> None:
+        """
+        Set the objective, the parameters, the direction and the fault policy of the next
+        optimization.
+
+        Raises:
+            TypeError: If maximize is not a bool, or fault_policy is not a FaultPolicy.
+        """
+        if not isinstance(maximize, bool):
+            raise TypeError(f"maximize must be a bool, got {type(maximize)}.")
+        if not isinstance(fault_policy, FaultPolicy):
+            raise TypeError(f"fault_policy must be a FaultPolicy, got {type(fault_policy)}.")
+        self._direction = -1 if maximize else 1
+
+        self.objective = objective
+        self.params = params
+        self.fault_policy = fault_policy
+        self._consecutive_skips = 0
+
+    def _start(self, trials: int, feasible: Callable | None, vectorized_feasible: bool) -> None:
+        """
+        Start an optimization of the algorithm, with the feasibility check on action vectors.
+
+        Raises:
+            ValueError: If a parameter is named 'seed', while the algorithm passes the seed of
+                each trial to the objective as 'seed'.
+        """
+        if "seed" in self.params and getattr(self.algorithm, "pull_seeding", None) is not None:
+            raise ValueError(
+                "A parameter cannot be named 'seed' if the algorithm uses pull_seeding, which "
+                "passes the seed of each trial to the objective as 'seed'."
+            )
+
+        # Spread the refinements of the adaptive grids evenly over the budget
+        refinements = max(
+            (
+                _unwrap(param).refinements
+                for param in self.params.values()
+                if isinstance(_unwrap(param), FloatParam)
+            ),
+            default=0,
+        )
+        self._refinement_schedule = [
+            trials * (i + 1) // (refinements + 1) for i in range(refinements)
+        ]
+
+        # Only pass the options that are used, so that any algorithm with ask and tell works
+        kwargs = {}
+        conditions = self._collect_conditions()
+        if conditions:
+            kwargs["conditions"] = conditions
+
+        if feasible is not None and vectorized_feasible:
+
+            def is_feasible(action_vectors: list) -> list:
+                return feasible([self._decode(action_vector) for action_vector in action_vectors])
+
+            kwargs.update(feasible=is_feasible, vectorized=True)
+        elif feasible is not None:
+
+            def is_feasible(action_vector: list) -> bool:
+                return feasible(**self._decode(action_vector))
+
+            kwargs.update(feasible=is_feasible, vectorized=False)
+
+        self.algorithm.start(self._collect_bounds(), trials, self.seed, **kwargs)
+
+    def _store_result(self, top_k: int) -> None:
+        """Store the result and the stats of the optimization, which may still be in progress."""
+        self._result = self.algorithm.result(top_k)
+        self._stats = self.algorithm.stats()
+
+    def _refine_grids(self) -> None:
+        """
+        Refine the adaptive grids of the float parameters, if the optimization reached the next
+        point of the schedule.
+
+        The refined parameters replace the ones in Study.params, so that the following trials and
+        the result are decoded on the finer grid. The parameters of the user are not modified.
+        """
+        if not self._refinement_schedule:
+            return
+        progress = self.algorithm.progress()
+        if progress is None or progress["simulations_used"] < self._refinement_schedule[0]:
+            return
+        self._refinement_schedule.pop(0)
+
+        params = {}
+        dimensions = {}  # The dimensions of the action vector by refine_factor
+        idx = 0
+        for key, param in self.params.items():
+            grid = _unwrap(param)
+            if isinstance(grid, FloatParam) and grid.refinements > 0:
+                dimensions.setdefault(grid.refine_factor, []).extend(range(idx, idx + param.size))
+                if isinstance(param, ConditionalParam):
+                    param = ConditionalParam(grid.refined(), param.parent, param.choices)
+                else:
+                    param = grid.refined()
+            params[key] = param
+            idx += param.size
+
+        for factor, dims in dimensions.items():
+            self.algorithm.refine(dims, factor)
+        self.params = params
+
     def _collect_bounds(self) -> list[tuple[int, int]]:
         """
         Collects the bounds of all parameters in the study.
@@ -56,9 +213,47 @@ class Study:
             bounds.extend(param.bounds)
         return bounds
 
+    def _collect_conditions(self) -> list[tuple[list[int], int, list[int]]]:
+        """
+        Collects the conditions of the conditional parameters in the study.
+
+        Returns:
+            list[tuple]: A (dimensions, parent dimension, active parent actions) tuple for each
+                conditional parameter, in the order of the parameters.
+
+        Raises:
+            ValueError: If the parent of a conditional parameter is not a categorical parameter
+                that is defined before it.
+        """
+        conditions = []
+        dimensions = {}  # The first dimension of each parameter
+        idx = 0
+        for key, param in self.params.items():
+            dimensions[key] = idx
+            if isinstance(param, ConditionalParam):
+                parent = self.params.get(param.parent)
+                if param.parent not in dimensions or not isinstance(
+                    _unwrap(parent), CategoricalParam
+                ):
+                    raise ValueError(
+                        f"The parent '{param.parent}' of '{key}' must be a CategoricalParam "
+                        "that is defined before it."
+                    )
+                values = [
+                    action
+                    for action, choice in enumerate(_unwrap(parent).choices)
+                    if param.is_active(choice)
+                ]
+                conditions.append(
+                    (list(range(idx, idx + param.size)), dimensions[param.parent], values)
+                )
+            idx += param.size
+        return conditions
+
     def _decode(self, action_vector: list) -> dict:
         """
         Decodes an action vector to a dictionary that contains the solution for each parameter.
+        Inactive conditional parameters are left out.
 
         Args:
             action_vector (list): A list of actions to map.
@@ -69,54 +264,532 @@ class Study:
         result = {}
         idx = 0
         for key, param in self.params.items():
-            result[key] = param.decode(action_vector[idx : idx + param.size])
+            if not isinstance(param, ConditionalParam) or (
+                param.parent in result and param.is_active(result[param.parent])
+            ):
+                result[key] = param.decode(action_vector[idx : idx + param.size])
             idx += param.size
         return result
 
-    def _evaluate(self, action_vector: list) -> float:
+    def _evaluate(self, action_vector: list, seed: int | None = None) -> float:
         """
         Execute a trial with the given action vector.
 
         Args:
             action_vector (list): A list of actions to execute.
+            seed (int | None): The seed for this trial, which is passed to the objective as keyword
+                argument 'seed'. Only provided if the algorithm is configured with pull_seeding.
 
         Returns:
             float: The result of the objective function.
         """
         solution = self._decode(action_vector)
+        if seed is not None:
+            solution["seed"] = seed
         evaluation = self._direction * self.objective(**solution)
+        if math.isnan(evaluation):
+            raise ValueError(f"The objective returned NaN for {solution}.")
         return evaluation
 
+    async def _evaluate_async(self, action_vector: list, seed: int | None = None) -> float:
+        """
+        Execute a trial with the given action vector, and await the coroutine objective.
+
+        Args:
+            action_vector (list): A list of actions to execute.
+            seed (int | None): The seed for this trial, see Study._evaluate.
+
+        Returns:
+            float: The result of the objective function.
+        """
+        solution = self._decode(action_vector)
+        if seed is not None:
+            solution["seed"] = seed
+        evaluation = self._direction * await self.objective(**solution)
+        if math.isnan(evaluation):
+            raise ValueError(f"The objective returned NaN for {solution}.")
+        return evaluation
+
+    def _handle_failure(self, action_vector: list, error: Exception) -> float | None:
+        """
+        Apply the fault policy to a trial that failed on its last attempt.
+
+        Returns:
+            float | None: The penalty as result of the trial, or None to skip it.
+        """
+        if self.fault_policy.on_failure == "raise":
+            raise error
+        _logger.warning(
+            "Trial %s failed: %r. Recording it as %s.",
+            self._decode(action_vector),
+            error,
+            "skipped" if self.fault_policy.on_failure == "skip" else "penalty",
+        )
+        if self.fault_policy.on_failure == "skip":
+            return None
+        return self._direction * self.fault_policy.penalty
+
+    def _evaluate_trial(self, action_vector: list, seed: int | None = None) -> float | None:
+        """
+        Execute a trial with the retries and the timeout of the fault policy.
+
+        Returns:
+            float | None: The result of the objective function, the penalty, or None if the trial
+                is skipped.
+        """
+        policy = self.fault_policy
+        for attempt in range(policy.retries + 1):
+            try:
+                return call_with_timeout(
+                    self._evaluate, policy.timeout, action_vector=action_vector, seed=seed
+                )
+            except Exception as error:
+                if attempt == policy.retries:
+                    return self._handle_failure(action_vector, error)
+                _logger.warning(
+                    "Trial %s failed: %r. Retrying.", self._decode(action_vector), error
+                )
+
+    async def _evaluate_trial_async(
+        self, action_vector: list, seed: int | None = None
+    ) -> float | None:
+        """
+        Execute a trial with the coroutine objective, and the retries and the timeout of the fault
+        policy, see Study._evaluate_trial.
+        """
+        policy = self.fault_policy
+        for attempt in range(policy.retries + 1):
+            try:
+                return await asyncio.wait_for(
+                    self._evaluate_async(action_vector, seed), policy.timeout
+                )
+            except Exception as error:
+                if attempt == policy.retries:
+                    return self._handle_failure(action_vector, error)
+                _logger.warning(
+                    "Trial %s failed: %r. Retrying.", self._decode(action_vector), error
+                )
+
+    def _check_skips(self, rewards: list) -> None:
+        """
+        Count the trials that were skipped in a row, since skipped trials do not consume budget.
+
+        Raises:
+            RuntimeError: If more trials were skipped in a row than the fault policy allows.
+        """
+        for reward in rewards:
+            self._consecutive_skips = self._consecutive_skips + 1 if reward is None else 0
+        if self._consecutive_skips >= self.fault_policy.max_consecutive_skips:
+            raise RuntimeError(
+                f"{self._consecutive_skips} trials in a row were skipped, the objective "
+                "presumably fails for every trial."
+            )
+
+    def _run_batch(self, batch: list) -> None:
+        """
+        Execute the trials of a batch and tell their results to the algorithm.
+
+        If the batch is interrupted, the completed trials are told and the others are skipped, so
+        that the optimization can be resumed.
+
+        Raises:
+            RuntimeError: If too many trials were skipped in a row, see Study._check_skips.
+        """
+        rewards = []
+        try:
+            for action_vector, seed in batch:
+                rewards.append(self._evaluate_trial(action_vector, seed))
+        finally:
+            self.algorithm.tell(rewards + [None] * (len(batch) - len(rewards)))
+        self._check_skips(rewards)
+        self._refine_grids()
+
+    def _run(self, top_k: int) -> dict:
+        """
+        Run the started optimization to completion, or until it is interrupted.
+
+        On a KeyboardInterrupt, the best trial so far is returned. The optimization can be
+        continued with Study.resume, also after any other error.
+        """
+        try:
+            while (batch := self.algorithm.ask()) is not None:
+                self._run_batch(batch)
+        except KeyboardInterrupt:
+            self._store_result(top_k)
+            if self._result is None:
+                raise
+            _logger.warning(
+                "Optimization interrupted after %d trials. Returning the best trial so far, "
+                "continue with Study.resume().",
+                self._result.simulations_used,
+            )
+        except BaseException:
+            self._store_result(top_k)
+            raise
+        else:
+            self._store_result(top_k)
+
+        return self._decode(self._result.best_arm["action_vector"])
+
     def optimize(
         self,
         objective: Callable,
         params: ParamsType,
         trials: int,
         maximize: bool = False,
-    ) -> None:
+        top_k: int = TOP_K_DEFAULT,
+        fault_policy: FaultPolicy = FAULT_POLICY_DEFAULT,
+        feasible: Callable | None = None,
+        vectorized_feasible: bool = False,
+    ) -> dict:
         """
         Optimize the objective function.
 
         The optimization process involves selecting suitable hyperparameter values within
         specified bounds and running the objective function for a given number of trials.
+        Afterwards, the top trials are available with their statistics as Study.result.
+
+        Failing trials are handled according to the fault policy. If the optimization is
+        interrupted with a KeyboardInterrupt, the best trial so far is returned. After an
+        interruption or an error, Study.result covers the completed trials, and the optimization
+        can be continued with Study.resume.
 
         Args:
             objective (Callable): The objective function to optimize.
             params (dict): A dictionary of parameters with their bounds.
             trials (int): The number of trials to run.
             maximize (bool): Indicates if objective is maximized. Default is False.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+            fault_policy (FaultPolicy): The handling of failing trials. Default is to raise.
+            feasible (Callable | None): A cheap check of the parameter constraints, which is called
+                like the objective and returns a bool. Infeasible trials are never evaluated.
+                Default is None.
+            vectorized_feasible (bool): If True, feasible is called once per batch with a list of
+                trials, and returns a sequence of bools. Default is False.
 
         Returns:
             dict: The best parameter values found during optimization.
         """
-        if not isinstance(maximize, bool):
-            raise TypeError(f"maximize must be a bool, got {type(maximize)}.")
-        self._direction = -1 if maximize else 1
+        self._setup(objective, params, maximize, fault_policy)
 
-        self.objective = objective
-        self.params = params
+        self._start(trials, feasible, vectorized_feasible)
+        return self._run(top_k)
+
+    def resume(self, top_k: int = TOP_K_DEFAULT) -> dict:
+        """
+        Continue an optimization that was interrupted, with the same objective and fault policy.
+
+        Args:
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+
+        Returns:
+            dict: The best parameter values found during optimization.
+
+        Raises:
+            RuntimeError: If the study was not optimized yet.
+        """
+        if self._result is None:
+            raise RuntimeError("There is no optimization to resume, call Study.optimize first.")
+        return self._run(top_k)
+
+    def extend(self, trials: int, top_k: int = TOP_K_DEFAULT) -> dict:
+        """
+        Continue the last optimization with additional trials, instead of starting over.
+
+        The optimization continues from its population, the statistics of the evaluated trials
+        and its random number stream, with the same objective, parameters and fault policy.
+        Afterwards, Study.result covers the trials of both runs.
+
+        Args:
+            trials (int): The number of additional trials to run.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+
+        Returns:
+            dict: The best parameter values found during optimization.
+
+        Raises:
+            ValueError: If trials is not a positive integer.
+            RuntimeError: If the study was not optimized yet.
+        """
+        self._resume_algorithm(trials)
+        return self._run(top_k)
+
+    def _resume_algorithm(self, trials: int) -> None:
+        """Add the trials to the budget of the last optimization, see Study.extend."""
+        if trials < 1:
+            raise ValueError(f"trials must be a positive integer, got {trials}.")
+        if self._result is None:
+            raise RuntimeError("There is no optimization to extend, call Study.optimize first.")
+        self.algorithm.resume(trials)
+
+    def iter_optimize(
+        self,
+        objective: Callable,
+        params: ParamsType,
+        trials: int,
+        maximize: bool = False,
+        top_k: int = TOP_K_DEFAULT,
+        fault_policy: FaultPolicy = FAULT_POLICY_DEFAULT,
+        feasible: Callable | None = None,
+        vectorized_feasible: bool = False,
+    ) -> Iterator[StudyProgress]:
+        """
+        Optimize the objective function, and yield the progress after each generation.
+
+        The first snapshot follows the initial population, and a last one follows the final phase,
+        if any. The replacements of skipped trials and the rounds of the final phase yield no
+        snapshots of their own. The snapshots are computed from the statistics of the evaluated
+        trials, without additional evaluations of the objective. Stopping the iteration, e.g.
+        with break, ends the optimization early. After an error, the optimization can be
+        continued with Study.resume. Either way, the result covers all completed trials
+        afterwards, see Study.result.
+
+        Args:
+            objective (Callable): The objective function to optimize.
+            params (dict): A dictionary of parameters with their bounds.
+            trials (int): The number of trials to run.
+            maximize (bool): Indicates if objective is maximized. Default is False.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+            fault_policy (FaultPolicy): The handling of failing trials. Default is to raise.
+            feasible (Callable | None): A cheap check of the parameter constraints, which is called
+                like the objective and returns a bool. Infeasible trials are never evaluated.
+                Default is None.
+            vectorized_feasible (bool): If True, feasible is called once per batch with a list of
+                trials, and returns a sequence of bools. Default is False.
+
+        Yields:
+            StudyProgress: The best trial so far, and the state of the population.
+        """
+        self._setup(objective, params, maximize, fault_policy)
+
+        self._start(trials, feasible, vectorized_feasible)
+        generation = None  # The generation of the last snapshot
+        unreported = False  # Whether batches were run since the last snapshot
+        try:
+            while (batch := self.algorithm.ask()) is not None:
+                self._run_batch(batch)
+                progress = self.algorithm.progress()
+                if progress["generation"] == generation:
+                    unreported = True
+                    continue
+                generation, unreported = progress["generation"], False
+                yield StudyProgress.from_progress(progress, self._decode, self._direction)
+            if unreported:
+                progress = self.algorithm.progress()
+                yield StudyProgress.from_progress(progress, self._decode, self._direction)
+        except GeneratorExit:
+            self.algorithm.finish()
+            raise
+        finally:
+            self._store_result(top_k)
+
+    async def optimize_async(
+        self,
+        objective: Callable,
+        params: ParamsType,
+        trials: int,
+        max_concurrency: int | None = None,
+        maximize: bool = False,
+        top_k: int = TOP_K_DEFAULT,
+        fault_policy: FaultPolicy = FAULT_POLICY_DEFAULT,
+        feasible: Callable | None = None,
+        vectorized_feasible: bool = False,
+    ) -> dict:
+        """
+        Optimize a coroutine objective function on the running event loop.
+
+        The trials of each generation are awaited concurrently, with at most max_concurrency
+        trials in flight at once. The results are passed to the algorithm in the order of the
+        trials, not in the order of completion, so that a seeded optimization is reproducible.
+        Afterwards, the top trials are available with their statistics as Study.result.
+
+        After an error or a cancellation, Study.result covers the completed trials, and the
+        optimization can be continued with Study.resume_async.
+
+        Args:
+            objective (Callable): The async objective function to optimize.
+            params (dict): A dictionary of parameters with their bounds.
+            trials (int): The number of trials to run.
+            max_concurrency (int | None): The maximum number of trials in flight. Default is None,
+                which awaits all trials of a generation at once.
+            maximize (bool): Indicates if objective is maximized. Default is False.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+            fault_policy (FaultPolicy): The handling of failing trials. Default is to raise.
+            feasible (Callable | None): A cheap check of the parameter constraints, which is called
+                like the objective and returns a bool. Infeasible trials are never evaluated.
+                Default is None.
+            vectorized_feasible (bool): If True, feasible is called once per batch with a list of
+                trials, and returns a sequence of bools. Default is False.
+
+        Returns:
+            dict: The best parameter values found during optimization.
+
+        Raises:
+            ValueError: If max_concurrency is not a positive integer or None.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer, got {max_concurrency}.")
+        self._setup(objective, params, maximize, fault_policy)
+
+        self._start(trials, feasible, vectorized_feasible)
+        return await self._run_async(max_concurrency, top_k)
+
+    async def resume_async(
+        self, max_concurrency: int | None = None, top_k: int = TOP_K_DEFAULT
+    ) -> dict:
+        """
+        Continue an optimization of a coroutine objective that was interrupted, see Study.resume.
+
+        Args:
+            max_concurrency (int | None): The maximum number of trials in flight. Default is None.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+
+        Returns:
+            dict: The best parameter values found during optimization.
+
+        Raises:
+            ValueError: If max_concurrency is not a positive integer or None.
+            RuntimeError: If the study was not optimized yet.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer, got {max_concurrency}.")
+        if self._result is None:
+            raise RuntimeError(
+                "There is no optimization to resume, call Study.optimize_async first."
+            )
+        return await self._run_async(max_concurrency, top_k)
+
+    async def extend_async(
+        self, trials: int, max_concurrency: int | None = None, top_k: int = TOP_K_DEFAULT
+    ) -> dict:
+        """
+        Continue the last optimization of a coroutine objective with additional trials, see
+        Study.extend.
+
+        Args:
+            trials (int): The number of additional trials to run.
+            max_concurrency (int | None): The maximum number of trials in flight. Default is None.
+            top_k (int): The number of top trials to keep in the result. Default is 10.
+
+        Returns:
+            dict: The best parameter values found during optimization.
+
+        Raises:
+            ValueError: If trials or max_concurrency is not a positive integer.
+            RuntimeError: If the study was not optimized yet.
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be a positive integer, got {max_concurrency}.")
+        self._resume_algorithm(trials)
+        return await self._run_async(max_concurrency, top_k)
+
+    async def _run_async(self, max_concurrency: int | None, top_k: int) -> dict:
+        """Run the started optimization of a coroutine objective, see Study.optimize_async."""
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+
+        async def evaluate(action_vector: list, seed: int | None) -> float | None:
+            if semaphore is None:
+                return await self._evaluate_trial_async(action_vector, seed)
+            async with semaphore:
+                return await self._evaluate_trial_async(action_vector, seed)
+
+        try:
+            while (batch := self.algorithm.ask()) is not None:
+                tasks = [asyncio.ensure_future(evaluate(*trial)) for trial in batch]
+                try:
+                    rewards = await asyncio.gather(*tasks)
+                except BaseException:
+                    # Do not leave the other trials of the generation running, and keep the
+                    # completed ones
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    self.algorithm.tell([_task_result(task) for task in tasks])
+                    raise
+                self.algorithm.tell(rewards)
+                self._check_skips(rewards)
+                self._refine_grids()
+        finally:
+            self._store_result(top_k)
+
+        return self._decode(self._result.best_arm["action_vector"])
+
+    def replicate(
+        self,
+        objective: Callable,
+        params: ParamsType,
+        trials: int,
+        n_runs: int,
+        n_jobs: int = 1,
+        maximize: bool = False,
+    ) -> ReplicationResult:
+        """
+        Run independent, seeded optimizations of the objective function.
+
+        Each run optimizes the objective with a fresh copy of the study's algorithm, and a seed
+        that is derived deterministically from the study's seed. With n_jobs > 1, the runs are
+        executed in a pool of worker processes, which requires the objective and params to be
+        picklable.
+
+        Args:
+            objective (Callable): The objective function to optimize.
+            params (dict): A dictionary of parameters with their bounds.
+            trials (int): The number of trials to run in each optimization.
+            n_runs (int): The number of independent optimizations.
+            n_jobs (int): The number of worker processes. -1 uses all CPUs. Default is 1, which
+                runs all optimizations in the current process.
+            maximize (bool): Indicates if objective is maximized. Default is False.
+
+        Returns:
+            ReplicationResult: The best parameter values, the seed and the timing of each run.
+
+        Raises:
+            ValueError: If n_runs is not a positive integer, or n_jobs is 0 or smaller than -1.
+        """
+        if n_runs < 1:
+            raise ValueError(f"n_runs must be a positive integer, got {n_runs}.")
+        if n_jobs == -1:
+            n_jobs = os.cpu_count() or 1
+        if n_jobs < 1:
+            raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}.")
+
+        rng = random.Random(self.seed)
+        seeds = [rng.getrandbits(64) for _ in range(n_runs)]
+        args = [(self.algorithm, objective, params, trials, maximize, seed) for seed in seeds]
+
+        if n_jobs == 1:
+            runs = [_replicate_once(*arg) for arg in args]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(max_workers=min(n_jobs, n_runs)) as executor:
+                runs = list(executor.map(_replicate_once, *zip(*args, strict=True)))
+
+        best_trials, timings = (list(values) for values in zip(*runs, strict=True))
+        return ReplicationResult(seeds=seeds, best_trials=best_trials, timings=timings)
+
+
+def _replicate_once(
+    algorithm, objective: Callable, params: ParamsType, trials: int, maximize: bool, seed: int
+) -> tuple[dict, float]:
+    """
+    Run one seeded optimization with a fresh copy of the algorithm and measure its duration.
+
+    Defined on module level, so that it can be pickled and executed in a worker process.
+    """
+    study = Study(seed=seed, algorithm=copy.deepcopy(algorithm))
+    start_time = time.perf_counter()
+    best_trial = study.optimize(objective, params, trials, maximize)
+    return best_trial, time.perf_counter() - start_time
+
+
+def _task_result(task: asyncio.Future) -> float | None:
+    """The result of a completed trial, or None if it failed or was cancelled."""
+    if not task.done() or task.cancelled() or task.exception() is not None:
+        return None
+    return task.result()
 
-        bounds = self._collect_bounds()
-        best_action_vector = self.algorithm.optimize(self._evaluate, bounds, trials, self.seed)
 
-        return self._decode(best_action_vector)
+def _unwrap(param: BaseParam) -> BaseParam:
+    """The parameter that suggests the values of a conditional parameter, or the parameter."""
+    return param.param if isinstance(param, ConditionalParam) else param
@@ -0,0 +1,8 @@
+"""Entry point of the worker processes: python -m evobandits.worker --help"""
+
+import sys
+
+from evobandits.distributed.worker import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,45 +12,278 @@
 // See the License for the specific language governing permissions and
 // limitations under the License.
 
-use pyo3::exceptions::PyRuntimeError;
+use numpy::{PyArray1, PyArray2};
+use pyo3::exceptions::{PyRuntimeError, PyValueError};
 use pyo3::prelude::*;
-use pyo3::types::PyList;
+use pyo3::types::{PyDict, PyType};
+use std::cell::RefCell;
 use std::panic;
+use std::rc::Rc;
+use std::sync::{Arc, Mutex};
 
-use evobandits_rust::arm::OptimizationFn;
-use evobandits_rust::evobandits::EvoBandits as RustEvoBandits;
+use evobandits_rust::arm::{ArmStatistics, FeasibilityFn, OptimizationFn};
+use evobandits_rust::evobandits::{
+    EvoBandits as RustEvoBandits, OptimizationResult as RustOptimizationResult, Progress,
+};
 use evobandits_rust::genetic::{
-    GeneticAlgorithm, CROSSOVER_RATE_DEFAULT, MUTATION_RATE_DEFAULT, MUTATION_SPAN_DEFAULT,
-    POPULATION_SIZE_DEFAULT,
+    Condition, GeneticAlgorithm, CROSSOVER_RATE_DEFAULT, MUTATION_RATE_DEFAULT,
+    MUTATION_SPAN_DEFAULT, POPULATION_SIZE_DEFAULT,
+};
+use evobandits_rust::options::{
+    ConfidenceBound, OperatorSchedule, Options, PullSeeding, FINAL_PHASE_BUDGET_DEFAULT,
+    SCREENING_FRACTION_DEFAULT, SCREENING_NEIGHBORS_DEFAULT,
 };
+use evobandits_rust::schedule::ScheduleState;
+use evobandits_rust::stats::Stats;
+
+fn parse_pull_seeding(pull_seeding: Option<&str>) -> PyResult<PullSeeding> {
+    match pull_seeding {
+        None => Ok(PullSeeding::Disabled),
+        Some("independent") => Ok(PullSeeding::Independent),
+        Some("common") => Ok(PullSeeding::Common),
+        Some(other) => Err(PyValueError::new_err(format!(
+            "pull_seeding must be None, 'independent' or 'common', got '{}'.",
+            other
+        ))),
+    }
+}
+
+fn format_pull_seeding(pull_seeding: PullSeeding) -> Option<&'static str> {
+    match pull_seeding {
+        PullSeeding::Disabled => None,
+        PullSeeding::Independent => Some("independent"),
+        PullSeeding::Common => Some("common"),
+    }
+}
+
+const TOP_K_DEFAULT: usize = 10;
 
+// Run f and convert a panic of the core, e.g. on an invalid configuration, to a RuntimeError.
+fn catch_panic<T>(f: impl FnOnce() -> T) -> PyResult<T> {
+    panic::catch_unwind(panic::AssertUnwindSafe(f)).map_err(|err| {
+        if let Some(s) = err.downcast_ref::<&str>() {
+            PyRuntimeError::new_err(format!("{}", s))
+        } else if let Some(s) = err.downcast_ref::<String>() {
+            PyRuntimeError::new_err(format!("{}", s))
+        } else {
+            PyRuntimeError::new_err("EvoBandits Core raised an Error with unknown cause.")
+        }
+    })
+}
+
+fn arm_statistics_to_dict<'py>(
+    py: Python<'py>,
+    statistics: &ArmStatistics,
+) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new(py);
+    dict.set_item("action_vector", &statistics.action_vector)?;
+    dict.set_item("mean_reward", statistics.mean_reward)?;
+    dict.set_item("num_pulls", statistics.num_pulls)?;
+    dict.set_item("std_dev", statistics.std_dev)?;
+    dict.set_item("std_error", statistics.std_error())?;
+    dict.set_item("confidence_interval", statistics.confidence_interval(1.96))?;
+    Ok(dict)
+}
+
+fn stats_to_dict<'py>(py: Python<'py>, stats: &Stats) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new(py);
+    dict.set_item("total_time", stats.total_time.as_secs_f64())?;
+    dict.set_item("objective_time", stats.objective_time.as_secs_f64())?;
+    dict.set_item(
+        "genetic_operators_time",
+        stats.genetic_operators_time.as_secs_f64(),
+    )?;
+    dict.set_item(
+        "tree_maintenance_time",
+        stats.tree_maintenance_time.as_secs_f64(),
+    )?;
+    dict.set_item("ucb_selection_time", stats.ucb_selection_time.as_secs_f64())?;
+    dict.set_item("surrogate_time", stats.surrogate_time.as_secs_f64())?;
+    dict.set_item("lookup_hits", stats.lookup_hits)?;
+    dict.set_item("skipped_offspring", stats.skipped_offspring)?;
+    dict.set_item("duplicate_children", stats.duplicate_children)?;
+    dict.set_item("infeasible_candidates", stats.infeasible_candidates)?;
+    dict.set_item("screened_offspring", stats.screened_offspring)?;
+    dict.set_item("repulls", stats.repulls)?;
+    dict.set_item("new_arms", stats.new_arms)?;
+    dict.set_item("generations", stats.generations)?;
+    Ok(dict)
+}
+
+fn schedule_state_to_dict<'py>(
+    py: Python<'py>,
+    state: &ScheduleState,
+) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new(py);
+    dict.set_item("mutation_span", state.mutation_span)?;
+    dict.set_item("success_rate", state.success_rate)?;
+    dict.set_item("generations", state.generations)?;
+    Ok(dict)
+}
+
+fn progress_to_dict<'py>(py: Python<'py>, progress: &Progress) -> PyResult<Bound<'py, PyDict>> {
+    let dict = PyDict::new(py);
+    dict.set_item("generation", progress.generation)?;
+    dict.set_item("simulations_used", progress.simulations_used)?;
+    dict.set_item("best_arm", arm_statistics_to_dict(py, &progress.best_arm)?)?;
+    dict.set_item("population_mean", progress.population_mean)?;
+    Ok(dict)
+}
+
+// A condition as passed from Python: the dimensions, the parent dimension and its active values.
+type ConditionTuple = (Vec<usize>, usize, Vec<i32>);
+
+// Calls the Python objective. If the objective raises, its error is kept for optimize to re-raise,
+// and the optimization is aborted with a panic.
 struct PythonOptimizationFn {
     py_func: PyObject,
+    error: Rc<RefCell<Option<PyErr>>>,
 }
 
 impl PythonOptimizationFn {
-    fn new(py_func: PyObject) -> Self {
-        Self { py_func }
+    fn new(py_func: PyObject, error: Rc<RefCell<Option<PyErr>>>) -> Self {
+        Self { py_func, error }
+    }
+
+    fn extract_reward(&self, py: Python<'_>, result: PyResult<PyObject>) -> f64 {
+        match result.and_then(|result| result.extract::<f64>(py)) {
+            Ok(reward) => reward,
+            Err(err) => {
+                self.error.borrow_mut().replace(err);
+                panic!("The objective function raised an exception");
+            }
+        }
     }
 }
 
 impl OptimizationFn for PythonOptimizationFn {
     fn evaluate(&self, action_vector: &[i32]) -> f64 {
         Python::with_gil(|py| {
-            let py_list = PyList::new(py, action_vector);
-            let result = self
-                .py_func
-                .call1(py, (py_list.unwrap(),))
-                .expect("Failed to call Python function");
-            result.extract::<f64>(py).expect("Failed to extract f64")
+            let result = self.py_func.call1(py, (action_vector.to_vec(),));
+            self.extract_reward(py, result)
+        })
+    }
+
+    fn evaluate_seeded(&self, action_vector: &[i32], seed: u64) -> f64 {
+        Python::with_gil(|py| {
+            let result = self.py_func.call1(py, (action_vector.to_vec(), seed));
+            self.extract_reward(py, result)
+        })
+    }
+}
+
+// The error of a feasibility check that raised, kept for optimize, start and ask to re-raise. The
+// check is kept by the core, so unlike the objective it must be Send and Sync.
+#[derive(Debug, Default, Clone)]
+struct FeasibilityError(Arc<Mutex<Option<PyErr>>>);
+
+impl FeasibilityError {
+    fn replace(&self, err: PyErr) {
+        self.0.lock().unwrap().replace(err);
+    }
+
+    fn take(&self) -> Option<PyErr> {
+        self.0.lock().unwrap().take()
+    }
+}
+
+// Errors cannot be compared, so any two are considered equal.
+impl PartialEq for FeasibilityError {
+    fn eq(&self, _other: &Self) -> bool {
+        true
+    }
+}
+
+// Calls the Python feasibility check, either for each candidate or, if vectorized, once with the
+// list of candidates of a batch. If the check raises, its error is kept, and the optimization is
+// aborted with a panic.
+struct PythonFeasibilityFn {
+    py_func: PyObject,
+    vectorized: bool,
+    error: FeasibilityError,
+}
+
+impl PythonFeasibilityFn {
+    fn extract<'py, T: FromPyObject<'py>>(&self, result: PyResult<Bound<'py, PyAny>>) -> T {
+        match result.and_then(|result| result.extract::<T>()) {
+            Ok(value) => value,
+            Err(err) => {
+                self.error.replace(err);
+                panic!("The feasibility check raised an exception");
+            }
+        }
+    }
+}
+
+impl FeasibilityFn for PythonFeasibilityFn {
+    fn is_feasible(&self, action_vector: &[i32]) -> bool {
+        Python::with_gil(|py| {
+            let result = self.py_func.bind(py).call1((action_vector.to_vec(),));
+            self.extract(result)
+        })
+    }
+
+    fn are_feasible(&self, action_vectors: &[&[i32]]) -> Vec<bool> {
+        if !self.vectorized {
+            return action_vectors
+                .iter()
+                .map(|action_vector| self.is_feasible(action_vector))
+                .collect();
+        }
+        Python::with_gil(|py| {
+            let action_vectors: Vec<Vec<i32>> = action_vectors
+                .iter()
+                .map(|vector| vector.to_vec())
+                .collect();
+            let result = self.py_func.bind(py).call1((action_vectors,));
+            self.extract(result)
         })
     }
 }
 
-#[pyclass(eq)]
+fn parse_confidence_bound(confidence_bound: &str) -> PyResult<ConfidenceBound> {
+    match confidence_bound {
+        "ucb" => Ok(ConfidenceBound::Ucb),
+        "ucb_v" => Ok(ConfidenceBound::UcbV),
+        "empirical_bernstein" => Ok(ConfidenceBound::EmpiricalBernstein),
+        other => Err(PyValueError::new_err(format!(
+            "confidence_bound must be 'ucb', 'ucb_v' or 'empirical_bernstein', got '{}'.",
+            other
+        ))),
+    }
+}
+
+fn format_confidence_bound(confidence_bound: ConfidenceBound) -> &'static str {
+    match confidence_bound {
+        ConfidenceBound::Ucb => "ucb",
+        ConfidenceBound::UcbV => "ucb_v",
+        ConfidenceBound::EmpiricalBernstein => "empirical_bernstein",
+    }
+}
+
+fn parse_operator_schedule(operator_schedule: Option<&str>) -> PyResult<OperatorSchedule> {
+    match operator_schedule {
+        None => Ok(OperatorSchedule::Fixed),
+        Some("success_rate") => Ok(OperatorSchedule::SuccessRate),
+        Some(other) => Err(PyValueError::new_err(format!(
+            "operator_schedule must be None or 'success_rate', got '{}'.",
+            other
+        ))),
+    }
+}
+
+fn format_operator_schedule(operator_schedule: OperatorSchedule) -> Option<&'static str> {
+    match operator_schedule {
+        OperatorSchedule::Fixed => None,
+        OperatorSchedule::SuccessRate => Some("success_rate"),
+    }
+}
+
+#[pyclass(eq, module = "evobandits.evobandits")]
 #[derive(Debug, PartialEq)]
 struct EvoBandits {
     evobandits: RustEvoBandits,
+    feasibility_error: FeasibilityError,
 }
 
 #[pymethods]
@@ -61,12 +294,26 @@ impl EvoBandits {
         mutation_rate=MUTATION_RATE_DEFAULT,
         crossover_rate=CROSSOVER_RATE_DEFAULT,
         mutation_span=MUTATION_SPAN_DEFAULT,
+        pull_seeding=None,
+        confidence_bound="ucb",
+        final_phase_budget=FINAL_PHASE_BUDGET_DEFAULT,
+        collect_stats=false,
+        screening_fraction=SCREENING_FRACTION_DEFAULT,
+        screening_neighbors=SCREENING_NEIGHBORS_DEFAULT,
+        operator_schedule=None,
     ))]
     fn new(
         population_size: Option<usize>,
         mutation_rate: Option<f64>,
         crossover_rate: Option<f64>,
         mutation_span: Option<f64>,
+        pull_seeding: Option<&str>,
+        confidence_bound: &str,
+        final_phase_budget: f64,
+        collect_stats: bool,
+        screening_fraction: f64,
+        screening_neighbors: usize,
+        operator_schedule: Option<&str>,
     ) -> PyResult<Self> {
         let genetic_algorithm = GeneticAlgorithm {
             population_size: population_size.unwrap(),
@@ -75,15 +322,85 @@ impl EvoBandits {
             mutation_span: mutation_span.unwrap(),
             ..Default::default()
         };
-        let evobandits = RustEvoBandits::new(genetic_algorithm);
-        Ok(EvoBandits { evobandits })
+        let options = Options {
+            pull_seeding: parse_pull_seeding(pull_seeding)?,
+            confidence_bound: parse_confidence_bound(confidence_bound)?,
+            final_phase_budget,
+            collect_stats,
+            screening_fraction,
+            screening_neighbors,
+            operator_schedule: parse_operator_schedule(operator_schedule)?,
+        };
+        let evobandits = RustEvoBandits::with_options(genetic_algorithm, options);
+        Ok(EvoBandits {
+            evobandits,
+            feasibility_error: FeasibilityError::default(),
+        })
+    }
+
+    /// Support pickling and copying, e.g. to run replications in worker processes. Only the
+    /// configuration is preserved, the copy starts without the state of previous optimizations.
+    fn __reduce__<'py>(
+        slf: &Bound<'py, Self>,
+    ) -> PyResult<(
+        Bound<'py, PyType>,
+        (
+            usize,
+            f64,
+            f64,
+            f64,
+            Option<&'static str>,
+            &'static str,
+            f64,
+            bool,
+            f64,
+            usize,
+            Option<&'static str>,
+        ),
+    )> {
+        let this = slf.borrow();
+        let genetic_algorithm = this.evobandits.genetic_algorithm();
+        let options = this.evobandits.options();
+        Ok((
+            slf.get_type(),
+            (
+                genetic_algorithm.population_size,
+                genetic_algorithm.mutation_rate,
+                genetic_algorithm.crossover_rate,
+                genetic_algorithm.mutation_span,
+                format_pull_seeding(options.pull_seeding),
+                format_confidence_bound(options.confidence_bound),
+                options.final_phase_budget,
+                options.collect_stats,
+                options.screening_fraction,
+                options.screening_neighbors,
+                format_operator_schedule(options.operator_schedule),
+            ),
+        ))
     }
 
+    /// The seeding of the simulations, None, "independent" or "common". Unless None, the seed of
+    /// each trial is passed to the objective.
+    #[getter]
+    fn pull_seeding(&self) -> Option<&'static str> {
+        format_pull_seeding(self.evobandits.options().pull_seeding)
+    }
+
+    /// Optimize the objective within the bounds. The optional feasibility check is called with an
+    /// action vector, or if vectorized, with the list of action vectors of a batch, and returns
+    /// whether they are feasible. Infeasible candidates are never passed to the objective.
+    ///
+    /// The optional conditions are (dimensions, parent, values) tuples: the dimensions are only
+    /// active if the parent dimension takes one of the values. Inactive dimensions are set to
+    /// their lower bound, so that equivalent action vectors share one arm.
     #[pyo3(signature = (
         py_func,
         bounds,
         simulation_budget,
         seed=None,
+        feasible=None,
+        vectorized=false,
+        conditions=None,
     ))]
     fn optimize(
         &mut self,
@@ -91,39 +408,242 @@ impl EvoBandits {
         bounds: Vec<(i32, i32)>,
         simulation_budget: usize,
         seed: Option<u64>,
+        feasible: Option<PyObject>,
+        vectorized: bool,
+        conditions: Option<Vec<ConditionTuple>>,
     ) -> PyResult<Vec<i32>> {
-        let py_opti_function = PythonOptimizationFn::new(py_func);
+        self.set_feasibility(feasible, vectorized);
+        self.set_conditions(conditions);
+        let error = Rc::new(RefCell::new(None));
+        let py_opti_function = PythonOptimizationFn::new(py_func, Rc::clone(&error));
 
-        let result = panic::catch_unwind(std::panic::AssertUnwindSafe(|| {
+        catch_panic(|| {
             self.evobandits
                 .optimize(py_opti_function, bounds, simulation_budget, seed)
-        }));
+        })
+        .map_err(|err| {
+            error
+                .take()
+                .or_else(|| self.feasibility_error.take())
+                .unwrap_or(err)
+        })
+    }
 
-        match result {
-            Ok(v) => Ok(v),
-            Err(err) => {
-                if let Some(s) = err.downcast_ref::<&str>() {
-                    Err(PyRuntimeError::new_err(format!("{}", s)))
-                } else if let Some(s) = err.downcast_ref::<String>() {
-                    Err(PyRuntimeError::new_err(format!("{}", s)))
-                } else {
-                    Err(PyRuntimeError::new_err(
-                        "EvoBandits Core raised an Error with unknown cause.",
-                    ))
-                }
-            }
-        }
+    /// Start an optimization that is driven by ask and tell, instead of optimize. The feasibility
+    /// check and the conditions are the same as for optimize.
+    #[pyo3(signature = (
+        bounds,
+        simulation_budget,
+        seed=None,
+        feasible=None,
+        vectorized=false,
+        conditions=None,
+    ))]
+    fn start(
+        &mut self,
+        bounds: Vec<(i32, i32)>,
+        simulation_budget: usize,
+        seed: Option<u64>,
+        feasible: Option<PyObject>,
+        vectorized: bool,
+        conditions: Option<Vec<ConditionTuple>>,
+    ) -> PyResult<()> {
+        self.set_feasibility(feasible, vectorized);
+        self.set_conditions(conditions);
+        self.catch_feasibility_panic(|evobandits| evobandits.start(bounds, simulation_budget, seed))
+    }
+
+    /// The next batch of trials as a list of (action_vector, seed) tuples, or None if the
+    /// optimization is complete. The seed is None, unless pull_seeding is enabled.
+    fn ask(&mut self) -> PyResult<Option<Vec<(Vec<i32>, Option<u64>)>>> {
+        let trials = self.catch_feasibility_panic(|evobandits| evobandits.ask())?;
+        Ok(trials.map(|trials| {
+            trials
+                .into_iter()
+                .map(|trial| (trial.action_vector, trial.seed))
+                .collect()
+        }))
+    }
+
+    /// Record the rewards of the trials of the last ask, in the same order. A reward of None skips
+    /// the trial, e.g. if its evaluation failed, without consuming budget.
+    fn tell(&mut self, rewards: Vec<Option<f64>>) -> PyResult<()> {
+        catch_panic(|| self.evobandits.tell(&rewards))
+    }
+
+    /// Continue the last optimization with extra_budget additional trials, from its population,
+    /// arm statistics and random number stream. The trials are requested with ask as before.
+    fn resume(&mut self, extra_budget: usize) -> PyResult<()> {
+        self.catch_feasibility_panic(|evobandits| evobandits.resume(extra_budget))
+    }
+
+    /// Refine the grid of the given dimensions by factor between two batches. An action a becomes
+    /// a * factor, so the statistics of the simulated arms are kept at the same points.
+    fn refine(&mut self, dimensions: Vec<usize>, factor: i32) -> PyResult<()> {
+        catch_panic(|| self.evobandits.refine(&dimensions, factor))
+    }
+
+    /// Stop the optimization early, the result then covers the trials that were told so far.
+    fn finish(&mut self) {
+        self.evobandits.finish()
+    }
+
+    /// The generation, the simulations used, the current best arm and the average mean reward of
+    /// the current population. None if no trial was told yet.
+    fn progress<'py>(&self, py: Python<'py>) -> PyResult<Option<Bound<'py, PyDict>>> {
+        self.evobandits
+            .progress()
+            .map(|progress| progress_to_dict(py, &progress))
+            .transpose()
+    }
+
+    /// Statistics of the best arm of the last optimization: its action vector, mean reward,
+    /// number of pulls, standard deviation and standard error of the rewards, and a 95%
+    /// confidence interval for the mean reward. The standard error and the interval are infinite
+    /// for an arm with a single pull. None if there was no optimization yet.
+    fn best_arm<'py>(&self, py: Python<'py>) -> PyResult<Option<Bound<'py, PyDict>>> {
+        self.evobandits
+            .best_arm()
+            .map(|best_arm| arm_statistics_to_dict(py, &best_arm))
+            .transpose()
+    }
+
+    /// The state of the adaptive operator schedule of the last optimization: the mutation span of
+    /// the next generation, the smoothed success rate of the offspring and the number of adapted
+    /// generations. None unless operator_schedule is set.
+    fn schedule_state<'py>(&self, py: Python<'py>) -> PyResult<Option<Bound<'py, PyDict>>> {
+        self.evobandits
+            .schedule_state()
+            .map(|state| schedule_state_to_dict(py, state))
+            .transpose()
+    }
+
+    /// Restore the state of the adaptive operator schedule between two batches, e.g. from a
+    /// checkpoint with set_schedule_state(**state).
+    fn set_schedule_state(
+        &mut self,
+        mutation_span: f64,
+        success_rate: f64,
+        generations: usize,
+    ) -> PyResult<()> {
+        let state = ScheduleState {
+            mutation_span,
+            success_rate,
+            generations,
+        };
+        catch_panic(|| self.evobandits.set_schedule_state(state))
+    }
+
+    /// Timings in seconds and counters of the last optimization, if it collected stats.
+    fn stats<'py>(&self, py: Python<'py>) -> PyResult<Option<Bound<'py, PyDict>>> {
+        self.evobandits
+            .stats()
+            .map(|stats| stats_to_dict(py, stats))
+            .transpose()
+    }
+
+    /// The best arm and the top_k arms with the lowest mean rewards of the last optimization,
+    /// with their statistics as NumPy arrays. None if there was no optimization yet.
+    #[pyo3(signature = (top_k=TOP_K_DEFAULT))]
+    fn result(&self, py: Python<'_>, top_k: usize) -> PyResult<Option<OptimizationResult>> {
+        self.evobandits
+            .result(top_k)
+            .map(|result| OptimizationResult::new(py, result))
+            .transpose()
+    }
+}
+
+impl EvoBandits {
+    fn set_feasibility(&mut self, feasible: Option<PyObject>, vectorized: bool) {
+        self.feasibility_error = FeasibilityError::default();
+        let feasibility = feasible.map(|py_func| {
+            Box::new(PythonFeasibilityFn {
+                py_func,
+                vectorized,
+                error: self.feasibility_error.clone(),
+            }) as Box<dyn FeasibilityFn + Send + Sync>
+        });
+        self.evobandits.set_feasibility(feasibility);
+    }
+
+    // Like catch_panic, but re-raise the error of the feasibility check if it aborted f.
+    fn catch_feasibility_panic<T>(
+        &mut self,
+        f: impl FnOnce(&mut RustEvoBandits) -> T,
+    ) -> PyResult<T> {
+        catch_panic(|| f(&mut self.evobandits))
+            .map_err(|err| self.feasibility_error.take().unwrap_or(err))
+    }
+
+    fn set_conditions(&mut self, conditions: Option<Vec<ConditionTuple>>) {
+        let conditions = conditions
+            .unwrap_or_default()
+            .into_iter()
+            .map(|(dimensions, parent, values)| Condition {
+                dimensions,
+                parent,
+                values,
+            })
+            .collect();
+        self.evobandits.set_conditions(conditions);
+    }
+}
+
+/// The statistics of the top arms of an optimization, built once as contiguous NumPy arrays.
+///
+/// Row i of action_vectors, and element i of the other arrays, belong to the arm with the i-th
+/// lowest mean reward.
+#[pyclass(frozen, module = "evobandits.evobandits")]
+struct OptimizationResult {
+    #[pyo3(get)]
+    best_arm: Py<PyDict>,
+    #[pyo3(get)]
+    action_vectors: Py<PyArray2<i32>>,
+    #[pyo3(get)]
+    mean_rewards: Py<PyArray1<f64>>,
+    #[pyo3(get)]
+    num_pulls: Py<PyArray1<i32>>,
+    #[pyo3(get)]
+    std_devs: Py<PyArray1<f64>>,
+    #[pyo3(get)]
+    ucb_values: Py<PyArray1<f64>>,
+    #[pyo3(get)]
+    simulations_used: usize,
+}
+
+impl OptimizationResult {
+    fn new(py: Python<'_>, result: RustOptimizationResult) -> PyResult<Self> {
+        let action_vectors: Vec<Vec<i32>> = result
+            .top_arms
+            .iter()
+            .map(|arm| arm.action_vector.clone())
+            .collect();
+        let mean_rewards: Vec<f64> = result.top_arms.iter().map(|arm| arm.mean_reward).collect();
+        let num_pulls: Vec<i32> = result.top_arms.iter().map(|arm| arm.num_pulls).collect();
+        let std_devs: Vec<f64> = result.top_arms.iter().map(|arm| arm.std_dev).collect();
+
+        Ok(OptimizationResult {
+            best_arm: arm_statistics_to_dict(py, &result.best_arm)?.unbind(),
+            action_vectors: PyArray2::from_vec2(py, &action_vectors)?.unbind(),
+            mean_rewards: PyArray1::from_vec(py, mean_rewards).unbind(),
+            num_pulls: PyArray1::from_vec(py, num_pulls).unbind(),
+            std_devs: PyArray1::from_vec(py, std_devs).unbind(),
+            ucb_values: PyArray1::from_vec(py, result.ucb_values).unbind(),
+            simulations_used: result.simulations_used,
+        })
     }
 }
 
 #[pymodule]
 fn evobandits(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<EvoBandits>()?;
+    m.add_class::<OptimizationResult>()?;
 
     m.add("POPULATION_SIZE_DEFAULT", POPULATION_SIZE_DEFAULT)?;
     m.add("MUTATION_RATE_DEFAULT", MUTATION_RATE_DEFAULT)?;
     m.add("CROSSOVER_RATE_DEFAULT", CROSSOVER_RATE_DEFAULT)?;
     m.add("MUTATION_SPAN_DEFAULT", MUTATION_SPAN_DEFAULT)?;
+    m.add("TOP_K_DEFAULT", TOP_K_DEFAULT)?;
 
     Ok(())
 }
@@ -9,7 +9,6 @@ Last accessed: 2025-04-18
 Version: 1.6.1
 """
 
-import numpy as np
 from evobandits import CategoricalParam, FloatParam, IntParam
 from sklearn.cluster import KMeans, MiniBatchKMeans
 from sklearn.datasets import make_blobs
@@ -31,17 +30,17 @@ BEST_TRIAL_EXAMPLE = {
 }
 
 
-# Generate sample data
-np.random.seed(0)
-
+# Generate sample data, the same in each process
 _centers = [[1, 1], [-1, -1], [1, -1]]
 _n_clusters = len(_centers)
-_X, labels_true = make_blobs(n_samples=10000, centers=_centers, cluster_std=0.7)
+_X, labels_true = make_blobs(n_samples=10000, centers=_centers, cluster_std=0.7, random_state=0)
 
 
-def function(algorithm, init, n_clusters, tol) -> float:
+def function(algorithm, init, n_clusters, tol, random_state=None) -> float:
     """Evaluate the inertia of the clustering that results from the given parameters."""
-    clusterer = algorithm(init=init, n_clusters=n_clusters, tol=tol, n_init=10)
+    clusterer = algorithm(
+        init=init, n_clusters=n_clusters, tol=tol, n_init=10, random_state=random_state
+    )
     clusterer.fit(_X)
     return clusterer.inertia_
 
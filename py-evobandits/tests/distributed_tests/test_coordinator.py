@@ -0,0 +1,155 @@
+import asyncio
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+from evobandits import CategoricalParam, EvoBandits, Study
+from evobandits.distributed import Coordinator, run_worker
+from evobandits.distributed.protocol import decode, encode
+from evobandits.distributed.worker import load_objective
+
+from tests._functions import rosenbrock as rb
+
+ROOT = Path(__file__).parents[2]
+
+
+def start_worker_process(address) -> subprocess.Popen:
+    if isinstance(address, str):
+        args = ["--unix", address]
+    else:
+        args = ["--tcp", f"{address[0]}:{address[1]}"]
+    objective = ["--objective", "tests._functions.rosenbrock:function"]
+    return subprocess.Popen(
+        [sys.executable, "-m", "evobandits.worker", *args, *objective], cwd=ROOT
+    )
+
+
+def start_worker_thread(objective, address) -> threading.Thread:
+    thread = threading.Thread(target=run_worker, args=(objective, address), daemon=True)
+    thread.start()
+    return thread
+
+
+async def open_connection(address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+def reference_result(trials: int) -> dict:
+    async def objective(number: list) -> float:
+        return rb.function(number)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    return asyncio.run(study.optimize_async(objective, rb.PARAMS_2D, trials))
+
+
+@pytest.fixture(params=["unix", "tcp"])
+def address(request, tmp_path):
+    if request.param == "unix":
+        return str(tmp_path / "coordinator.sock")
+    return ("127.0.0.1", 0)
+
+
+def test_coordinator(address):
+    async def optimize():
+        async with Coordinator(address) as coordinator:
+            workers = [start_worker_process(coordinator.address) for _ in range(2)]
+            study = Study(seed=42, algorithm=EvoBandits())
+            best_trial = await study.optimize_async(coordinator.evaluate, rb.PARAMS_2D, 100)
+        return best_trial, study.result, workers
+
+    best_trial, result, workers = asyncio.run(optimize())
+    assert result.simulations_used == 100
+    assert best_trial == reference_result(100)
+
+    # The workers exit when the coordinator closes
+    for worker in workers:
+        assert worker.wait(timeout=10) == 0
+
+
+@pytest.mark.parametrize("disconnect", [True, False], ids=["disconnect", "missed_heartbeat"])
+def test_coordinator_dead_worker(address, disconnect):
+    async def dead_worker(address):
+        # Request a trial, then disconnect or go silent without reporting a result
+        reader, writer = await open_connection(address)
+        writer.write(encode({"type": "request"}))
+        await writer.drain()
+        task = decode(await reader.readline())
+        if disconnect:
+            writer.close()
+        return task
+
+    async def optimize():
+        async with Coordinator(address, heartbeat_timeout=0.2) as coordinator:
+            dead = asyncio.ensure_future(dead_worker(coordinator.address))
+            study = Study(seed=42, algorithm=EvoBandits())
+            optimization = asyncio.ensure_future(
+                study.optimize_async(coordinator.evaluate, rb.PARAMS_2D, 100)
+            )
+            await dead
+            worker = start_worker_thread(rb.function, coordinator.address)
+            best_trial = await optimization
+        worker.join(timeout=10)
+        return best_trial, study.result
+
+    # The trial of the dead worker is dispatched again, so the optimization completes
+    best_trial, result = asyncio.run(optimize())
+    assert result.simulations_used == 100
+    assert best_trial == reference_result(100)
+
+
+def test_coordinator_objective_error(address):
+    def objective(number: list) -> float:
+        raise ValueError("Simulation failed")
+
+    async def optimize():
+        async with Coordinator(address) as coordinator:
+            start_worker_thread(objective, coordinator.address)
+            study = Study(seed=42, algorithm=EvoBandits())
+            await study.optimize_async(coordinator.evaluate, rb.PARAMS_2D, 100)
+
+    with pytest.raises(RuntimeError, match="Simulation failed"):
+        asyncio.run(optimize())
+
+
+def test_coordinator_not_serializable(address):
+    class Model:
+        pass
+
+    # The trial is rejected before it is queued, instead of failing in the handler of a worker
+    async def optimize():
+        async with Coordinator(address) as coordinator:
+            study = Study(seed=42, algorithm=EvoBandits())
+            params = {"model": CategoricalParam([Model, None])}
+            await asyncio.wait_for(study.optimize_async(coordinator.evaluate, params, 100), 10)
+
+    with pytest.raises(TypeError, match="JSON serializable"):
+        asyncio.run(optimize())
+
+
+def test_coordinator_invalid_message(address):
+    async def invalid_worker(address) -> bytes:
+        reader, writer = await open_connection(address)
+        writer.write(encode({"kind": "request"}))
+        await writer.drain()
+        return await reader.readline()
+
+    # A worker that sends an invalid message is disconnected, the others continue
+    async def optimize():
+        async with Coordinator(address) as coordinator:
+            assert await invalid_worker(coordinator.address) == b""
+            start_worker_thread(rb.function, coordinator.address)
+            study = Study(seed=42, algorithm=EvoBandits())
+            await study.optimize_async(coordinator.evaluate, rb.PARAMS_2D, 100)
+        return study.result
+
+    assert asyncio.run(optimize()).simulations_used == 100
+
+
+def test_load_objective():
+    assert load_objective("tests._functions.rosenbrock:function") is rb.function
+    with pytest.raises(ValueError):
+        load_objective("tests._functions.rosenbrock")
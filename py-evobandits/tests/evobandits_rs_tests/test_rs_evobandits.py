@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
+import pickle
+import random
 from contextlib import nullcontext
 
+import numpy as np
 import pytest
 from evobandits import EvoBandits
 
@@ -35,12 +39,25 @@ MUTATION_SPAN = 1.0
         [[(0, 100), (0, 100)] * 5, 100, {"mutation_rate": MUTATION_RATE}],
         [[(0, 100), (0, 100)] * 5, 100, {"crossover_rate": CROSSOVER_RATE}],
         [[(0, 100), (0, 100)] * 5, 100, {"mutation_span": MUTATION_SPAN}],
+        [[(0, 100), (0, 100)] * 5, 100, {"confidence_bound": "ucb_v"}],
+        [[(0, 100), (0, 100)] * 5, 100, {"confidence_bound": "empirical_bernstein"}],
+        [[(0, 100), (0, 100)] * 5, 100, {"final_phase_budget": 0.2}],
+        [[(0, 100), (0, 100)] * 5, 100, {"screening_fraction": 0.5, "screening_neighbors": 3}],
+        [[(0, 100), (0, 100)] * 5, 100, {"operator_schedule": "success_rate"}],
         [[(0, 100), (0, 100)] * 5, 1, {"population_size": 2, "exp": pytest.raises(RuntimeError)}],
         [[(0, 10), (0, 10)], 100, {"population_size": 0, "exp": pytest.raises(RuntimeError)}],
         [[(0, 10), (0, 10)], 100, {"mutation_rate": -0.1, "exp": pytest.raises(RuntimeError)}],
         [[(0, 10), (0, 10)], 100, {"crossover_rate": 1.1, "exp": pytest.raises(RuntimeError)}],
         [[(0, 10), (0, 10)], 100, {"mutation_span": -0.1, "exp": pytest.raises(RuntimeError)}],
         [[(0, 1), (0, 1)], 100, {"exp": pytest.raises(RuntimeError)}],
+        [[(0, 10), (0, 10)], 100, {"confidence_bound": "ucb2", "exp": pytest.raises(ValueError)}],
+        [[(0, 10), (0, 10)], 100, {"final_phase_budget": 1.0, "exp": pytest.raises(RuntimeError)}],
+        [[(0, 10), (0, 10)], 100, {"screening_fraction": 0.0, "exp": pytest.raises(RuntimeError)}],
+        [
+            [(0, 10), (0, 10)],
+            100,
+            {"operator_schedule": "linear", "exp": pytest.raises(ValueError)},
+        ],
     ],
     ids=[
         "success",
@@ -49,12 +66,21 @@ MUTATION_SPAN = 1.0
         "success_with_mutation_rate",
         "success_with_crossover_rate",
         "success_with_mutation_span",
+        "success_with_ucb_v",
+        "success_with_empirical_bernstein",
+        "success_with_final_phase_budget",
+        "success_with_screening",
+        "success_with_operator_schedule",
         "fail_budget_value",
         "fail_population_size_value",
         "fail_mutation_rate_value",
         "fail_crossover_rate_value",
         "fail_mutation_span_value",
         "fail_population_size_solution_size",
+        "fail_confidence_bound_value",
+        "fail_final_phase_budget_value",
+        "fail_screening_fraction_value",
+        "fail_operator_schedule_value",
     ],
 )
 def test_evobandits(bounds, budget, kwargs):
@@ -65,14 +91,343 @@ def test_evobandits(bounds, budget, kwargs):
         _ = evobandits.optimize(rb.function, bounds, budget, seed)
 
 
+@pytest.mark.parametrize(
+    "pull_seeding, kwargs",
+    [
+        [None, {}],
+        ["independent", {}],
+        ["common", {}],
+        ["invalid", {"exp": pytest.raises(ValueError)}],
+    ],
+    ids=[
+        "disabled",
+        "independent",
+        "common",
+        "fail_pull_seeding_value",
+    ],
+)
+def test_evobandits_pull_seeding(pull_seeding, kwargs):
+    expectation = kwargs.pop("exp", nullcontext())
+
+    def noisy_function(number: list, seed: int) -> float:
+        return rb.function(number) + random.Random(seed).gauss(0.0, 5.0)
+
+    def objective(*args):
+        # The seed is only passed to the objective if pull_seeding is enabled
+        assert len(args) == (1 if pull_seeding is None else 2)
+        return noisy_function(*args) if pull_seeding else rb.function(*args)
+
+    with expectation:
+        evobandits = EvoBandits(pull_seeding=pull_seeding)
+        assert evobandits.pull_seeding == pull_seeding
+        result = evobandits.optimize(objective, [(0, 100), (0, 100)] * 5, 1000, SEED)
+
+        if pull_seeding is not None:
+            # Seeded simulations make the whole optimization reproducible
+            other = EvoBandits(pull_seeding=pull_seeding)
+            assert result == other.optimize(objective, [(0, 100), (0, 100)] * 5, 1000, SEED)
+
+
+@pytest.mark.parametrize("final_phase_budget", [0.0, 0.2], ids=["ucb", "final_phase"])
+def test_evobandits_best_arm(final_phase_budget):
+    evobandits = EvoBandits(final_phase_budget=final_phase_budget)
+    assert evobandits.best_arm() is None
+
+    result = evobandits.optimize(rb.function, [(0, 100), (0, 100)] * 5, 1000, SEED)
+    best_arm = evobandits.best_arm()
+    assert best_arm["action_vector"] == result
+    assert best_arm["num_pulls"] >= 1
+    lower, upper = best_arm["confidence_interval"]
+    assert lower <= best_arm["mean_reward"] <= upper
+
+
+@pytest.mark.parametrize("top_k", [1, 10, 10_000], ids=["one", "default", "all"])
+def test_evobandits_result(top_k):
+    evobandits = EvoBandits()
+    assert evobandits.result(top_k) is None
+
+    bounds = [(0, 100), (0, 100)] * 5
+    best_action_vector = evobandits.optimize(rb.function, bounds, 1000, SEED)
+    result = evobandits.result(top_k)
+    assert result.best_arm["action_vector"] == best_action_vector
+    assert result.simulations_used == 1000
+
+    # The statistics are exported as contiguous arrays with one row per arm
+    num_arms = min(top_k, 1000)
+    assert result.action_vectors.shape[1] == len(bounds)
+    assert result.action_vectors.shape[0] <= num_arms
+    for array in (result.mean_rewards, result.num_pulls, result.std_devs, result.ucb_values):
+        assert array.shape == (result.action_vectors.shape[0],)
+        assert array.flags["C_CONTIGUOUS"]
+    assert result.action_vectors.flags["C_CONTIGUOUS"]
+    assert (result.mean_rewards[:-1] <= result.mean_rewards[1:]).all()
+
+
+@pytest.mark.parametrize("pull_seeding", [None, "independent"], ids=["unseeded", "seeded"])
+def test_evobandits_ask_tell(pull_seeding):
+    def objective(number: list, seed: int | None = None) -> float:
+        return rb.function(number) + random.Random(seed).random()
+
+    bounds = [(0, 100), (0, 100)] * 5
+    evobandits = EvoBandits(pull_seeding=pull_seeding)
+    assert evobandits.progress() is None
+
+    # Driving the optimization with ask and tell
+    evobandits.start(bounds, 1000, SEED)
+    while (batch := evobandits.ask()) is not None:
+        evobandits.tell([objective(action_vector, seed) for action_vector, seed in batch])
+        progress = evobandits.progress()
+        assert progress["simulations_used"] <= 1000
+        assert isinstance(progress["population_mean"], float)
+    assert evobandits.result().simulations_used == 1000
+    assert progress["best_arm"] == evobandits.best_arm()
+
+    # The pending trials must be told before the next ask
+    evobandits.start(bounds, 1000, SEED)
+    batch = evobandits.ask()
+    with pytest.raises(RuntimeError):
+        evobandits.tell([0.0] * (len(batch) + 1))
+
+
+def test_evobandits_finish():
+    evobandits = EvoBandits()
+    evobandits.start([(0, 100), (0, 100)] * 5, 1000, SEED)
+    batch = evobandits.ask()
+    evobandits.tell([rb.function(action_vector) for action_vector, _ in batch])
+    evobandits.ask()
+
+    # The pending trials are discarded, the result covers the told trials
+    evobandits.finish()
+    assert evobandits.result().simulations_used == len(batch)
+    assert evobandits.ask() is None
+
+
+def test_evobandits_tell_skipped():
+    evobandits = EvoBandits()
+    evobandits.start([(0, 100), (0, 100)] * 5, 1000, SEED)
+    while (batch := evobandits.ask()) is not None:
+        # Skip the trials of failed evaluations, they do not consume budget
+        rewards = [rb.function(action_vector) for action_vector, _ in batch]
+        evobandits.tell([None if i % 3 == 0 else reward for i, reward in enumerate(rewards)])
+    assert evobandits.result().simulations_used == 1000
+
+
+def test_evobandits_resume():
+    bounds = [(0, 100), (0, 100)] * 5
+    evobandits = EvoBandits()
+    with pytest.raises(RuntimeError, match="no optimization to resume"):
+        evobandits.resume(500)
+
+    evobandits.optimize(rb.function, bounds, 500, SEED)
+    result = evobandits.result(1000)
+
+    # The arms of the first run are kept, and the optimization continues with ask and tell
+    evobandits.resume(500)
+    while (batch := evobandits.ask()) is not None:
+        evobandits.tell([rb.function(action_vector) for action_vector, _ in batch])
+    resumed = evobandits.result(1000)
+    assert resumed.simulations_used == 1000
+    assert resumed.mean_rewards[0] <= result.mean_rewards[0]
+
+    # A new optimization starts from a fresh state
+    evobandits.optimize(rb.function, bounds, 500, SEED)
+    np.testing.assert_array_equal(evobandits.result(1000).action_vectors, result.action_vectors)
+
+
+def test_evobandits_conditions():
+    def objective(action_vector: list) -> float:
+        model, a, b = action_vector
+        return (a - 30) ** 2 if model == 0 else (b - 70) ** 2
+
+    # a only applies to model 0, b to model 1
+    conditions = [([1], 0, [0]), ([2], 0, [1])]
+    evobandits = EvoBandits()
+    evobandits.optimize(objective, [(0, 1), (0, 100), (0, 100)], 1000, SEED, conditions=conditions)
+    assert evobandits.result().simulations_used == 1000
+
+    # Inactive dimensions are at their lower bound, so equivalent arms were merged
+    action_vectors = evobandits.result(1000).action_vectors
+    assert np.all(action_vectors[action_vectors[:, 0] == 0, 2] == 0)
+    assert np.all(action_vectors[action_vectors[:, 0] == 1, 1] == 0)
+
+    with pytest.raises(RuntimeError, match="out of range"):
+        evobandits.start([(0, 1), (0, 100)], 1000, SEED, conditions=conditions)
+
+
+def test_evobandits_refine():
+    evobandits = EvoBandits()
+    evobandits.start([(0, 10), (0, 10)], 1000, SEED)
+    for _ in range(5):
+        batch = evobandits.ask()
+        evobandits.tell([rb.function(action_vector) for action_vector, _ in batch])
+    coarse = evobandits.result(1000)
+
+    # The arm statistics are kept at the same points of the finer grid of the first dimension
+    evobandits.refine([0], 10)
+    refined = evobandits.result(1000)
+    np.testing.assert_array_equal(refined.action_vectors[:, 0], coarse.action_vectors[:, 0] * 10)
+    np.testing.assert_array_equal(refined.mean_rewards, coarse.mean_rewards)
+
+    while (batch := evobandits.ask()) is not None:
+        assert all(0 <= action_vector[0] <= 100 for action_vector, _ in batch)
+        evobandits.tell([rb.function(action_vector) for action_vector, _ in batch])
+    assert evobandits.result().simulations_used == 1000
+
+    with pytest.raises(RuntimeError, match="out of range"):
+        evobandits.refine([2], 10)
+
+
+def test_evobandits_optimize_objective_error():
+    def objective(number: list) -> float:
+        calls.append(number)
+        if len(calls) == 100:
+            raise ValueError("Simulation failed")
+        return rb.function(number)
+
+    # The error of the objective is raised, and the trials before it are kept
+    calls = []
+    evobandits = EvoBandits()
+    with pytest.raises(ValueError, match="Simulation failed"):
+        evobandits.optimize(objective, [(0, 100), (0, 100)] * 5, 1000, SEED)
+    assert evobandits.result().simulations_used == 99
+
+    # The interrupted optimization can be continued with ask and tell
+    while (batch := evobandits.ask()) is not None:
+        evobandits.tell([objective(action_vector) for action_vector, _ in batch])
+    assert evobandits.result().simulations_used == 1000
+
+
+@pytest.mark.parametrize("vectorized", [False, True], ids=["scalar", "vectorized"])
+def test_evobandits_feasible(vectorized):
+    def objective(action_vector: list) -> float:
+        assert action_vector[0] < action_vector[1], "Infeasible trials must not be evaluated"
+        return (action_vector[0] - 30) ** 2 + (action_vector[1] - 20) ** 2
+
+    def feasible(action_vector: list) -> bool:
+        return action_vector[0] < action_vector[1]
+
+    def feasible_batch(action_vectors: list) -> np.ndarray:
+        action_vectors = np.asarray(action_vectors)
+        return action_vectors[:, 0] < action_vectors[:, 1]
+
+    evobandits = EvoBandits(collect_stats=True)
+    best_action_vector = evobandits.optimize(
+        objective,
+        [(1, 100), (1, 100)],
+        1000,
+        SEED,
+        feasible=feasible_batch if vectorized else feasible,
+        vectorized=vectorized,
+    )
+    assert feasible(best_action_vector)
+    assert evobandits.result().simulations_used == 1000
+    assert evobandits.stats()["infeasible_candidates"] > 0
+
+
+def test_evobandits_feasible_error():
+    def feasible(action_vector: list) -> bool:
+        raise ValueError("Invalid constraint")
+
+    # The error of the check is raised as is, by optimize as well as by ask
+    evobandits = EvoBandits()
+    with pytest.raises(ValueError, match="Invalid constraint"):
+        evobandits.optimize(rb.function, [(1, 100), (1, 100)], 1000, SEED, feasible=feasible)
+    with pytest.raises(ValueError, match="Invalid constraint"):
+        evobandits.start([(1, 100), (1, 100)], 1000, SEED, feasible=feasible)
+        evobandits.ask()
+
+
+def test_evobandits_screening():
+    evobandits = EvoBandits(screening_fraction=0.25, collect_stats=True)
+    evobandits.optimize(rb.function, [(0, 100), (0, 100)] * 5, 1000, SEED)
+    assert evobandits.result().simulations_used == 1000
+
+    # The surrogate is timed separately from the genetic operators
+    stats = evobandits.stats()
+    assert stats["screened_offspring"] > 0
+    assert 0.0 < stats["surrogate_time"] <= stats["total_time"]
+
+
+def test_evobandits_schedule_state():
+    bounds = [(0, 100), (0, 100)] * 5
+    evobandits = EvoBandits(mutation_span=0.5)
+    evobandits.optimize(rb.function, bounds, 1000, SEED)
+    assert evobandits.schedule_state() is None
+
+    evobandits = EvoBandits(mutation_span=0.5, operator_schedule="success_rate")
+    evobandits.optimize(rb.function, bounds, 1000, SEED)
+    state = evobandits.schedule_state()
+    assert 0.0 < state["mutation_span"] <= 0.5
+    assert state["generations"] > 0
+
+    # The state can be restored from a checkpoint between two batches
+    evobandits.start(bounds, 1000, SEED)
+    evobandits.set_schedule_state(**state)
+    assert evobandits.schedule_state() == state
+    with pytest.raises(RuntimeError, match="mutation_span"):
+        evobandits.set_schedule_state(**{**state, "mutation_span": 1.0})
+
+
+def test_evobandits_stats():
+    bounds = [(0, 100), (0, 100)] * 5
+
+    # Stats are only collected on request
+    evobandits = EvoBandits()
+    evobandits.optimize(rb.function, bounds, 1000, SEED)
+    assert evobandits.stats() is None
+
+    evobandits = EvoBandits(collect_stats=True)
+    assert evobandits.stats() is None
+    evobandits.optimize(rb.function, bounds, 1000, SEED)
+    stats = evobandits.stats()
+    assert stats["repulls"] + stats["new_arms"] == 1000
+    assert stats["generations"] > 0
+    assert 0.0 < stats["objective_time"] <= stats["total_time"]
+    overhead = sum(
+        stats[phase]
+        for phase in ("genetic_operators_time", "tree_maintenance_time", "ucb_selection_time")
+    )
+    assert overhead <= stats["total_time"]
+
+
 @pytest.mark.parametrize(
     "this, other, expected_eq",
     [
         [EvoBandits(), EvoBandits(), True],
         [EvoBandits(population_size=1), EvoBandits(population_size=1), True],
         [EvoBandits(), EvoBandits(population_size=1), False],
+        [EvoBandits(), EvoBandits(pull_seeding="common"), False],
     ],
-    ids=["default_eq", "modified_eq", "not_eq"],
+    ids=["default_eq", "modified_eq", "not_eq", "not_eq_pull_seeding"],
 )
 def test_evobandits_eq(this, other, expected_eq):
     assert (this == other) == expected_eq
+
+
+@pytest.mark.parametrize(
+    "evobandits",
+    [
+        EvoBandits(),
+        EvoBandits(population_size=1),
+        EvoBandits(pull_seeding="common"),
+        EvoBandits(confidence_bound="ucb_v"),
+        EvoBandits(final_phase_budget=0.2),
+        EvoBandits(collect_stats=True),
+        EvoBandits(screening_fraction=0.5, screening_neighbors=3),
+        EvoBandits(operator_schedule="success_rate"),
+    ],
+    ids=[
+        "default",
+        "modified",
+        "pull_seeding",
+        "confidence_bound",
+        "final_phase_budget",
+        "collect_stats",
+        "screening",
+        "operator_schedule",
+    ],
+)
+def test_evobandits_pickle(evobandits):
+    # Pickling preserves the configuration, e.g. to run replications in worker processes
+    assert pickle.loads(pickle.dumps(evobandits)) == evobandits
+    assert copy.deepcopy(evobandits) == evobandits
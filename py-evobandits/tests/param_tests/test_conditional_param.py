@@ -0,0 +1,37 @@
+from contextlib import nullcontext
+
+import pytest
+from evobandits.params import CategoricalParam, ConditionalParam, FloatParam, IntParam
+
+
+@pytest.mark.parametrize(
+    "param, choices, expectation",
+    [
+        [IntParam(0, 10, size=2), ["a"], nullcontext()],
+        [FloatParam(0, 1), ["a", "b"], nullcontext()],
+        [CategoricalParam([1, 2]), [None], nullcontext()],
+        [ConditionalParam(IntParam(0, 1), "x", ["a"]), ["a"], pytest.raises(ValueError)],
+        [IntParam(0, 10), [], pytest.raises(ValueError)],
+        [IntParam(0, 10), "a", pytest.raises(ValueError)],
+    ],
+    ids=[
+        "int_param",
+        "float_param",
+        "categorical_param",
+        "fail_nested",
+        "fail_choices_empty",
+        "fail_choices_type",
+    ],
+)
+def test_conditional_param(param, choices, expectation):
+    with expectation:
+        conditional = ConditionalParam(param, "parent", choices)
+
+        # The bounds and values are the ones of the wrapped parameter
+        assert conditional.size == param.size
+        assert conditional.bounds == param.bounds
+        actions = [low for low, _ in param.bounds]
+        assert conditional.decode(actions) == param.decode(actions)
+
+        assert all(conditional.is_active(choice) for choice in choices)
+        assert not conditional.is_active("other")
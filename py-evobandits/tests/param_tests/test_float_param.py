@@ -50,3 +50,38 @@ def test_float_param_mapping(param, action, exp_value):
     for _ in range(100):
         values.append(param.decode([action]))
     assert all(exp_value == x for x in values)
+
+
+test_float_param_refined_data = [
+    pytest.param({}, [(0, 100)], id="base"),
+    pytest.param({"size": 2}, [(0, 100), (0, 100)], id="vector"),
+    pytest.param({"log": True}, [(0, 100)], id="log"),
+    pytest.param({"refine_factor": 4}, [(0, 40)], id="refine_factor"),
+]
+
+
+@pytest.mark.parametrize("kwargs, exp_bounds", test_float_param_refined_data)
+def test_float_param_refined(kwargs, exp_bounds):
+    factor = kwargs.get("refine_factor", 10)
+    param = FloatParam(1, 2, nsteps=10, refinements=2, **kwargs)
+    refined = param.refined()
+    assert refined.bounds == exp_bounds
+    assert refined.refinements == 1
+    assert param.nsteps == 10  # the original parameter is not modified
+
+    # The points of the coarse grid are kept on the refined grid
+    for action in range(11):
+        assert refined.decode([action * factor]) == pytest.approx(param.decode([action]))
+
+    # The grid can be refined as often as specified
+    assert refined.refined().nsteps == 10 * factor**2
+    with pytest.raises(ValueError):
+        refined.refined().refined()
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{"refinements": -1}, {"refine_factor": 1}], ids=["refinements", "refine_factor"]
+)
+def test_float_param_refined_invalid(kwargs):
+    with pytest.raises(ValueError):
+        FloatParam(0, 1, **kwargs)
@@ -0,0 +1,190 @@
+import itertools
+from contextlib import nullcontext
+
+import pytest
+from evobandits import EvoBandits, FaultPolicy, Study, StudyScheduler
+
+from tests._functions import rosenbrock as rb
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_scheduler(executor):
+    scheduler = StudyScheduler(n_workers=2, executor=executor, patience=None)
+    studies = {name: Study(seed=42, algorithm=EvoBandits()) for name in ("a", "b")}
+    scheduler.add("a", studies["a"], rb.function, rb.PARAMS_2D, 100)
+    scheduler.add("b", studies["b"], rb.function, rb.PARAMS_2D, 200, priority=2.0)
+
+    best_trials = scheduler.run()
+    assert set(best_trials) == {"a", "b"}
+    for name, trials in (("a", 100), ("b", 200)):
+        # The studies are left as after Study.optimize
+        assert best_trials[name] == studies[name].result.best_trial
+        assert studies[name].result.simulations_used == trials
+
+    metrics = scheduler.metrics
+    assert metrics.trials == 300
+    assert metrics.throughput > 0.0
+    for name, trials in (("a", 100), ("b", 200)):
+        study_metrics = metrics.studies[name]
+        assert study_metrics.trials == study_metrics.budget == trials
+        assert study_metrics.generations > 0
+        assert 0.0 < study_metrics.mean_trial_latency <= study_metrics.mean_generation_latency
+        assert study_metrics.finished
+        assert not study_metrics.converged
+
+
+def test_scheduler_priorities():
+    calls = []
+
+    def objective(name: str):
+        def evaluate(number: list) -> float:
+            calls.append(name)
+            return rb.function(number)
+
+        return evaluate
+
+    # With a single worker, the trials are submitted in proportion to the priorities
+    scheduler = StudyScheduler(n_workers=1, patience=None)
+    for name, priority in (("low", 1.0), ("high", 3.0)):
+        study = Study(seed=42, algorithm=EvoBandits())
+        scheduler.add(name, study, objective(name), rb.PARAMS_2D, 200, priority=priority)
+    scheduler.run()
+
+    assert calls[:40].count("high") >= 2 * calls[:40].count("low")
+    assert calls.count("high") == calls.count("low") == 200
+
+
+def test_scheduler_reallocates_converged_budget():
+    # Each trial of the improving study is better than all before, the flat one never improves
+    counter = itertools.count()
+    studies = {name: Study(seed=42, algorithm=EvoBandits()) for name in ("flat", "improving")}
+
+    scheduler = StudyScheduler(n_workers=2, patience=2)
+    scheduler.add("flat", studies["flat"], lambda number: 1.0, rb.PARAMS_2D, 1000)
+    scheduler.add(
+        "improving", studies["improving"], lambda number: -next(counter), rb.PARAMS_2D, 200
+    )
+    scheduler.run()
+
+    flat, improving = scheduler.metrics.studies["flat"], scheduler.metrics.studies["improving"]
+    assert flat.converged
+    assert flat.trials < 1000
+    assert not improving.converged
+    assert improving.budget == 200 + 1000 - flat.trials
+    assert studies["improving"].result.simulations_used == improving.budget
+
+
+def test_scheduler_final_phase():
+    # The study improves until the final phase, and its rewards are flat afterwards
+    counter = itertools.count()
+
+    def objective(number: list) -> float:
+        trial = next(counter)
+        return -trial if trial < 160 else 0.0
+
+    study = Study(seed=42, algorithm=EvoBandits(final_phase_budget=0.2))
+    scheduler = StudyScheduler(patience=2)
+    scheduler.add("final", study, objective, rb.PARAMS_2D, 200)
+    scheduler.run()
+
+    # The initial population and the rounds of the final phase are no generations, and the final
+    # phase is run to its end
+    metrics = scheduler.metrics.studies["final"]
+    assert metrics.generations == study.algorithm.progress()["generation"]
+    assert not metrics.converged
+    assert study.result.simulations_used == 200
+
+
+def test_scheduler_reallocates_to_final_phase():
+    # The flat study improves until the other one reaches its final phase after 100 trials, and
+    # then converges while that final phase is in progress
+    final_trials = []
+    flat_counter = itertools.count()
+
+    def final_objective(number: list) -> float:
+        final_trials.append(number)
+        return -len(final_trials)
+
+    def flat_objective(number: list) -> float:
+        return 1.0 if len(final_trials) >= 100 else -next(flat_counter)
+
+    studies = {
+        "flat": Study(seed=42, algorithm=EvoBandits()),
+        "final": Study(seed=42, algorithm=EvoBandits(final_phase_budget=0.5)),
+    }
+    scheduler = StudyScheduler(n_workers=1, patience=2)
+    scheduler.add("flat", studies["flat"], flat_objective, rb.PARAMS_2D, 5000)
+    scheduler.add("final", studies["final"], final_objective, rb.PARAMS_2D, 200)
+    scheduler.run()
+
+    flat, final = scheduler.metrics.studies["flat"], scheduler.metrics.studies["final"]
+    assert flat.converged
+    assert final.budget == 200 + 5000 - flat.trials
+    assert studies["final"].result.simulations_used == final.budget
+
+
+def test_scheduler_fault_policy():
+    def objective(number: list) -> float:
+        if number[0] < 0:
+            raise ValueError("Invalid solution")
+        return rb.function(number)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    scheduler = StudyScheduler(n_workers=2, patience=None)
+    scheduler.add(
+        "penalty",
+        study,
+        objective,
+        rb.PARAMS_2D,
+        100,
+        fault_policy=FaultPolicy(retries=1, on_failure="penalty", penalty=1e6),
+    )
+    scheduler.run()
+    assert study.result.simulations_used == 100
+    assert study.result.best_trial["number"][0] >= 0
+
+    # Without a fault policy, the error is raised, and the study can be resumed afterwards
+    study = Study(seed=42, algorithm=EvoBandits())
+    scheduler = StudyScheduler(patience=None)
+    scheduler.add("raise", study, objective, rb.PARAMS_2D, 100)
+    with pytest.raises(ValueError, match="Invalid solution"):
+        scheduler.run()
+    assert not scheduler.metrics.studies["raise"].finished
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"n_workers": 0, "exp": pytest.raises(ValueError)},
+        {"executor": "cluster", "exp": pytest.raises(ValueError)},
+        {"patience": 0, "exp": pytest.raises(ValueError)},
+        {"tolerance": -0.1, "exp": pytest.raises(ValueError)},
+        {"n_workers": -1},
+    ],
+    ids=[
+        "fail_n_workers_value",
+        "fail_executor_value",
+        "fail_patience_value",
+        "fail_tolerance_value",
+        "all_cpus",
+    ],
+)
+def test_scheduler_init(kwargs):
+    expectation = kwargs.pop("exp", nullcontext())
+    with expectation:
+        scheduler = StudyScheduler(**kwargs)
+        assert scheduler.n_workers >= 1
+
+
+def test_scheduler_add_invalid():
+    scheduler = StudyScheduler()
+    with pytest.raises(RuntimeError, match="no studies"):
+        scheduler.run()
+
+    scheduler.add("a", Study(seed=42), rb.function, rb.PARAMS_2D, 100)
+    with pytest.raises(ValueError, match="registered already"):
+        scheduler.add("a", Study(seed=42), rb.function, rb.PARAMS_2D, 100)
+    with pytest.raises(ValueError, match="trials"):
+        scheduler.add("b", Study(seed=42), rb.function, rb.PARAMS_2D, 0)
+    with pytest.raises(ValueError, match="priority"):
+        scheduler.add("b", Study(seed=42), rb.function, rb.PARAMS_2D, 100, priority=0.0)
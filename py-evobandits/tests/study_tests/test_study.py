@@ -1,8 +1,22 @@
+import asyncio
+import random
+import time
 from contextlib import nullcontext
 from unittest.mock import MagicMock
 
 import pytest
-from evobandits import ALGORITHM_DEFAULT, EvoBandits, Study
+from evobandits import (
+    ALGORITHM_DEFAULT,
+    CategoricalParam,
+    ConditionalParam,
+    EvoBandits,
+    FaultPolicy,
+    FloatParam,
+    IntParam,
+    ReplicationResult,
+    Study,
+    StudyResult,
+)
 
 from tests._functions import clustering as cl
 from tests._functions import rosenbrock as rb
@@ -71,7 +85,10 @@ def test_optimize(objective, params, trials, kwargs):
     # Mock dependencies
     # Per default, and expected results from the rosenbrock testcase are used to mock EvoBandits.
     mock_algorithm = MagicMock()
-    mock_algorithm.optimize.return_value = kwargs.pop("mock_opt_return", rb.RESULTS_2D)
+    mock_algorithm.ask.return_value = None
+    mock_algorithm.result.return_value.best_arm = {
+        "action_vector": kwargs.pop("mock_opt_return", rb.RESULTS_2D)
+    }
     mock_best_trial = kwargs.pop("mock_best_trial", rb.BEST_TRIAL_2D)
     study = Study(seed=42, algorithm=mock_algorithm)  # seeding to avoid warning log
 
@@ -82,4 +99,519 @@ def test_optimize(objective, params, trials, kwargs):
     with expectation:
         best_trial = study.optimize(objective, params, trials, **kwargs)
         assert best_trial == mock_best_trial
-        assert mock_algorithm.optimize.call_count == 1  # Always run algorithm once for now
+        assert mock_algorithm.start.call_count == 1  # Always run algorithm once for now
+
+
+@pytest.mark.parametrize(
+    "n_runs, kwargs",
+    [
+        [3, {}],
+        [3, {"n_jobs": 2}],
+        [3, {"maximize": True}],
+        [0, {"exp": pytest.raises(ValueError)}],
+        [3, {"n_jobs": 0, "exp": pytest.raises(ValueError)}],
+    ],
+    ids=[
+        "default",
+        "process_pool",
+        "default_with_maximize",
+        "invalid_n_runs",
+        "invalid_n_jobs",
+    ],
+)
+def test_replicate(n_runs, kwargs):
+    expectation = kwargs.pop("exp", nullcontext())
+    study = Study(seed=42, algorithm=EvoBandits())  # seeding to avoid warning log
+
+    with expectation:
+        result = study.replicate(rb.function, rb.PARAMS_2D, 100, n_runs, **kwargs)
+        assert result.n_runs == n_runs
+        assert len(result.best_trials) == len(result.timings) == n_runs
+        assert all(timing >= 0.0 for timing in result.timings)
+
+        # Per-run seeds are derived deterministically from the study's seed
+        other = Study(seed=42, algorithm=EvoBandits()).replicate(rb.function, rb.PARAMS_2D, 100, 1)
+        assert result.seeds[0] == other.seeds[0]
+        assert len(set(result.seeds)) == n_runs
+
+        # The summary describes each parameter element-wise, as well as the timings
+        summary = result.summary
+        assert len(summary["params"]["number"]) == 2
+        assert summary["timings"]["min"] <= summary["timings"]["mean"] <= summary["timings"]["max"]
+
+
+def test_replicate_conditional():
+    def objective(model: str, c: int = 0) -> float:
+        return c if model == "b" else 1.0
+
+    params = {
+        "model": CategoricalParam(["a", "b"]),
+        "c": ConditionalParam(IntParam(0, 10), "model", ["b"]),
+    }
+    study = Study(seed=42, algorithm=EvoBandits())
+    result = study.replicate(objective, params, 100, 3)
+
+    # Each parameter is summarized over the runs in which it is active
+    summary = result.summary
+    runs_with_c = sum("c" in trial for trial in result.best_trials)
+    assert sum(summary["params"]["model"]["counts"].values()) == 3
+    assert ("c" in summary["params"]) == (runs_with_c > 0)
+
+    # Also if the parameter is inactive in the first run, or only in a later one
+    for best_trials in (
+        [{"model": "a"}, {"model": "b", "c": 2}],
+        [{"model": "b", "c": 2}, {"model": "a"}],
+    ):
+        result = ReplicationResult(seeds=[1, 2], best_trials=best_trials, timings=[0.1, 0.2])
+        assert result.summary["params"]["c"] == {"mean": 2.0, "std": 0.0, "min": 2, "max": 2}
+
+
+@pytest.mark.parametrize("maximize", [False, True], ids=["minimize", "maximize"])
+def test_result(maximize):
+    study = Study(seed=42, algorithm=EvoBandits())  # seeding to avoid warning log
+    assert study.result is None
+
+    best_trial = study.optimize(rb.function, rb.PARAMS_2D, 1000, maximize=maximize, top_k=5)
+    result = study.result
+    assert result.best_trial == best_trial
+    assert result.simulations_used == 1000
+    assert len(result.trials) == len(result.values) == len(result.num_pulls) == 5
+    assert all(isinstance(trial["number"], list) for trial in result.trials)
+
+    # The top trials are ordered from the best mean objective value on
+    values = list(result.values)
+    assert values == sorted(values, reverse=maximize)
+
+
+@pytest.mark.parametrize("collect_stats", [False, True], ids=["disabled", "enabled"])
+def test_stats(collect_stats):
+    study = Study(seed=42, algorithm=EvoBandits(collect_stats=collect_stats))
+    assert study.stats is None
+
+    study.optimize(rb.function, rb.PARAMS_2D, 1000)
+    if collect_stats:
+        assert study.stats["repulls"] + study.stats["new_arms"] == 1000
+    else:
+        assert study.stats is None
+
+
+@pytest.mark.parametrize("maximize", [False, True], ids=["minimize", "maximize"])
+def test_iter_optimize(maximize):
+    study = Study(seed=42, algorithm=EvoBandits())
+    snapshots = list(study.iter_optimize(rb.function, rb.PARAMS_2D, 1000, maximize=maximize))
+
+    # The snapshots track the optimization until the budget is used up
+    simulations_used = [snapshot.simulations_used for snapshot in snapshots]
+    assert simulations_used == sorted(simulations_used)
+    assert simulations_used[-1] == 1000
+    assert isinstance(snapshots[-1].best_trial["number"], list)
+    assert snapshots[-1].best_num_pulls >= 1
+    assert study.result.simulations_used == 1000
+
+
+def test_iter_optimize_final_phase():
+    study = Study(seed=42, algorithm=EvoBandits(final_phase_budget=0.2))
+    snapshots = list(study.iter_optimize(rb.function, rb.PARAMS_2D, 1000))
+
+    # One snapshot per generation from the initial population on, and one after the final phase
+    generations = [snapshot.generation for snapshot in snapshots]
+    assert generations[:-1] == list(range(len(generations) - 1))
+    assert generations[-1] == generations[-2]
+    assert snapshots[-2].simulations_used <= 800
+    assert snapshots[-1].simulations_used == 1000
+    assert snapshots[-1].best_trial == study.result.best_trial
+
+
+def test_iter_optimize_early_stop():
+    study = Study(seed=42, algorithm=EvoBandits())
+    for snapshot in study.iter_optimize(rb.function, rb.PARAMS_2D, 1000):
+        if snapshot.simulations_used >= 100:
+            break
+
+    # Stopping early keeps a valid result of the completed trials
+    assert study.result.simulations_used == snapshot.simulations_used
+    assert study.result.best_trial == snapshot.best_trial
+
+
+def test_iter_optimize_objective_error():
+    def objective(number: list) -> float:
+        if len(calls) == 100:
+            raise ValueError("Simulation failed")
+        calls.append(number)
+        return rb.function(number)
+
+    calls = []
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(ValueError):
+        for _ in study.iter_optimize(objective, rb.PARAMS_2D, 1000):
+            pass
+
+    # The trials that were told before the error are kept
+    assert 0 < study.result.simulations_used <= 100
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"retries": -1},
+        {"on_failure": "ignore"},
+        {"on_failure": "penalty"},
+        {"penalty": 1e6},
+        {"on_failure": "penalty", "penalty": float("inf")},
+        {"timeout": 0},
+        {"max_consecutive_skips": 0},
+    ],
+    ids=[
+        "negative_retries",
+        "invalid_on_failure",
+        "missing_penalty",
+        "unused_penalty",
+        "infinite_penalty",
+        "invalid_timeout",
+        "invalid_max_consecutive_skips",
+    ],
+)
+def test_fault_policy_invalid(kwargs):
+    with pytest.raises(ValueError):
+        FaultPolicy(**kwargs)
+
+
+def test_fault_policy_retries():
+    def objective(number: list) -> float:
+        # Every first attempt of a trial fails
+        calls.append(number)
+        if len(calls) % 2 == 1:
+            raise ValueError("Simulation failed")
+        return rb.function(number)
+
+    calls = []
+    study = Study(seed=42, algorithm=EvoBandits())
+    study.optimize(objective, rb.PARAMS_2D, 100, fault_policy=FaultPolicy(retries=1))
+    assert study.result.simulations_used == 100
+    assert len(calls) == 200
+
+    calls = []
+    with pytest.raises(ValueError):
+        study.optimize(objective, rb.PARAMS_2D, 100)
+
+
+@pytest.mark.parametrize("maximize", [False, True], ids=["minimize", "maximize"])
+@pytest.mark.parametrize("on_failure", ["penalty", "skip"])
+def test_fault_policy_on_failure(on_failure, maximize):
+    def objective(number: list) -> float:
+        if number[0] < 0:
+            raise ValueError("Simulation failed")
+        return rb.function(number) if not maximize else -rb.function(number)
+
+    penalty = None
+    if on_failure == "penalty":
+        penalty = -1e6 if maximize else 1e6
+    policy = FaultPolicy(on_failure=on_failure, penalty=penalty)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    best_trial = study.optimize(objective, rb.PARAMS_2D, 300, maximize, fault_policy=policy)
+    assert best_trial["number"][0] >= 0
+    assert study.result.simulations_used == 300
+
+    # Failed trials are recorded with the penalty, or not at all if they are skipped
+    result = study.result
+    failed = [v for t, v in zip(result.trials, result.values, strict=True) if t["number"][0] < 0]
+    assert all(value == penalty for value in failed)
+    if on_failure == "skip":
+        assert not failed
+
+
+def test_fault_policy_timeout():
+    def objective(number: list) -> float:
+        if number[0] < 0:
+            time.sleep(1.0)
+        return rb.function(number)
+
+    policy = FaultPolicy(on_failure="skip", timeout=0.05)
+    study = Study(seed=42, algorithm=EvoBandits())
+    best_trial = study.optimize(objective, rb.PARAMS_2D, 50, fault_policy=policy)
+    assert best_trial["number"][0] >= 0
+    assert study.result.simulations_used == 50
+
+
+def test_fault_policy_all_skipped():
+    def objective(number: list) -> float:
+        raise ValueError("Simulation failed")
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(RuntimeError):
+        study.optimize(objective, rb.PARAMS_2D, 100, fault_policy=FaultPolicy(on_failure="skip"))
+
+
+@pytest.mark.parametrize("error", [KeyboardInterrupt, ValueError])
+def test_optimize_interrupted(error):
+    def objective(number: list) -> float:
+        calls.append(number)
+        if len(calls) == 100:
+            raise error()
+        return rb.function(number)
+
+    calls = []
+    study = Study(seed=42, algorithm=EvoBandits())
+    if error is KeyboardInterrupt:
+        # The best trial so far is returned
+        best_trial = study.optimize(objective, rb.PARAMS_2D, 1000)
+        assert best_trial == study.result.best_trial
+    else:
+        with pytest.raises(ValueError):
+            study.optimize(objective, rb.PARAMS_2D, 1000)
+    assert study.result.simulations_used == 99
+
+    best_trial = study.resume()
+    assert best_trial == study.result.best_trial
+    assert study.result.simulations_used == 1000
+
+
+def test_resume_without_optimization():
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(RuntimeError):
+        study.resume()
+    with pytest.raises(RuntimeError):
+        asyncio.run(study.resume_async())
+
+
+@pytest.mark.parametrize("method", ["extend", "extend_async"])
+def test_extend(method):
+    async def objective_async(number: list) -> float:
+        return rb.function(number)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    if method == "extend":
+        study.optimize(rb.function, rb.PARAMS_2D, 200)
+    else:
+        asyncio.run(study.optimize_async(objective_async, rb.PARAMS_2D, 200))
+    result = study.result
+
+    # The optimization continues with the statistics of the trials of the first run
+    if method == "extend":
+        best_trial = study.extend(200)
+    else:
+        best_trial = asyncio.run(study.extend_async(200))
+    assert best_trial == study.result.best_trial
+    assert study.result.simulations_used == 400
+    assert min(study.result.values) <= min(result.values)
+
+
+def test_extend_invalid():
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(RuntimeError):
+        study.extend(100)
+
+    study.optimize(rb.function, rb.PARAMS_2D, 100)
+    with pytest.raises(ValueError):
+        study.extend(0)
+
+
+def test_studies_isolated():
+    # Each study has its own algorithm, and each optimization starts from a fresh state
+    assert Study(seed=42).algorithm is not Study(seed=42).algorithm
+
+    study = Study(seed=42)
+    best_trial = study.optimize(rb.function, rb.PARAMS_2D, 100)
+    Study(seed=7).optimize(rb.function, rb.PARAMS_2D, 100)
+    assert study.optimize(rb.function, rb.PARAMS_2D, 100) == best_trial
+
+
+@pytest.mark.parametrize("vectorized", [False, True], ids=["scalar", "vectorized"])
+def test_feasible(vectorized):
+    def objective(s: int, big_s: int) -> float:
+        assert s < big_s, "Infeasible trials must not be evaluated"
+        return (s - 30) ** 2 + (big_s - 20) ** 2
+
+    def feasible(s: int, big_s: int) -> bool:
+        return s < big_s
+
+    def feasible_batch(trials: list) -> list:
+        return [feasible(**trial) for trial in trials]
+
+    params = {"s": IntParam(1, 100), "big_s": IntParam(1, 100)}
+    study = Study(seed=42, algorithm=EvoBandits())
+    best_trial = study.optimize(
+        objective,
+        params,
+        500,
+        feasible=feasible_batch if vectorized else feasible,
+        vectorized_feasible=vectorized,
+    )
+    assert feasible(**best_trial)
+    assert study.result.simulations_used == 500
+
+
+def test_param_named_seed():
+    def objective(seed: int) -> float:
+        return seed
+
+    # The seed of the trials would replace the parameter
+    params = {"seed": IntParam(0, 10)}
+    study = Study(seed=42, algorithm=EvoBandits(pull_seeding="independent"))
+    with pytest.raises(ValueError, match="named 'seed'"):
+        study.optimize(objective, params, 100)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    assert study.optimize(objective, params, 100) == {"seed": 0}
+
+
+def test_feasible_error():
+    def feasible(s: int, big_s: int) -> bool:
+        raise ValueError("Invalid constraint")
+
+    params = {"s": IntParam(1, 100), "big_s": IntParam(1, 100)}
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(ValueError, match="Invalid constraint"):
+        study.optimize(lambda s, big_s: s + big_s, params, 100, feasible=feasible)
+
+
+@pytest.mark.parametrize("method", ["optimize", "optimize_async"])
+def test_adaptive_grid(method):
+    def objective(y: list, x: float) -> float:
+        return (x - 0.123) ** 2 + sum(y)
+
+    async def objective_async(y: list, x: float) -> float:
+        return objective(y, x)
+
+    x = FloatParam(-2, 2, nsteps=10, refinements=2)
+    params = {"y": IntParam(0, 1, size=2), "x": x}
+    study = Study(seed=42, algorithm=EvoBandits())
+    if method == "optimize":
+        best_trial = study.optimize(objective, params, 300)
+    else:
+        best_trial = asyncio.run(study.optimize_async(objective_async, params, 300))
+
+    # The grid was refined twice, without modifying the parameters of the user
+    assert study.params["x"].nsteps == 1000
+    assert study.params["y"] is params["y"]
+    assert params["x"] is x and x.nsteps == 10
+    assert study.result.simulations_used == 300
+
+    # The best value is closer than the points of the coarse grid, 0.0 and 0.4
+    assert abs(best_trial["x"] - 0.123) < 0.1
+    assert study.result.best_trial == best_trial
+
+
+def test_conditional_params():
+    def objective(model: str, a: int | None = None, b: list | None = None) -> float:
+        calls.append((model, a, b))
+        return (a - 30) ** 2 if model == "a" else sum(b)
+
+    calls = []
+    params = {
+        "model": CategoricalParam(["a", "b"]),
+        "a": ConditionalParam(IntParam(0, 100), "model", ["a"]),
+        "b": ConditionalParam(IntParam(0, 100, size=2), "model", ["b"]),
+    }
+    study = Study(seed=42, algorithm=EvoBandits())
+    study.optimize(objective, params, 500)
+    assert study.result.simulations_used == 500
+    assert study.result.best_value == 0
+
+    # Inactive parameters are not passed to the objective
+    for model, a, b in calls:
+        assert (a is None) == (model == "b")
+        assert (b is None) == (model == "a")
+
+    # Trials that differ only in inactive parameters are the same trial
+    trials = [tuple(sorted(trial.items(), key=str)) for trial in study.result.trials]
+    assert len(set(map(str, trials))) == len(trials)
+
+
+def test_objective_nan():
+    def objective(number: list) -> float:
+        return float("nan") if number[0] < 0 else rb.function(number)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(ValueError, match="NaN"):
+        study.optimize(objective, rb.PARAMS_2D, 100)
+
+    best_trial = study.optimize(
+        objective, rb.PARAMS_2D, 100, fault_policy=FaultPolicy(on_failure="skip")
+    )
+    assert best_trial["number"][0] >= 0
+
+
+@pytest.mark.parametrize("max_concurrency", [None, 1, 5], ids=["unbounded", "serial", "bounded"])
+def test_optimize_async(max_concurrency):
+    async def objective(number: list, seed: int) -> float:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        # Complete the trials in a random order
+        await asyncio.sleep(random.random() / 1000)
+        in_flight -= 1
+        return rb.function(number) + random.Random(seed).random()
+
+    def optimize() -> tuple[dict, StudyResult]:
+        study = Study(seed=42, algorithm=EvoBandits(pull_seeding="independent"))
+        coroutine = study.optimize_async(objective, rb.PARAMS_2D, 200, max_concurrency)
+        return asyncio.run(coroutine), study.result
+
+    in_flight = max_in_flight = 0
+    best_trial, result = optimize()
+    assert result.best_trial == best_trial
+    assert result.simulations_used == 200
+    if max_concurrency is not None:
+        assert max_in_flight == max_concurrency
+    else:
+        assert max_in_flight > 1
+
+    # The rewards are told in the order of the trials, not of their completion
+    other_best_trial, other_result = optimize()
+    assert other_best_trial == best_trial
+    assert other_result.trials == result.trials
+    assert list(other_result.values) == list(result.values)
+
+
+def test_optimize_async_invalid_max_concurrency():
+    async def objective(number: list) -> float:
+        return rb.function(number)
+
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(ValueError):
+        asyncio.run(study.optimize_async(objective, rb.PARAMS_2D, 200, max_concurrency=0))
+
+
+def test_optimize_async_interrupted():
+    async def objective(number: list) -> float:
+        calls.append(number)
+        if len(calls) == 100:
+            raise ValueError("Simulation failed")
+        await asyncio.sleep(0)
+        return rb.function(number)
+
+    calls = []
+    study = Study(seed=42, algorithm=EvoBandits())
+    with pytest.raises(ValueError):
+        asyncio.run(study.optimize_async(objective, rb.PARAMS_2D, 1000, max_concurrency=1))
+    assert study.result.simulations_used == 99
+
+    best_trial = asyncio.run(study.resume_async(max_concurrency=1))
+    assert best_trial == study.result.best_trial
+    assert study.result.simulations_used == 1000
+
+
+def test_optimize_async_failure_cancels_trials():
+    async def objective(number: list) -> float:
+        if not calls:
+            calls.append(number)
+            raise ValueError("Simulation failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(number)
+            raise
+        return rb.function(number)
+
+    async def optimize() -> None:
+        with pytest.raises(ValueError):
+            await study.optimize_async(objective, rb.PARAMS_2D, 100)
+        # The other trials of the generation are cancelled before optimize_async returns
+        assert asyncio.all_tasks() == {asyncio.current_task()}
+
+    calls, cancelled = [], []
+    study = Study(seed=42, algorithm=EvoBandits())
+    asyncio.run(optimize())
+    assert cancelled
@@ -1,5 +1,5 @@
 import pytest
-from evobandits import CategoricalParam, IntParam
+from evobandits import CategoricalParam, ConditionalParam, IntParam
 from evobandits.study.study import Study
 
 
@@ -26,6 +26,57 @@ def test_collect_bounds(params, exp_bounds):
     assert bounds == exp_bounds
 
 
+# c and d apply to model b only, and e only if d is 0
+CONDITIONAL_PARAMS = {
+    "model": CategoricalParam(["a", "b"]),
+    "c": ConditionalParam(IntParam(0, 10), "model", ["b"]),
+    "d": ConditionalParam(CategoricalParam([0, 1]), "model", ["b"]),
+    "e": ConditionalParam(IntParam(0, 1), "d", [0]),
+}
+
+
+@pytest.mark.parametrize(
+    "params, exp_conditions",
+    [
+        [{"a": IntParam(0, 1, 2)}, []],
+        [CONDITIONAL_PARAMS, [([1], 0, [1]), ([2], 0, [1]), ([3], 2, [0])]],
+        [
+            {
+                "a": IntParam(0, 1, 2),
+                "model": CategoricalParam(["a", "b", "c"]),
+                "c": ConditionalParam(IntParam(0, 10, 2), "model", ["a", "c"]),
+            },
+            [([3, 4], 2, [0, 2])],
+        ],
+    ],
+    ids=[
+        "no_conditions",
+        "nested_conditions",
+        "vector_param",
+    ],
+)
+def test_collect_conditions(params, exp_conditions):
+    study = Study(seed=42)  # with seed to avoid warning logs
+    study.params = params
+    assert study._collect_conditions() == exp_conditions
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"c": ConditionalParam(IntParam(0, 1), "model", ["a"]), "model": CategoricalParam(["a"])},
+        {"model": IntParam(0, 1), "c": ConditionalParam(IntParam(0, 1), "model", [0])},
+        {"c": ConditionalParam(IntParam(0, 1), "model", ["a"])},
+    ],
+    ids=["parent_after", "parent_not_categorical", "parent_missing"],
+)
+def test_collect_conditions_invalid(params):
+    study = Study(seed=42)  # with seed to avoid warning logs
+    study.params = params
+    with pytest.raises(ValueError):
+        study._collect_conditions()
+
+
 @pytest.mark.parametrize(
     "params, action_vector, exp_solution",
     [
@@ -36,11 +87,17 @@ def test_collect_bounds(params, exp_bounds):
             [0, 1, 1],
             {"a": [0, 1], "b": True},
         ],
+        [CONDITIONAL_PARAMS, [1, 5, 0, 1], {"model": "b", "c": 5, "d": 0, "e": 1}],
+        [CONDITIONAL_PARAMS, [1, 5, 1, 1], {"model": "b", "c": 5, "d": 1}],
+        [CONDITIONAL_PARAMS, [0, 5, 0, 1], {"model": "a"}],
     ],
     ids=[
         "one_dimension",
         "one_param",
         "multiple_params",
+        "conditional_active",
+        "conditional_inactive",
+        "conditional_nested_inactive",
     ],
 )
 def test_decode(params, action_vector, exp_solution):
@@ -59,17 +116,19 @@ def test_decode(params, action_vector, exp_solution):
         [{"a": IntParam(0, 1, 2)}, [0, 1], -0.5, {}],
         [{"a": IntParam(0, 1, 2), "b": CategoricalParam([False, True])}, [0, 1, 1], 0.5, {}],
         [{"a": IntParam(0, 1, 2)}, [0, 1], +0.5, {"_direction": -1}],  # maximize objective
+        [{"a": IntParam(0, 1, 2)}, [0, 1], 41.5, {"seed": 42}],  # seed is passed to objective
     ],
     ids=[
         "one_param",
         "multiple_params",
         "one_param_switch_direction",
+        "one_param_with_seed",
     ],
 )
 def test_evaluate(params, action_vector, exp_result, kwargs):
     # Mock or patch dependencies
-    def dummy_objective(a: list, b: bool = False):
-        return sum(a) * 0.5 if b else -sum(a) * 0.5
+    def dummy_objective(a: list, b: bool = False, seed: int = 0):
+        return seed + (sum(a) * 0.5 if b else -sum(a) * 0.5)
 
     study = Study(seed=42)  # with seed to avoid warning logs
     study.params = params
@@ -77,5 +136,5 @@ def test_evaluate(params, action_vector, exp_result, kwargs):
     study._direction = kwargs.get("_direction", 1)
 
     # Verify if study evaluates the objective
-    result = study._evaluate(action_vector)
+    result = study._evaluate(action_vector, kwargs.get("seed"))
     assert result == exp_result
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import evobandits
+import pytest
+
+# Modules that are slow to import, and only loaded when they are used
+LAZY_MODULES = [
+    "evobandits.evobandits",
+    "evobandits.search",
+    "evobandits.study",
+    "numpy",
+    "sklearn",
+]
+
+
+def run_python(code: str) -> str:
+    # A fresh interpreter, since the test session has imported everything already
+    process = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert process.returncode == 0, process.stderr
+    return process.stdout.strip()
+
+
+def test_import_is_lazy():
+    code = (
+        "import logging, sys, evobandits;"
+        f"print([name for name in {LAZY_MODULES} if name in sys.modules]);"
+        "print(len(logging.getLogger('evobandits').handlers))"
+    )
+    loaded, num_handlers = run_python(code).splitlines()
+    assert loaded == "[]"
+    assert num_handlers == "0"  # The default handler is added on first use
+
+
+def test_import_search_on_access():
+    pytest.importorskip("sklearn")
+    code = "import sys, evobandits; evobandits.EvoBanditsSearchCV; print('sklearn' in sys.modules)"
+    assert run_python(code) == "True"
+
+
+def test_lazy_attributes():
+    for name in evobandits.__all__:
+        assert getattr(evobandits, name) is not None
+    assert set(evobandits.__all__) <= set(dir(evobandits))
+
+    # The default algorithm is a new instance on each access
+    assert evobandits.ALGORITHM_DEFAULT is not evobandits.ALGORITHM_DEFAULT
+
+    with pytest.raises(AttributeError):
+        evobandits.Unknown  # noqa: B018
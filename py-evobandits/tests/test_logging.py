@@ -1,5 +1,5 @@
 from evobandits import logging
-from pytest import CaptureFixture, LogCaptureFixture
+from pytest import CaptureFixture, LogCaptureFixture, MonkeyPatch
 
 
 def test_get_logger(caplog: LogCaptureFixture) -> None:
@@ -26,6 +26,7 @@ def test_set_level(caplog: LogCaptureFixture) -> None:
 
 def test_disable(capsys: CaptureFixture) -> None:
     logger = logging.get_logger("evobandits.foo")
+    logging.set_level(logging.INFO)
 
     logging.disable()
     logger.info("hello")
@@ -34,3 +35,26 @@ def test_disable(capsys: CaptureFixture) -> None:
     logging.enable()
     logger.info("bye")
     assert "bye" in capsys.readouterr().err  # Logging is enabled
+
+
+def test_configure() -> None:
+    root_logger = logging._get_library_root_logger()
+    logging.disable()
+    logging.configure()
+    assert logging._default_handler is None  # A disabled handler is not added again
+
+    logging.enable()
+    handlers = list(root_logger.handlers)
+    logging.configure()
+    assert root_logger.handlers == handlers  # The handler is only added once
+
+
+def test_configure_keeps_level(monkeypatch: MonkeyPatch) -> None:
+    # A level that is set after the import is not reset when the library is first used
+    root_logger = logging._get_library_root_logger()
+    monkeypatch.setattr(logging, "_configured", False)
+    monkeypatch.setattr(logging, "_default_handler", None)
+    monkeypatch.setattr(root_logger, "level", logging.WARNING)
+    monkeypatch.setattr(root_logger, "handlers", list(root_logger.handlers))
+    logging.configure()
+    assert root_logger.level == logging.WARNING